@@ -290,6 +290,7 @@ async def get_crop_stages(crop: str, variety: str):
         if "varieties" in crop_model:
             if variety_lower in crop_model["varieties"]:
                 variety_data = crop_model["varieties"][variety_lower]
+                water_req = variety_data.get("water_requirements", {})
                 
                 return {
                     "success": True,
@@ -298,7 +299,10 @@ async def get_crop_stages(crop: str, variety: str):
                     "maturity_days": variety_data["maturity_days"],
                     "stages": variety_data["stages"],
                     "critical_practices": variety_data.get("critical_practices", {}),
-                    "water_requirements": variety_data.get("water_requirements", {})
+                    "water_requirements": {
+                        "total_mm": water_req.get("total_mm"),
+                        "critical_stages": water_req.get("critical_stages_ordered", [])
+                    } if water_req else {}
                 }
         
         raise HTTPException(status_code=404, detail=f"Variety {variety} not found for {crop}")
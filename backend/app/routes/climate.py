@@ -14,6 +14,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, List
 from app.services import climate_persistence, lcrs_engine, planting_window, harvest_prediction
+from app.services.lcrs_engine import request_scoped
 
 router = APIRouter()
 
@@ -72,6 +73,7 @@ class DiversificationRequest(BaseModel):
 # ============================================================================
 
 @router.post('/rain_report')
+@request_scoped
 async def submit_rain_report(payload: RainReportPayload):
     """Farmer submits crowdsourced rain report"""
     climate_persistence.add_rain_report(
@@ -82,6 +84,7 @@ async def submit_rain_report(payload: RainReportPayload):
     return JSONResponse({'submitted': True, 'message': 'Thank you for reporting rainfall!'})
 
 @router.get('/rain_reports')
+@request_scoped
 async def get_rain_reports(days: int = 7, lat: float = None, lon: float = None):
     """Get recent rain reports, optionally filtered by location"""
     location = {'lat': lat, 'lon': lon} if lat and lon else None
@@ -89,6 +92,7 @@ async def get_rain_reports(days: int = 7, lat: float = None, lon: float = None):
     return JSONResponse({'count': len(reports), 'reports': reports})
 
 @router.post('/soil_report')
+@request_scoped
 async def submit_soil_report(payload: SoilReportPayload):
     """Farmer submits soil moisture report"""
     climate_persistence.add_soil_report(
@@ -107,6 +111,7 @@ async def submit_soil_report(payload: SoilReportPayload):
     })
 
 @router.get('/soil_report/{farmer_id}/{field_id}')
+@request_scoped
 async def get_soil_report(farmer_id: str, field_id: str):
     """Get farmer's latest soil report"""
     report = climate_persistence.get_latest_soil_report(farmer_id, field_id)
@@ -121,6 +126,7 @@ async def get_soil_report(farmer_id: str, field_id: str):
 # ============================================================================
 
 @router.post('/lcrs/calculate')
+@request_scoped
 async def calculate_lcrs(payload: LCRSRequest):
     """Calculate Localized Climate Risk Score"""
     lcrs_data = lcrs_engine.calculate_lcrs(
@@ -142,6 +148,7 @@ async def calculate_lcrs(payload: LCRSRequest):
     return JSONResponse(lcrs_data)
 
 @router.get('/lcrs/{farmer_id}/{field_id}')
+@request_scoped
 async def get_lcrs(farmer_id: str, field_id: str):
     """Get cached LCRS for farmer's field"""
     lcrs_data = climate_persistence.get_lcrs(farmer_id, field_id)
@@ -155,6 +162,7 @@ async def get_lcrs(farmer_id: str, field_id: str):
 # ============================================================================
 
 @router.get('/planting_window/{crop}')
+@request_scoped
 async def get_planting_window(crop: str, lat: float = None, lon: float = None):
     """Get optimal planting window for a crop"""
     location = {'lat': lat, 'lon': lon} if lat and lon else {}
@@ -162,6 +170,7 @@ async def get_planting_window(crop: str, lat: float = None, lon: float = None):
     return JSONResponse(window)
 
 @router.post('/planting/check_status')
+@request_scoped
 async def check_planting_status(payload: PlantingCheckRequest):
     """Check if farmer is on time, early, or late for planting"""
     status = planting_window.check_planting_status(
@@ -173,6 +182,7 @@ async def check_planting_status(payload: PlantingCheckRequest):
     return JSONResponse(status)
 
 @router.post('/planting/record')
+@request_scoped
 async def record_planting(payload: PlantingRecordPayload):
     """Record when farmer plants a crop"""
     climate_persistence.add_planting_record(
@@ -186,6 +196,7 @@ async def record_planting(payload: PlantingRecordPayload):
     return JSONResponse({'recorded': True, 'message': f'{payload.crop} planting recorded for {payload.planting_date}'})
 
 @router.get('/planting/active/{farmer_id}')
+@request_scoped
 async def get_active_plantings(farmer_id: str, field_id: str = None):
     """Get farmer's active plantings"""
     plantings = climate_persistence.get_active_plantings(farmer_id, field_id)
@@ -196,6 +207,7 @@ async def get_active_plantings(farmer_id: str, field_id: str = None):
 # ============================================================================
 
 @router.post('/diversification/plan')
+@request_scoped
 async def get_diversification_plan(payload: DiversificationRequest):
     """Generate crop diversification plan based on LCRS"""
     plan = planting_window.generate_diversification_plan(
@@ -211,6 +223,7 @@ async def get_diversification_plan(payload: DiversificationRequest):
 # ============================================================================
 
 @router.post('/harvest/predict')
+@request_scoped
 async def predict_harvest(payload: HarvestAlertRequest):
     """Generate harvest prediction with weather forecast and storage check"""
     alert = harvest_prediction.generate_harvest_alert(
@@ -226,12 +239,14 @@ async def predict_harvest(payload: HarvestAlertRequest):
     return JSONResponse(alert)
 
 @router.get('/harvest/predictions/{farmer_id}')
+@request_scoped
 async def get_harvest_predictions(farmer_id: str):
     """Get all harvest predictions for farmer"""
     predictions = climate_persistence.get_harvest_predictions(farmer_id)
     return JSONResponse({'count': len(predictions), 'predictions': predictions})
 
 @router.get('/harvest/calendar/{farmer_id}')
+@request_scoped
 async def get_harvest_calendar(farmer_id: str):
     """
     Get harvest calendar showing all upcoming harvests with alerts.
@@ -271,6 +286,7 @@ async def get_harvest_calendar(farmer_id: str):
 # ============================================================================
 
 @router.get('/dashboard/{farmer_id}')
+@request_scoped
 async def get_farmer_dashboard(farmer_id: str, field_id: str = None):
     """
     Get comprehensive farmer dashboard with:
@@ -76,7 +76,7 @@ async def get_model_info(model_name: str):
             )
         
         # Check if model is available
-        is_available = config["path"].exists()
+        is_available = model_manager.is_available(model_name)
         is_loaded = model_name in model_manager.models
         
         # Get class mapping if available
@@ -87,12 +87,12 @@ async def get_model_info(model_name: str):
             "model_name": model_name,
             "available": is_available,
             "loaded": is_loaded,
-            "type": config["type"],
-            "description": config["description"],
-            "input_shape": config.get("input_shape"),
+            "type": config.type,
+            "description": config.description,
+            "input_shape": config.input_shape,
             "classes": classes if classes else None,
             "num_classes": len(classes) if classes else None,
-            "path": str(config["path"])
+            "path": str(config.path)
         }
     
     except HTTPException:
@@ -122,7 +122,7 @@ async def load_model(model_name: str):
             "success": True,
             "message": f"Model {model_name} loaded successfully",
             "model_name": model_name,
-            "type": model_manager.get_model_config(model_name)["type"]
+            "type": model_manager.get_model_config(model_name).type
         }
     
     except HTTPException:
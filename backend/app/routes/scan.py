@@ -1,4 +1,5 @@
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from PIL import Image
 import io, numpy as np, os, requests
@@ -147,8 +148,9 @@ async def leaf(
         # Create PIL Image from bytes
         image = Image.open(io.BytesIO(contents))
         
-        # Run ML inference for both pest and disease
-        ml_result = ml_inference.analyze_plant_image(image)
+        # Run ML inference for both pest and disease (off the event loop, so
+        # concurrent scans can share a model batch)
+        ml_result = await run_in_threadpool(ml_inference.analyze_plant_image, image)
         
         # Extract results
         pest_disease_id = ml_result["primary_diagnosis"]
@@ -479,7 +481,7 @@ async def scan_soil(
         image = Image.open(io.BytesIO(contents))
         
         # Run ML soil classification
-        soil_result = ml_inference.predict_soil_type(image)
+        soil_result = await run_in_threadpool(ml_inference.predict_soil_type, image)
         
         # Add location data
         soil_result["location"] = {
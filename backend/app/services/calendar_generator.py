@@ -9,11 +9,11 @@ ENHANCED WITH AI:
 """
 
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
-from .growth_model import get_crop_model, get_current_growth_stage
+from .growth_model import get_crop_model, get_current_growth_stage, parse_iso
 from .lcrs_engine import estimate_weather_forecast_risk
 from .ai_calendar_intelligence import (
     adjust_practice_date_with_weather,
@@ -25,19 +25,116 @@ from .ai_calendar_intelligence import (
 DATA_DIR = Path(__file__).parent.parent / "data"
 CALENDARS_FILE = DATA_DIR / "farm_calendars.json"
 
+# Append-only log of small calendar updates (one JSON event per line),
+# replayed over CALENDARS_FILE on load and folded into it on save
+CALENDAR_EVENTS_FILE = DATA_DIR / "farm_calendar_events.jsonl"
+
+# Calendars with events replayed, reused while CALENDARS_FILE's mtime is
+# unchanged; "events_offset" is how many bytes of the events log are applied.
+# load_calendars returns the cached object itself: save what you modify.
+_calendars_cache: Dict = {"mtime": None, "events_offset": 0, "data": None}
+
+
+def _file_version(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _events_size() -> int:
+    try:
+        return CALENDAR_EVENTS_FILE.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def calendars_version() -> Tuple[Optional[int], int]:
+    """Token that changes whenever the calendars or their event log change"""
+    return _file_version(CALENDARS_FILE), _events_size()
+
 
 def load_calendars() -> Dict:
-    """Load all farm calendars"""
-    if CALENDARS_FILE.exists():
-        with open(CALENDARS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    """Load all farm calendars, with pending events applied"""
+    mtime = _file_version(CALENDARS_FILE)
+    events_size = _events_size()
+    
+    # A shrunken log means another writer compacted it into the main file
+    if (_calendars_cache["data"] is None or _calendars_cache["mtime"] != mtime
+            or events_size < _calendars_cache["events_offset"]):
+        calendars = {}
+        if mtime is not None:
+            with open(CALENDARS_FILE, 'r') as f:
+                calendars = json.load(f)
+        _calendars_cache.update(mtime=mtime, events_offset=0, data=calendars)
+    
+    if events_size > _calendars_cache["events_offset"]:
+        with open(CALENDAR_EVENTS_FILE, 'rb') as f:
+            f.seek(_calendars_cache["events_offset"])
+            pending = f.read()
+        # Leave a partially written last line for the next load
+        complete = pending[:pending.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            if line.strip():
+                _apply_calendar_event(_calendars_cache["data"], json.loads(line))
+        _calendars_cache["events_offset"] += len(complete)
+    
+    return _calendars_cache["data"]
 
 
 def save_calendars(calendars: Dict):
-    """Save farm calendars"""
+    """Save farm calendars, folding in (and clearing) the event log"""
     with open(CALENDARS_FILE, 'w') as f:
         json.dump(calendars, f, indent=2)
+    # Events are idempotent, so a crash before this truncate only replays them
+    if CALENDAR_EVENTS_FILE.exists():
+        open(CALENDAR_EVENTS_FILE, 'w').close()
+    _calendars_cache.update(
+        mtime=_file_version(CALENDARS_FILE), events_offset=0, data=calendars
+    )
+
+
+def append_calendar_event(event: Dict):
+    """
+    Persist a small calendar update as one event line instead of rewriting
+    all calendars, applying it to the cached calendars when they are current
+    """
+    in_sync = (
+        _calendars_cache["data"] is not None
+        and (_calendars_cache["mtime"], _calendars_cache["events_offset"]) == calendars_version()
+    )
+    
+    line = json.dumps(event, separators=(',', ':')).encode() + b'\n'
+    with open(CALENDAR_EVENTS_FILE, 'ab') as f:
+        f.write(line)
+    
+    if in_sync:
+        _apply_calendar_event(_calendars_cache["data"], event)
+        _calendars_cache["events_offset"] += len(line)
+
+
+def _apply_calendar_event(calendars: Dict, event: Dict):
+    """Apply one logged event to loaded calendars (events are idempotent)"""
+    if event["op"] == "mark_photo_completed":
+        field_calendars = calendars.get(event["field_id"])
+        if not field_calendars:
+            return
+        for prompt in field_calendars[-1].get("photo_schedule", []):
+            if prompt["photo_number"] == event["photo_number"]:
+                prompt["status"] = "completed"
+                prompt["photo_url"] = event["photo_url"]
+                break
+
+
+def compact_calendars():
+    """
+    Fold the calendar event log into the main calendars file
+    
+    Run periodically (e.g. from cron) to keep the log short:
+    python -c "from app.services.calendar_generator import compact_calendars; compact_calendars()"
+    """
+    if _events_size():
+        save_calendars(load_calendars())
 
 
 def generate_season_calendar(
@@ -61,7 +158,7 @@ def generate_season_calendar(
         Complete calendar with all scheduled activities
     """
     model = get_crop_model(crop, variety)
-    planting = datetime.fromisoformat(planting_date.replace('Z', ''))
+    planting = parse_iso(planting_date)
     
     # Generate base calendar from growth model
     calendar = {
@@ -349,7 +446,7 @@ def _calculate_harvest_window(
     Returns:
         Harvest window with weather forecast and recommendations
     """
-    planting = datetime.fromisoformat(planting_date.replace('Z', ''))
+    planting = parse_iso(planting_date)
     
     # Base harvest date
     harvest_date = planting + timedelta(days=maturity_days)
@@ -473,7 +570,7 @@ def _get_harvest_tips(crop: str, precipitation_risk: str) -> List[str]:
 
 def _generate_photo_schedule(planting_date: str, maturity_days: int) -> List[Dict]:
     """Generate weekly photo prompt schedule"""
-    planting = datetime.fromisoformat(planting_date.replace('Z', ''))
+    planting = parse_iso(planting_date)
     
     schedule = []
     photo_day = 7  # Start at day 7
@@ -483,6 +580,7 @@ def _generate_photo_schedule(planting_date: str, maturity_days: int) -> List[Dic
         schedule.append({
             "photo_number": len(schedule) + 1,
             "due_date": photo_date.isoformat(),
+            "due_epoch": int(photo_date.replace(tzinfo=timezone.utc).timestamp()),
             "days_after_planting": photo_day,
             "prompt": f"📸 Week {len(schedule) + 1} Photo: Capture overview and close-up of leaves",
             "status": "pending",
@@ -513,14 +611,16 @@ def get_pending_practices(field_id: str, days_lookahead: int = 7) -> List[Dict]:
     pending = []
     for practice in calendar["practices"]:
         if practice["status"] == "pending":
-            due_date = datetime.fromisoformat(practice["due_date"].replace('Z', ''))
+            due_date = parse_iso(practice["due_date"])
             
             # Include if within lookahead or overdue
             if due_date <= lookahead_date:
                 days_until = (due_date - now).days
-                practice["days_until_due"] = days_until
-                practice["is_overdue"] = days_until < 0
-                pending.append(practice)
+                pending.append({
+                    **practice,
+                    "days_until_due": days_until,
+                    "is_overdue": days_until < 0
+                })
     
     return sorted(pending, key=lambda x: x["days_until_due"])
 
@@ -564,7 +664,7 @@ def get_completion_rate(field_id: str) -> Dict:
     now = datetime.utcnow()
     overdue = sum(1 for p in calendar["practices"]
                   if p["status"] != "completed" and 
-                  datetime.fromisoformat(p["scheduled_date"].replace('Z', '')) < now)
+                  parse_iso(p["scheduled_date"]) < now)
     
     return {
         "completion_rate": round((completed / total * 100) if total > 0 else 0, 1),
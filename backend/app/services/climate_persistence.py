@@ -3,10 +3,18 @@ Climate data persistence for weather, soil moisture, and risk scores.
 Stores crowdsourced rain reports, soil moisture index, and LCRS calculations.
 """
 import json
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
 from threading import Lock
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 BASE = Path(__file__).resolve().parent.parent / 'data'
 BASE.mkdir(exist_ok=True)
@@ -29,8 +37,17 @@ def _save(fname, data):
 # WEATHER & RAIN REPORTS
 # ============================================================================
 
+def _to_epoch(ts: str) -> int:
+    """Whole epoch seconds for a naive UTC ISO timestamp"""
+    return int(datetime.fromisoformat(ts).replace(tzinfo=timezone.utc).timestamp())
+
+def report_epoch(report: Dict) -> int:
+    """Report time as epoch seconds (parsed for reports stored before ts_epoch)"""
+    ts_epoch = report.get('ts_epoch')
+    return ts_epoch if ts_epoch is not None else _to_epoch(report['ts'])
+
 def add_rain_report(farmer_id: str, location: dict, amount: str, ts: str = None):
-    """Add crowdsourced rain report: {farmer_id, location: {lat, lon}, amount: 'none'|'light'|'moderate'|'heavy', ts}"""
+    """Add crowdsourced rain report: {farmer_id, location: {lat, lon}, amount: 'none'|'light'|'moderate'|'heavy', ts, ts_epoch}"""
     reports = _load('rain_reports.json', [])
     if not ts:
         ts = datetime.utcnow().isoformat()
@@ -38,22 +55,86 @@ def add_rain_report(farmer_id: str, location: dict, amount: str, ts: str = None)
         'farmer_id': farmer_id,
         'location': location,
         'amount': amount,
-        'ts': ts
+        'ts': ts,
+        'ts_epoch': _to_epoch(ts)
     })
     _save('rain_reports.json', reports)
+    _reset_rain_index()
+    
+    # A rain report can move the risk of any field nearby
+    from .lcrs_engine import invalidate_lcrs
+    invalidate_lcrs()
 
 def get_rain_reports(days: int = 7, location: dict = None) -> List[Dict]:
-    """Get rain reports from last N days, optionally filtered by location proximity"""
-    reports = _load('rain_reports.json', [])
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    recent = [r for r in reports if datetime.fromisoformat(r['ts']) >= cutoff]
-    
+    """Get rain reports from last N days (oldest first), optionally filtered by location proximity"""
+    return _near(_recent_rain_reports(days), location)
+
+# Rain reports sorted by time, with their epoch seconds alongside, so a
+# recent window is one bisect away; rebuilt when rain_reports.json changes.
+# With NumPy the index also carries lat/lon/score columns for scoring.
+_rain_index = None
+
+def _rain_report_index() -> Dict:
+    global _rain_index
+    path = BASE / 'rain_reports.json'
+    mtime = path.stat().st_mtime_ns if path.exists() else None
+    index = _rain_index
+    if index is None or index['mtime'] != mtime or index['path'] != path:
+        reports = sorted(_load('rain_reports.json', []), key=report_epoch)
+        index = {'path': path, 'mtime': mtime, 'reports': reports, 'ts_epoch': [report_epoch(r) for r in reports]}
+        if NUMPY_AVAILABLE:
+            index['columns'] = {
+                'ts_epoch': np.array(index['ts_epoch'], dtype=np.int64),
+                'lat': np.array([r['location']['lat'] for r in reports], dtype=np.float64),
+                'lon': np.array([r['location']['lon'] for r in reports], dtype=np.float64),
+                'score': np.array(
+                    [RAIN_AMOUNT_SCORES.get(r['amount'], UNKNOWN_RAIN_SCORE) for r in reports], dtype=np.float64
+                )
+            }
+        _rain_index = index
+    return index
+
+def _reset_rain_index():
+    global _rain_index
+    _rain_index = None
+
+def _cutoff_epoch(days: int) -> int:
+    return int(datetime.now(timezone.utc).timestamp()) - days * 86400
+
+def _recent_rain_reports(days: int) -> List[Dict]:
+    """Reports from the last N days, oldest first, in O(log N + k)"""
+    index = _rain_report_index()
+    return index['reports'][bisect_left(index['ts_epoch'], _cutoff_epoch(days)):]
+
+def _near(reports: List[Dict], location: Optional[dict]) -> List[Dict]:
     if location and 'lat' in location and 'lon' in location:
         # Simple proximity filter (within ~50km = 0.5 degrees)
         lat, lon = location['lat'], location['lon']
-        recent = [r for r in recent if abs(r['location']['lat'] - lat) < 0.5 and abs(r['location']['lon'] - lon) < 0.5]
-    
-    return recent
+        reports = [r for r in reports if abs(r['location']['lat'] - lat) < 0.5 and abs(r['location']['lon'] - lon) < 0.5]
+    return reports
+
+# Rain adequacy score per reported amount (1 = adequate rain); other amounts
+# score UNKNOWN_RAIN_SCORE
+RAIN_AMOUNT_SCORES = {
+    'none': 0.0,
+    'light': 0.3,
+    'moderate': 0.7,
+    'heavy': 1.0
+}
+UNKNOWN_RAIN_SCORE = 0.5
+
+def get_rain_report_scores(days: int = 7, location: dict = None) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Projection of get_rain_reports to just what scoring needs, as parallel
+    NumPy columns: amount scores (float64) and report times (int64 epoch seconds)
+    """
+    columns = _rain_report_index()['columns']
+    start = int(np.searchsorted(columns['ts_epoch'], _cutoff_epoch(days)))
+    scores, ts_epoch = columns['score'][start:], columns['ts_epoch'][start:]
+    if location and 'lat' in location and 'lon' in location:
+        near = (np.abs(columns['lat'][start:] - location['lat']) < 0.5) & (np.abs(columns['lon'][start:] - location['lon']) < 0.5)
+        scores, ts_epoch = scores[near], ts_epoch[near]
+    return scores, ts_epoch
 
 # ============================================================================
 # SOIL MOISTURE REPORTS
@@ -75,6 +156,9 @@ def add_soil_report(farmer_id: str, field_id: str, moisture_level: str, ts: str
         'ts': ts
     })
     _save('soil_reports.json', reports)
+    
+    from .lcrs_engine import invalidate_lcrs
+    invalidate_lcrs(farmer_id, field_id)
 
 def get_latest_soil_report(farmer_id: str, field_id: str) -> Optional[Dict]:
     """Get farmer's latest soil moisture report for a field"""
@@ -84,6 +168,16 @@ def get_latest_soil_report(farmer_id: str, field_id: str) -> Optional[Dict]:
     field_reports = reports[farmer_id][field_id]
     return field_reports[-1] if field_reports else None
 
+def get_latest_soil_reports(pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Dict]]:
+    """get_latest_soil_report for several (farmer_id, field_id) pairs, reading the reports once"""
+    reports = _load('soil_reports.json', {})
+    latest = {}
+    for farmer_id, field_id in pairs:
+        field_reports = reports.get(farmer_id, {}).get(field_id)
+        latest[(farmer_id, field_id)] = field_reports[-1] if field_reports else None
+    return latest
+
+@lru_cache(maxsize=256)
 def calculate_soil_moisture_index(moisture_level: str) -> float:
     """Convert qualitative soil moisture to numeric index (0-100)"""
     levels = {
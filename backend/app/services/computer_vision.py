@@ -192,8 +192,8 @@ def preprocess_image(
         # Convert to numpy array
         img_array = np.array(image, dtype=np.float32)
         
-        # Normalize to [0, 1]
-        img_array = img_array / 255.0
+        # Normalize to [0, 1] in place, staying in float32
+        img_array /= np.float32(255.0)
         
         # Add batch dimension
         img_array = np.expand_dims(img_array, axis=0)
@@ -473,7 +473,7 @@ class EnhancedModelTrainingService:
                 'model': model,
                 'encoders': encoders,
                 'features': features
-            }, f)
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
         
         results = {
             "model_type": "yield_prediction",
@@ -559,7 +559,7 @@ class EnhancedModelTrainingService:
         model.save(str(model_path))
         
         with open(self.models_dir / "climate_scaler.pkl", 'wb') as f:
-            pickle.dump(scaler, f)
+            pickle.dump(scaler, f, protocol=pickle.HIGHEST_PROTOCOL)
         
         results = {
             "model_type": "climate_prediction",
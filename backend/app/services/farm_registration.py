@@ -26,6 +26,7 @@ DATA_DIR = Path(__file__).parent.parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
 FARMS_FILE = DATA_DIR / "farms.json"
+FARMS_BY_CROP_FILE = DATA_DIR / "farms_by_crop.json"
 SOIL_DATA_FILE = DATA_DIR / "soil_data.json"
 SOIL_PHOTOS_FILE = DATA_DIR / "soil_photos.json"
 
@@ -39,9 +40,41 @@ def load_farms() -> Dict:
 
 
 def save_farms(farms: Dict):
-    """Save farm registrations"""
+    """Save farm registrations (and the crop index derived from them)"""
     with open(FARMS_FILE, 'w') as f:
         json.dump(farms, f, indent=2)
+    save_farms_by_crop(_build_farms_by_crop(farms))
+
+
+def _build_farms_by_crop(farms: Dict) -> Dict[str, List[str]]:
+    """Field IDs grouped by crop"""
+    farms_by_crop: Dict[str, List[str]] = {}
+    for fields in farms.values():
+        for field_id, farm in fields.items():
+            farms_by_crop.setdefault(farm["crop"], []).append(field_id)
+    return farms_by_crop
+
+
+def load_farms_by_crop() -> Dict[str, List[str]]:
+    """
+    Load the crop index ({crop: [field_id, ...]})
+    
+    Kept in step with farms.json by save_farms; built from the farms file
+    the first time it is missing.
+    """
+    if FARMS_BY_CROP_FILE.exists():
+        with open(FARMS_BY_CROP_FILE, 'r') as f:
+            return json.load(f)
+    
+    farms_by_crop = _build_farms_by_crop(load_farms())
+    save_farms_by_crop(farms_by_crop)
+    return farms_by_crop
+
+
+def save_farms_by_crop(farms_by_crop: Dict[str, List[str]]):
+    """Save the crop index"""
+    with open(FARMS_BY_CROP_FILE, 'w') as f:
+        json.dump(farms_by_crop, f, indent=2)
 
 
 def load_soil_data() -> Dict:
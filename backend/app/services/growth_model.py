@@ -4,10 +4,21 @@ Provides crop-specific growth stages, development timelines, and phenological da
 """
 
 import json
+from bisect import bisect_right
+from collections import namedtuple
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from pathlib import Path
 
+# Lightweight current-stage record for internal callers; convert with
+# _asdict() only at the JSON boundary
+CurrentStage = namedtuple(
+    "CurrentStage",
+    "stage_key stage_name stage_start stage_end days_in_stage days_remaining_in_stage progress_percent"
+)
+
 # Growth models for major crops
 # All timings are in days after planting (DAP)
 CROP_GROWTH_MODELS = {
@@ -392,10 +403,66 @@ CROP_GROWTH_MODELS = {
 }
 
 
+def _build_stage_index(model: Dict) -> None:
+    """
+    Precompute stage lookup tables for a variety model (in place)
+
+    Stages overlap (e.g. tasseling 55-65, silking 60-70), so the day axis is
+    split at every stage start and every day after a stage end. Within each
+    interval the active stage set is constant; `_primary_stage_at[i]` holds the
+    first stage in insertion order covering `_boundary_days[i]`, matching the
+    first-match semantics of a linear scan over `model["stages"]`.
+    
+    Also caches per-stage progress rates, freezes the critical water stages and
+    caches the variety's rounded daily/weekly water requirement.
+    """
+    stages = model["stages"]
+    boundary_days = sorted(
+        {stage["start"] for stage in stages.values()}
+        | {stage["end"] + 1 for stage in stages.values()}
+    )
+    model["_boundary_days"] = boundary_days
+    model["_primary_stage_at"] = [
+        next(
+            (key for key, stage in stages.items() if stage["start"] <= day <= stage["end"]),
+            None
+        )
+        for day in boundary_days
+    ]
+    # Stage lengths in days, for progress_percent; zero-length stages report 0%
+    model["_stage_length"] = {key: stage["end"] - stage["start"] for key, stage in stages.items()}
+    
+    # Keep the ordered list for API output; membership checks use the frozenset
+    water_req = model["water_requirements"]
+    water_req.setdefault("critical_stages_ordered", list(water_req["critical_stages"]))
+    water_req["critical_stages"] = frozenset(water_req["critical_stages_ordered"])
+    
+    # Seasonal water need spread evenly over the crop cycle
+    daily_mm = water_req["total_mm"] / model["maturity_days"]
+    model["_daily_mm"] = round(daily_mm, 1)
+    model["_weekly_mm"] = round(daily_mm * 7, 1)
+
+
+def _stage_key_at(model: Dict, day: int) -> Optional[str]:
+    """Return the stage key active on a given day after planting, or None"""
+    i = bisect_right(model["_boundary_days"], day) - 1
+    if i < 0:
+        return None
+    return model["_primary_stage_at"][i]
+
+
+for _crop_data in CROP_GROWTH_MODELS.values():
+    for _variety_model in _crop_data["varieties"].values():
+        _build_stage_index(_variety_model)
+
+
+@lru_cache(maxsize=64)
 def get_crop_model(crop: str, variety: Optional[str] = None) -> Dict:
     """
     Get growth model for a specific crop and variety
     
+    Cached per (crop, variety); the returned model is shared, do not mutate.
+    
     Args:
         crop: Crop name (e.g., "maize", "beans")
         variety: Specific variety (optional, uses default if not provided)
@@ -420,6 +487,82 @@ def get_crop_model(crop: str, variety: Optional[str] = None) -> Dict:
     return crop_data["varieties"][variety]
 
 
+def _stage_progress(days_in_stage: int, stage_length: int) -> int:
+    """Whole percent of a stage completed, rounded as the stage lookups always have"""
+    return int((days_in_stage / stage_length) * 100) if stage_length > 0 else 0
+
+
+def _current_stage(
+    model: Dict,
+    days_after_planting: int,
+    stage_key: Optional[str]
+) -> Optional[CurrentStage]:
+    """Build the current stage record from a resolved stage key"""
+    # If past maturity
+    if days_after_planting > model["maturity_days"]:
+        return CurrentStage(
+            "overdue",
+            "Past Maturity (Harvest Overdue)",
+            model["maturity_days"],
+            model["maturity_days"],
+            days_after_planting - model["maturity_days"],
+            0,
+            100
+        )
+    
+    if stage_key is None:
+        return None
+    
+    stage_data = model["stages"][stage_key]
+    return CurrentStage(
+        stage_key,
+        stage_data["name"],
+        stage_data["start"],
+        stage_data["end"],
+        days_after_planting - stage_data["start"],
+        stage_data["end"] - days_after_planting,
+        _stage_progress(days_after_planting - stage_data["start"], model["_stage_length"][stage_key])
+    )
+
+
+def _growth_stage_status(
+    model: Dict,
+    crop: str,
+    variety: str,
+    planting_date: str,
+    days_after_planting: int,
+    stage_key: Optional[str]
+) -> Dict:
+    """Build the growth stage status for a field from its resolved stage key"""
+    current_stage = _current_stage(model, days_after_planting, stage_key)
+    
+    return {
+        "days_after_planting": days_after_planting,
+        "current_stage": current_stage._asdict() if current_stage else None,
+        "planting_date": planting_date,
+        "crop": crop,
+        "variety": variety,
+        "maturity_days": model["maturity_days"],
+        "overall_progress_percent": min(int((days_after_planting / model["maturity_days"]) * 100), 100)
+    }
+
+
+def parse_iso(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp as a naive UTC datetime
+    
+    A trailing 'Z' is sliced off rather than handed to fromisoformat, which
+    would return an aware datetime that cannot be compared with utcnow().
+    """
+    return datetime.fromisoformat(value[:-1] if value.endswith('Z') else value)
+
+
+def _days_after_planting(planting_date: str) -> int:
+    """Whole days elapsed since an ISO planting date (UTC)"""
+    planting = parse_iso(planting_date)
+    return (datetime.utcnow() - planting).days
+
+
 def get_current_growth_stage(
     crop: str,
     variety: str,
@@ -437,48 +580,80 @@ def get_current_growth_stage(
         Dictionary with current stage info and days after planting
     """
     model = get_crop_model(crop, variety)
-    planting = datetime.fromisoformat(planting_date.replace('Z', ''))
-    now = datetime.utcnow()
-    
-    days_after_planting = (now - planting).days
+    days_after_planting = _days_after_planting(planting_date)
     
     # Find current stage
-    current_stage = None
-    for stage_key, stage_data in model["stages"].items():
-        if stage_data["start"] <= days_after_planting <= stage_data["end"]:
-            current_stage = {
-                "stage_key": stage_key,
-                "stage_name": stage_data["name"],
-                "stage_start": stage_data["start"],
-                "stage_end": stage_data["end"],
-                "days_in_stage": days_after_planting - stage_data["start"],
-                "days_remaining_in_stage": stage_data["end"] - days_after_planting,
-                "progress_percent": int(((days_after_planting - stage_data["start"]) / 
-                                        (stage_data["end"] - stage_data["start"])) * 100)
-            }
-            break
+    stage_key = _stage_key_at(model, days_after_planting)
     
-    # If past maturity
-    if days_after_planting > model["maturity_days"]:
-        current_stage = {
-            "stage_key": "overdue",
-            "stage_name": "Past Maturity (Harvest Overdue)",
-            "stage_start": model["maturity_days"],
-            "stage_end": model["maturity_days"],
-            "days_in_stage": days_after_planting - model["maturity_days"],
-            "days_remaining_in_stage": 0,
-            "progress_percent": 100
-        }
+    return _growth_stage_status(
+        model, crop, variety, planting_date, days_after_planting, stage_key
+    )
+
+
+def get_current_growth_stage_fast(
+    crop: str,
+    variety: str,
+    planting_date: str
+) -> Optional[CurrentStage]:
+    """
+    Allocation-light variant of get_current_growth_stage for internal callers
     
-    return {
-        "days_after_planting": days_after_planting,
-        "current_stage": current_stage,
-        "planting_date": planting_date,
-        "crop": crop,
-        "variety": variety,
-        "maturity_days": model["maturity_days"],
-        "overall_progress_percent": min(int((days_after_planting / model["maturity_days"]) * 100), 100)
-    }
+    Returns:
+        CurrentStage namedtuple (same fields as the "current_stage" dict), or
+        None if the planting date falls outside every stage
+    """
+    model = get_crop_model(crop, variety)
+    days_after_planting = _days_after_planting(planting_date)
+    
+    return _current_stage(model, days_after_planting, _stage_key_at(model, days_after_planting))
+
+
+def compute_statuses(fields: List[Tuple[str, Optional[str], str]]) -> List[Dict]:
+    """
+    Determine current growth stage for many fields in one pass
+    
+    Days after planting are computed for all fields at once with NumPy, and
+    stages are resolved per variety with a single searchsorted over the
+    precomputed stage boundaries.
+    
+    Args:
+        fields: List of (crop, variety, planting_date) tuples
+    
+    Returns:
+        One status per field, in input order, with the same schema as
+        get_current_growth_stage
+    """
+    import numpy as np
+    
+    if not fields:
+        return []
+    
+    planted = np.array(
+        [field[2][:-1] if field[2].endswith('Z') else field[2] for field in fields],
+        dtype="datetime64[us]"
+    )
+    now = np.datetime64(datetime.utcnow(), "us")
+    days_after_planting = (now - planted) // np.timedelta64(1, "D")
+    
+    # Group rows by crop/variety so each stage table is searched once
+    groups: Dict[Tuple[str, Optional[str]], List[int]] = {}
+    for row, (crop, variety, _) in enumerate(fields):
+        groups.setdefault((crop, variety), []).append(row)
+    
+    statuses: List[Optional[Dict]] = [None] * len(fields)
+    for (crop, variety), rows in groups.items():
+        model = get_crop_model(crop, variety)
+        group_days = days_after_planting[rows]
+        slots = np.searchsorted(model["_boundary_days"], group_days, side="right") - 1
+        primary_stage_at = model["_primary_stage_at"]
+        
+        for row, day, slot in zip(rows, group_days.tolist(), slots.tolist()):
+            stage_key = primary_stage_at[slot] if slot >= 0 else None
+            statuses[row] = _growth_stage_status(
+                model, crop, variety, fields[row][2], day, stage_key
+            )
+    
+    return statuses
 
 
 def get_upcoming_practices(
@@ -500,7 +675,7 @@ def get_upcoming_practices(
         List of upcoming practices with due dates
     """
     model = get_crop_model(crop, variety)
-    planting = datetime.fromisoformat(planting_date.replace('Z', ''))
+    planting = parse_iso(planting_date)
     now = datetime.utcnow()
     
     days_after_planting = (now - planting).days
@@ -535,6 +710,7 @@ def get_upcoming_practices(
     return sorted(upcoming, key=lambda x: x["days_until_due"])
 
 
+@lru_cache(maxsize=64)
 def calculate_optimal_growth_curve(
     crop: str,
     variety: str,
@@ -544,6 +720,8 @@ def calculate_optimal_growth_curve(
     Generate optimal health score curve for the crop
     Used for comparing actual growth photos against expected progress
     
+    Cached per arguments; the returned curve is shared, do not mutate.
+    
     Returns:
         List of datapoints: [{"day": 0, "optimal_health_score": 5}, ...]
     """
@@ -596,25 +774,17 @@ def get_water_requirements_by_stage(
     water_req = model["water_requirements"]
     
     # Determine current stage
-    current_stage_key = None
-    for stage_key, stage_data in model["stages"].items():
-        if stage_data["start"] <= current_day <= stage_data["end"]:
-            current_stage_key = stage_key
-            break
+    current_stage_key = _stage_key_at(model, current_day)
     
     is_critical = current_stage_key in water_req["critical_stages"]
     
-    # Calculate weekly water requirement
-    daily_mm = water_req["total_mm"] / model["maturity_days"]
-    weekly_mm = daily_mm * 7
-    
     return {
         "total_season_mm": water_req["total_mm"],
-        "daily_mm": round(daily_mm, 1),
-        "weekly_mm": round(weekly_mm, 1),
+        "daily_mm": model["_daily_mm"],
+        "weekly_mm": model["_weekly_mm"],
         "current_stage": current_stage_key,
         "is_critical_stage": is_critical,
-        "critical_stages": water_req["critical_stages"],
+        "critical_stages": water_req["critical_stages_ordered"],
         "stress_impact": "HIGH - Critical for yield" if is_critical else "MEDIUM - Manageable deficit"
     }
 
@@ -624,18 +794,22 @@ def get_all_crops() -> List[str]:
     return list(CROP_GROWTH_MODELS.keys())
 
 
-def get_crop_varieties(crop: str) -> List[Dict]:
-    """Get all varieties for a crop"""
-    crop = crop.lower()
+@lru_cache(maxsize=32)
+def _varieties_for(crop: str) -> Tuple[Mapping, ...]:
+    """Build the read-only variety listing for a (lowercased) crop once"""
     if crop not in CROP_GROWTH_MODELS:
-        return []
+        return ()
     
-    varieties = []
-    for variety_key, variety_data in CROP_GROWTH_MODELS[crop]["varieties"].items():
-        varieties.append({
+    return tuple(
+        MappingProxyType({
             "key": variety_key,
             "name": variety_data["name"],
             "maturity_days": variety_data["maturity_days"]
         })
-    
-    return varieties
+        for variety_key, variety_data in CROP_GROWTH_MODELS[crop]["varieties"].items()
+    )
+
+
+def get_crop_varieties(crop: str) -> List[Mapping]:
+    """Get all varieties for a crop"""
+    return list(_varieties_for(crop.lower()))
@@ -4,44 +4,197 @@ Weekly photo uploads, health score visualization, and growth progress monitoring
 """
 
 import json
-from datetime import datetime, timedelta
+import os
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from threading import Lock
 
-from .growth_model import calculate_optimal_growth_curve, get_current_growth_stage
+from .growth_model import calculate_optimal_growth_curve, get_current_growth_stage, parse_iso
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
 
 # Data directory
 DATA_DIR = Path(__file__).parent.parent / "data"
-GROWTH_PHOTOS_FILE = DATA_DIR / "growth_photos.json"
-HEALTH_SCORES_FILE = DATA_DIR / "health_scores.json"
+
+# Append-only JSONL stores: one record per line, each carrying its field_id
+GROWTH_PHOTOS_FILE = DATA_DIR / "growth_photos.jsonl"
+HEALTH_SCORES_FILE = DATA_DIR / "health_scores.jsonl"
+
+# Pre-JSONL dict-of-lists files, migrated on first load
+LEGACY_GROWTH_PHOTOS_FILE = DATA_DIR / "growth_photos.json"
+LEGACY_HEALTH_SCORES_FILE = DATA_DIR / "health_scores.json"
+
+
+# Records grouped by field_id, reused while the file's mtime is unchanged.
+# Loaders return the cached object itself, so treat it as read-only.
+# "time_key" names the ISO timestamp mirrored as integer "ts_epoch".
+_photos_cache: Dict = {"mtime": None, "data": None, "time_key": "uploaded_at"}
+_scores_cache: Dict = {"mtime": None, "data": None, "time_key": "timestamp"}
+
+
+def _to_epoch(dt: datetime) -> int:
+    """Whole seconds since the Unix epoch for a naive UTC datetime"""
+    return int(dt.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _backfill_epoch(record: Dict, time_key: str) -> Dict:
+    """Add ts_epoch to records written before it was stored"""
+    if "ts_epoch" not in record and record.get(time_key):
+        record["ts_epoch"] = _to_epoch(parse_iso(record[time_key]))
+    return record
+
+
+def _loads(data: bytes):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_line(record: Dict) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record, separators=(',', ':')).encode() + b'\n'
+
+
+def _write_jsonl(path: Path, records_by_field: Dict):
+    """Rewrite a JSONL store from a dict-of-lists keyed by field_id"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.writelines(
+            _dump_line({"field_id": field_id, **record})
+            for field_id, records in records_by_field.items()
+            for record in records
+        )
+    os.replace(tmp_path, path)
+
+
+def migrate_legacy_json(legacy_path: Path, path: Path) -> bool:
+    """
+    One-shot conversion of a legacy dict-of-lists JSON file to JSONL
+    
+    Returns:
+        True if a legacy file was converted
+    """
+    if path.exists() or not legacy_path.exists():
+        return False
+    
+    with open(legacy_path, 'rb') as f:
+        _write_jsonl(path, _loads(f.read()))
+    return True
+
+
+def _load_cached(path: Path, legacy_path: Path, cache: Dict) -> Dict:
+    """Load a JSONL store grouped by field_id, reusing the cache if unchanged"""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        if not migrate_legacy_json(legacy_path, path):
+            return {}
+        mtime = path.stat().st_mtime_ns
+    
+    if cache["mtime"] != mtime:
+        records_by_field: Dict[str, List[Dict]] = {}
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    record = _backfill_epoch(_loads(line), cache["time_key"])
+                    records_by_field.setdefault(record["field_id"], []).append(record)
+        cache["data"] = records_by_field
+        cache["mtime"] = mtime
+    
+    return cache["data"]
+
+
+def _save_cached(path: Path, cache: Dict, data: Dict):
+    """Rewrite (compact) a JSONL store and refresh its cache entry"""
+    _write_jsonl(path, data)
+    cache["data"] = data
+    cache["mtime"] = path.stat().st_mtime_ns
+
+
+def _append_cached(path: Path, legacy_path: Path, cache: Dict, records: List[Dict]):
+    """Append records to a JSONL store in one write, keeping a warm cache in sync"""
+    try:
+        mtime_before = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        migrate_legacy_json(legacy_path, path)
+        mtime_before = None
+    
+    with open(path, 'ab') as f:
+        f.writelines(_dump_line(record) for record in records)
+    
+    if mtime_before is not None and cache["mtime"] == mtime_before:
+        for record in records:
+            _backfill_epoch(record, cache["time_key"])
+            cache["data"].setdefault(record["field_id"], []).append(record)
+        cache["mtime"] = path.stat().st_mtime_ns
+
+
+# Health score history per field as columns ({field_id: _HealthSeries}),
+# valid for the health scores file state recorded in "mtime"
+_health_soa: Dict = {"mtime": None, "by_field": {}}
 
 
 def load_growth_photos() -> Dict:
     """Load all growth tracking photos"""
-    if GROWTH_PHOTOS_FILE.exists():
-        with open(GROWTH_PHOTOS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(GROWTH_PHOTOS_FILE, LEGACY_GROWTH_PHOTOS_FILE, _photos_cache)
 
 
 def save_growth_photos(photos: Dict):
-    """Save growth tracking photos"""
-    with open(GROWTH_PHOTOS_FILE, 'w') as f:
-        json.dump(photos, f, indent=2)
+    """Save (rewrite) all growth tracking photos"""
+    _save_cached(GROWTH_PHOTOS_FILE, _photos_cache, photos)
+
+
+def append_photo_records(records: List[Dict]):
+    """Append growth photo records in a single write"""
+    _append_cached(GROWTH_PHOTOS_FILE, LEGACY_GROWTH_PHOTOS_FILE, _photos_cache, records)
+
+
+def append_photo_record(record: Dict):
+    """Append a single growth photo record"""
+    append_photo_records([record])
 
 
 def load_health_scores() -> Dict:
     """Load all health score records"""
-    if HEALTH_SCORES_FILE.exists():
-        with open(HEALTH_SCORES_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(HEALTH_SCORES_FILE, LEGACY_HEALTH_SCORES_FILE, _scores_cache)
 
 
 def save_health_scores(scores: Dict):
-    """Save health score records"""
-    with open(HEALTH_SCORES_FILE, 'w') as f:
-        json.dump(scores, f, indent=2)
+    """Save (rewrite) all health score records"""
+    _save_cached(HEALTH_SCORES_FILE, _scores_cache, scores)
+
+
+def append_health_score_records(records: List[Dict]):
+    """Append health score records in a single write"""
+    _append_cached(HEALTH_SCORES_FILE, LEGACY_HEALTH_SCORES_FILE, _scores_cache, records)
+
+
+def append_health_score_record(record: Dict):
+    """Append a single health score record"""
+    append_health_score_records([record])
 
 
 def upload_growth_photo(
@@ -66,32 +219,136 @@ def upload_growth_photo(
     """
     photos = load_growth_photos()
     
-    if field_id not in photos:
-        photos[field_id] = []
+    photo_record = _new_photo_record(
+        field_id, len(photos.get(field_id, [])) + 1,
+        photo_url, photo_type, notes, manual_health_score
+    )
+    
+    append_photo_record(photo_record)
+    
+    # Update health score history
+    _record_health_score(field_id, photo_record["health_score"], photo_record["photo_id"])
     
+    return photo_record
+
+
+def _new_photo_record(
+    field_id: str,
+    photo_number: int,
+    photo_url: str,
+    photo_type: str,
+    notes: Optional[str],
+    manual_health_score: Optional[int]
+) -> Dict:
+    """Build a photo record with its health score"""
     # Calculate health score (in production, this would use ML/AI)
     health_score = manual_health_score if manual_health_score else _estimate_health_score_from_photo(photo_url)
     
-    photo_record = {
-        "photo_id": f"{field_id}_photo_{len(photos[field_id]) + 1}",
+    uploaded_at = datetime.utcnow()
+    return {
+        "photo_id": f"{field_id}_photo_{photo_number}",
         "field_id": field_id,
         "photo_url": photo_url,
         "photo_type": photo_type,
-        "uploaded_at": datetime.utcnow().isoformat(),
+        "uploaded_at": uploaded_at.isoformat(),
+        "ts_epoch": _to_epoch(uploaded_at),
         "notes": notes,
         "health_score": health_score,
         "analysis_method": "manual" if manual_health_score else "auto"
     }
+
+
+def upload_growth_photo_batch(uploads: List[Dict]) -> List[Dict]:
+    """
+    Upload several growth tracking photos with one write per data file
     
-    photos[field_id].append(photo_record)
-    save_growth_photos(photos)
+    Args:
+        uploads: Dicts of upload_growth_photo arguments (field_id, photo_url,
+            photo_type, and optionally notes and manual_health_score)
     
-    # Update health score history
-    _record_health_score(field_id, health_score, photo_record["photo_id"])
+    Returns:
+        Photo records in input order
+    """
+    photos = load_growth_photos()
+    photo_counts: Dict[str, int] = {}
+    # Each upload queues a photo and a health score; only flush() writes
+    writer = GrowthWriter(batch_size=2 * len(uploads) + 1, flush_interval_s=float("inf"))
+    
+    photo_records = []
+    for upload in uploads:
+        field_id = upload["field_id"]
+        photo_counts[field_id] = photo_counts.get(field_id, len(photos.get(field_id, []))) + 1
+        
+        photo_record = _new_photo_record(
+            field_id, photo_counts[field_id],
+            upload["photo_url"], upload["photo_type"],
+            upload.get("notes"), upload.get("manual_health_score")
+        )
+        writer.add_photo(photo_record)
+        writer.add_score(
+            _new_health_score_record(field_id, photo_record["health_score"], photo_record["photo_id"])
+        )
+        photo_records.append(photo_record)
+    
+    writer.flush()
+    return photo_records
+
+
+class GrowthWriter:
+    """
+    Buffers photo and health score records and appends each kind to its
+    JSONL store in a single write.
     
-    return photo_record
+    Pending records are flushed when batch_size of them accumulate, when an
+    add happens flush_interval_s after the oldest pending record, or on an
+    explicit flush(). There is no background timer: call flush() when done.
+    """
+    
+    def __init__(self, batch_size: int = 20, flush_interval_s: float = 2.0):
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self._pending_photos: List[Dict] = []
+        self._pending_scores: List[Dict] = []
+        self._oldest_pending_at: Optional[float] = None
+        self._lock = Lock()
+    
+    def add_photo(self, record: Dict):
+        """Queue a growth photo record"""
+        with self._lock:
+            self._pending_photos.append(record)
+            self._maybe_flush()
+    
+    def add_score(self, record: Dict):
+        """Queue a health score record"""
+        with self._lock:
+            self._pending_scores.append(record)
+            self._maybe_flush()
+    
+    def flush(self):
+        """Write all pending records"""
+        with self._lock:
+            self._flush()
+    
+    def _maybe_flush(self):
+        if self._oldest_pending_at is None:
+            self._oldest_pending_at = time.monotonic()
+        
+        pending = len(self._pending_photos) + len(self._pending_scores)
+        if (pending >= self.batch_size
+                or time.monotonic() - self._oldest_pending_at >= self.flush_interval_s):
+            self._flush()
+    
+    def _flush(self):
+        if self._pending_photos:
+            append_photo_records(self._pending_photos)
+        if self._pending_scores:
+            _append_health_scores(self._pending_scores)
+        self._pending_photos = []
+        self._pending_scores = []
+        self._oldest_pending_at = None
 
 
+@lru_cache(maxsize=4096)
 def _estimate_health_score_from_photo(photo_url: str) -> int:
     """
     Estimate health score from photo
@@ -102,28 +359,196 @@ def _estimate_health_score_from_photo(photo_url: str) -> int:
     - Visible pests/diseases (reduces score)
     - Plant vigor (height, thickness of stem)
     
-    For now, returns a placeholder score
+    For now, returns a placeholder score. Results are cached per photo URL
+    so re-analysing the same upload (e.g. a retry) is free.
     """
     # Placeholder: In real implementation, call ML model
-    # For demo, return random-ish score based on timestamp
-    timestamp_hash = hash(photo_url + str(datetime.utcnow().timestamp()))
-    return (timestamp_hash % 4) + 6  # Returns 6-9 (simulates healthy plants)
+    # For demo, return a deterministic score from a 32-bit FNV-1a hash of the URL
+    url_hash = 2166136261
+    for byte in photo_url.encode():
+        url_hash = ((url_hash ^ byte) * 16777619) & 0xFFFFFFFF
+    return (url_hash % 4) + 6  # Returns 6-9 (simulates healthy plants)
 
 
 def _record_health_score(field_id: str, score: int, photo_id: Optional[str] = None):
     """Record health score in time series"""
-    scores = load_health_scores()
-    
-    if field_id not in scores:
-        scores[field_id] = []
-    
-    scores[field_id].append({
-        "timestamp": datetime.utcnow().isoformat(),
+    _append_health_scores([_new_health_score_record(field_id, score, photo_id)])
+
+
+def _new_health_score_record(field_id: str, score: int, photo_id: Optional[str] = None) -> Dict:
+    """Build a health score time series record"""
+    recorded_at = datetime.utcnow()
+    return {
+        "field_id": field_id,
+        "timestamp": recorded_at.isoformat(),
+        "ts_epoch": _to_epoch(recorded_at),
         "health_score": score,
         "photo_id": photo_id
-    })
+    }
+
+
+def _append_health_scores(records: List[Dict]):
+    """Persist health score records and apply them to the in-memory columns"""
+    soa_in_sync = (
+        _health_soa["mtime"] is not None
+        and _health_soa["mtime"] == _scores_cache["mtime"]
+    )
+    
+    append_health_score_records(records)
     
-    save_health_scores(scores)
+    if soa_in_sync:
+        for record in records:
+            _append_score(
+                record["field_id"], record["ts_epoch"], record["health_score"],
+                record.get("photo_id"), record["timestamp"]
+            )
+        _health_soa["mtime"] = _scores_cache["mtime"]
+
+
+def _int8_score(score) -> int:
+    """A health score as stored in the int8 score columns: rounded to nearest, clipped to ±127"""
+    return max(-127, min(127, round(score)))
+
+
+class _HealthSeries:
+    """
+    One field's health score history as parallel columns.
+    
+    ts_epoch (int64) and score (int8) are NumPy arrays grown by doubling when
+    NumPy is available, else array.array; photo_id and timestamp are lists.
+    """
+    
+    __slots__ = ("_ts_epoch", "_score", "photo_id", "timestamp", "size")
+    
+    def __init__(self, capacity: int = 8):
+        if NUMPY_AVAILABLE:
+            self._ts_epoch = np.empty(capacity, dtype=np.int64)
+            self._score = np.empty(capacity, dtype=np.int8)
+        else:
+            self._ts_epoch = array('q')
+            self._score = array('b')
+        self.photo_id: List[Optional[str]] = []
+        self.timestamp: List[str] = []
+        self.size = 0
+    
+    @property
+    def ts_epoch(self):
+        return self._ts_epoch[:self.size] if NUMPY_AVAILABLE else self._ts_epoch
+    
+    @property
+    def score(self):
+        return self._score[:self.size] if NUMPY_AVAILABLE else self._score
+    
+    def append(self, ts_epoch: int, score: int, photo_id: Optional[str], timestamp: str):
+        if NUMPY_AVAILABLE:
+            if self.size == len(self._ts_epoch):
+                self._ts_epoch = np.concatenate([self._ts_epoch, np.empty_like(self._ts_epoch)])
+                self._score = np.concatenate([self._score, np.empty_like(self._score)])
+            self._ts_epoch[self.size] = ts_epoch
+            self._score[self.size] = _int8_score(score)
+        else:
+            self._ts_epoch.append(ts_epoch)
+            self._score.append(_int8_score(score))
+        self.photo_id.append(photo_id)
+        self.timestamp.append(timestamp)
+        self.size += 1
+
+
+def _get_health_soa() -> Dict[str, _HealthSeries]:
+    """Health score columns per field, rebuilt when the scores file changes"""
+    scores = load_health_scores()
+    
+    if _health_soa["mtime"] != _scores_cache["mtime"]:
+        by_field: Dict[str, _HealthSeries] = {}
+        for fid, records in scores.items():
+            series = _HealthSeries(capacity=max(8, len(records)))
+            for record in records:
+                series.append(
+                    record["ts_epoch"], record["health_score"],
+                    record.get("photo_id"), record["timestamp"]
+                )
+            by_field[fid] = series
+        _health_soa.update(mtime=_scores_cache["mtime"], by_field=by_field)
+    
+    return _health_soa["by_field"]
+
+
+def _append_score(
+    field_id: str,
+    ts_epoch: int,
+    score: int,
+    photo_id: Optional[str],
+    timestamp: str
+):
+    """Append one score to a field's in-memory columns"""
+    series = _health_soa["by_field"].get(field_id)
+    if series is None:
+        series = _health_soa["by_field"][field_id] = _HealthSeries()
+    series.append(ts_epoch, score, photo_id, timestamp)
+
+
+def _nearest_optimal(curve_days, curve_scores, target_day):
+    """Optimal score of the first curve point within 3 days of target_day, else 7.0"""
+    for i in range(len(curve_days)):
+        if abs(curve_days[i] - target_day) <= 3:
+            return curve_scores[i]
+    return 7.0
+
+
+# Growth status names, indexed by the codes _status_code returns
+_GRAPH_STATUSES = ("no_data", "above_optimal", "on_track", "below_optimal", "concerning")
+
+
+def _status_code(actual, expected):
+    """Status code for the latest actual score (0 meaning none) vs the expected one"""
+    if actual == 0:
+        return 0
+    variance = actual - expected
+    if variance >= 0:
+        return 1
+    if variance >= -1:
+        return 2
+    if variance >= -2:
+        return 3
+    return 4
+
+
+def _graph_statuses(days, scores, lengths, curve_days, curve_scores, curve_lengths,
+                    today, variances, expected, status):
+    """
+    Score variances, expected score today and status code for each field
+    
+    Row i of the padded days/scores (and curve) matrices holds lengths[i]
+    (curve_lengths[i]) valid entries; results are written into variances,
+    expected and status.
+    """
+    for i in prange(len(lengths)):
+        field_curve_days = curve_days[i][:curve_lengths[i]]
+        field_curve_scores = curve_scores[i][:curve_lengths[i]]
+        n = lengths[i]
+        for j in range(n):
+            variances[i][j] = scores[i][j] - _nearest_optimal(
+                field_curve_days, field_curve_scores, days[i][j]
+            )
+        expected[i] = _nearest_optimal(field_curve_days, field_curve_scores, today[i])
+        status[i] = _status_code(scores[i][n - 1] if n > 0 else 0, expected[i])
+
+
+if NUMBA_AVAILABLE:
+    _nearest_optimal = njit(cache=True)(_nearest_optimal)
+    _status_code = njit(cache=True)(_status_code)
+    _graph_statuses = njit(parallel=True, cache=True)(_graph_statuses)
+
+
+@lru_cache(maxsize=64)
+def _optimal_curve_columns(crop: str, variety: str, maturity_days: int) -> Tuple:
+    """Optimal curve as (days, scores) columns; NumPy arrays when JIT kernels are available"""
+    curve = calculate_optimal_growth_curve(crop, variety, maturity_days)
+    days = [point["day"] for point in curve]
+    scores = [point["optimal_health_score"] for point in curve]
+    if NUMBA_AVAILABLE:
+        return np.array(days, dtype=np.float64), np.array(scores, dtype=np.float64)
+    return tuple(days), tuple(scores)
 
 
 def get_growth_status_graph(
@@ -138,78 +563,166 @@ def get_growth_status_graph(
     Returns:
         Graph data with optimal curve and actual health scores
     """
-    # Get optimal growth curve
     from .farm_registration import get_farm_by_field_id
     farm = get_farm_by_field_id(field_id)
     
     if not farm:
         raise ValueError(f"Farm not found for field {field_id}")
     
-    planting = datetime.fromisoformat(planting_date.replace('Z', ''))
-    days_since_planting = (datetime.utcnow() - planting).days
+    return _build_status_graphs([(field_id, crop, variety, planting_date)])[0]
+
+
+def get_growth_status_graphs(field_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Growth status graphs for several fields (e.g. a farmer's overview),
+    computed together in one pass. Crop, variety and planting date come
+    from each field's farm record.
+    
+    Returns:
+        Graph data keyed by field_id
+    """
+    from .farm_registration import load_farms
+    
+    farms_by_field = {
+        fid: farm
+        for fields in load_farms().values()
+        for fid, farm in fields.items()
+    }
     
-    # Get crop model
+    specs = []
+    for field_id in field_ids:
+        farm = farms_by_field.get(field_id)
+        if not farm:
+            raise ValueError(f"Farm not found for field {field_id}")
+        if not farm.get("planting_date"):
+            raise ValueError(f"No planting date set for field {field_id}")
+        specs.append((field_id, farm["crop"], farm["variety"], farm["planting_date"]))
+    
+    graphs = _build_status_graphs(specs)
+    return {graph["field_id"]: graph for graph in graphs}
+
+
+def _build_status_graphs(specs: List[Tuple[str, str, str, str]]) -> List[Dict]:
+    """Growth status graphs for (field_id, crop, variety, planting_date) tuples"""
     from .growth_model import get_crop_model
-    model = get_crop_model(crop, variety)
-    maturity_days = model["maturity_days"]
     
-    # Generate optimal curve
-    optimal_curve = calculate_optimal_growth_curve(crop, variety, maturity_days)
+    soa = _get_health_soa()
+    now = datetime.utcnow()
     
-    # Get actual health scores
-    scores = load_health_scores()
+    rows = []
+    for field_id, crop, variety, planting_date in specs:
+        planting = parse_iso(planting_date)
+        planting_epoch = _to_epoch(planting)
+        
+        # Get crop model and optimal curve
+        maturity_days = get_crop_model(crop, variety)["maturity_days"]
+        curve_days, curve_scores = _optimal_curve_columns(crop, variety, maturity_days)
+        
+        # Get actual health scores as days after planting
+        series = soa.get(field_id)
+        if series is None or not series.size:
+            record_days, record_scores = [], []
+        elif NUMPY_AVAILABLE:
+            record_days = ((series.ts_epoch - planting_epoch) // 86400).tolist()
+            record_scores = series.score.tolist()
+        else:
+            record_days = [(ts - planting_epoch) // 86400 for ts in series.ts_epoch]
+            record_scores = series.score.tolist()
+        
+        rows.append({
+            "field_id": field_id,
+            "crop": crop,
+            "variety": variety,
+            "planting_date": planting_date,
+            "maturity_days": maturity_days,
+            "days_since_planting": (now - planting).days,
+            "curve": (curve_days, curve_scores),
+            "series": series,
+            "record_days": record_days,
+            "record_scores": record_scores,
+        })
+    
+    # Pack all fields into padded matrices for a single kernel call
+    n_fields = len(rows)
+    max_scores = max([len(row["record_days"]) for row in rows] + [1])
+    max_curve = max(len(row["curve"][0]) for row in rows) if rows else 1
+    if NUMBA_AVAILABLE:
+        days = np.zeros((n_fields, max_scores), dtype=np.float64)
+        scores = np.zeros((n_fields, max_scores), dtype=np.float64)
+        curve_days = np.zeros((n_fields, max_curve), dtype=np.float64)
+        curve_scores = np.zeros((n_fields, max_curve), dtype=np.float64)
+        for i, row in enumerate(rows):
+            n, m = len(row["record_days"]), len(row["curve"][0])
+            days[i, :n] = row["record_days"]
+            scores[i, :n] = row["record_scores"]
+            curve_days[i, :m], curve_scores[i, :m] = row["curve"]
+        lengths = np.array([len(row["record_days"]) for row in rows], dtype=np.int64)
+        curve_lengths = np.array([len(row["curve"][0]) for row in rows], dtype=np.int64)
+        today = np.array([row["days_since_planting"] for row in rows], dtype=np.float64)
+        variances = np.zeros((n_fields, max_scores), dtype=np.float64)
+        expected = np.zeros(n_fields, dtype=np.float64)
+        status = np.zeros(n_fields, dtype=np.int8)
+    else:
+        days = [row["record_days"] for row in rows]
+        scores = [row["record_scores"] for row in rows]
+        curve_days = [row["curve"][0] for row in rows]
+        curve_scores = [row["curve"][1] for row in rows]
+        lengths = [len(row["record_days"]) for row in rows]
+        curve_lengths = [len(row["curve"][0]) for row in rows]
+        today = [row["days_since_planting"] for row in rows]
+        variances = [[0.0] * max_scores for _ in rows]
+        expected = [0.0] * n_fields
+        status = [0] * n_fields
+    
+    _graph_statuses(days, scores, lengths, curve_days, curve_scores, curve_lengths,
+                    today, variances, expected, status)
+    
+    return [
+        _assemble_status_graph(row, list(variances[i][:len(row["record_days"])]),
+                               float(expected[i]), _GRAPH_STATUSES[int(status[i])])
+        for i, row in enumerate(rows)
+    ]
+
+
+def _assemble_status_graph(row: Dict, variances: List[float], expected_today: float, status: str) -> Dict:
+    """Graph response for one field from its packed row and kernel results"""
+    series = row["series"]
     actual_scores = []
-    
-    if field_id in scores:
-        for score_record in scores[field_id]:
-            score_date = datetime.fromisoformat(score_record["timestamp"].replace('Z', ''))
-            days_after_planting = (score_date - planting).days
-            
+    if row["record_days"]:
+        for days_after_planting, health_score, timestamp, photo_id, variance in zip(
+            row["record_days"], row["record_scores"], series.timestamp, series.photo_id, variances
+        ):
             actual_scores.append({
                 "day": days_after_planting,
-                "health_score": score_record["health_score"],
-                "timestamp": score_record["timestamp"],
-                "photo_id": score_record.get("photo_id")
+                "health_score": health_score,
+                "timestamp": timestamp,
+                "photo_id": photo_id,
+                "variance": round(float(variance), 1)
             })
     
     # Calculate current status
-    current_stage = get_current_growth_stage(crop, variety, planting_date)
-    
-    # Get expected health score for today
-    expected_today = next(
-        (point["optimal_health_score"] for point in optimal_curve 
-         if abs(point["day"] - days_since_planting) <= 3),
-        7.0
-    )
+    current_stage = get_current_growth_stage(row["crop"], row["variety"], row["planting_date"])
     
     # Get actual health score for today (or most recent)
     actual_today = actual_scores[-1]["health_score"] if actual_scores else None
     
-    # Calculate health status
-    if actual_today:
-        variance = actual_today - expected_today
-        if variance >= 0:
-            status = "above_optimal"
-            message = f"✅ Plant health is excellent! ({actual_today}/10)"
-        elif variance >= -1:
-            status = "on_track"
-            message = f"🌱 Growth is on track ({actual_today}/10)"
-        elif variance >= -2:
-            status = "below_optimal"
-            message = f"⚠️ Health slightly below optimal ({actual_today}/10). Monitor closely."
-        else:
-            status = "concerning"
-            message = f"🚨 Health significantly below optimal ({actual_today}/10). Action needed!"
+    if status == "above_optimal":
+        message = f"✅ Plant health is excellent! ({actual_today}/10)"
+    elif status == "on_track":
+        message = f"🌱 Growth is on track ({actual_today}/10)"
+    elif status == "below_optimal":
+        message = f"⚠️ Health slightly below optimal ({actual_today}/10). Monitor closely."
+    elif status == "concerning":
+        message = f"🚨 Health significantly below optimal ({actual_today}/10). Action needed!"
     else:
-        status = "no_data"
         message = "📸 Upload your first photo to track growth!"
     
     return {
-        "field_id": field_id,
-        "days_since_planting": days_since_planting,
+        "field_id": row["field_id"],
+        "days_since_planting": row["days_since_planting"],
         "overall_progress_percent": current_stage["overall_progress_percent"],
         "current_stage": current_stage["current_stage"],
-        "optimal_curve": optimal_curve,
+        "optimal_curve": calculate_optimal_growth_curve(row["crop"], row["variety"], row["maturity_days"]),
         "actual_scores": actual_scores,
         "current_status": {
             "status": status,
@@ -280,33 +793,36 @@ def get_photo_history(field_id: str, limit: Optional[int] = None) -> List[Dict]:
 
 def get_next_photo_prompt(field_id: str, planting_date: str) -> Optional[Dict]:
     """Get the next scheduled photo prompt"""
-    from .calendar_generator import get_calendar
+    from .calendar_generator import calendars_version, get_calendar
     
+    version = calendars_version()
     calendar = get_calendar(field_id)
     if not calendar or "photo_schedule" not in calendar:
         return None
     
-    now = datetime.utcnow()
+    schedule = calendar["photo_schedule"]
+    now_ts = datetime.utcnow().replace(tzinfo=timezone.utc).timestamp()
     
-    # Find next pending photo
-    for photo_prompt in calendar["photo_schedule"]:
-        if photo_prompt["status"] == "pending":
-            due_date = datetime.fromisoformat(photo_prompt["due_date"].replace('Z', ''))
-            days_until_due = (due_date - now).days
-            
-            if days_until_due <= 7:  # Within a week
-                return {
-                    **photo_prompt,
-                    "days_until_due": days_until_due,
-                    "is_overdue": days_until_due < 0
-                }
+    # Next pending photo, if it is due within a week (the schedule is in due order)
+    index = _prompt_index(field_id, schedule, version)
+    if not index["pending"]:
+        return None
+    position = index["pending"][0]
+    due_epoch = index["due"][position]
+    if due_epoch >= now_ts + 8 * 86400:
+        return None
     
-    return None
+    days_until_due = int((due_epoch - now_ts) // 86400)
+    return {
+        **schedule[position],
+        "days_until_due": days_until_due,
+        "is_overdue": days_until_due < 0
+    }
 
 
 def mark_photo_prompt_completed(field_id: str, photo_number: int, photo_url: str):
     """Mark a photo prompt as completed"""
-    from .calendar_generator import load_calendars, save_calendars
+    from .calendar_generator import append_calendar_event, calendars_version, load_calendars
     
     calendars = load_calendars()
     
@@ -315,37 +831,120 @@ def mark_photo_prompt_completed(field_id: str, photo_number: int, photo_url: str
     
     calendar = calendars[field_id][-1]
     
-    for prompt in calendar["photo_schedule"]:
-        if prompt["photo_number"] == photo_number:
-            prompt["status"] = "completed"
-            prompt["photo_url"] = photo_url
-            break
+    completed_index = next(
+        (i for i, prompt in enumerate(calendar["photo_schedule"])
+         if prompt["photo_number"] == photo_number),
+        None
+    )
+    if completed_index is None:
+        return
+    
+    # Logged as one event line; applied to the cached calendars in place
+    version_before = calendars_version()
+    append_calendar_event({
+        "op": "mark_photo_completed",
+        "field_id": field_id,
+        "photo_number": photo_number,
+        "photo_url": photo_url
+    })
     
-    save_calendars(calendars)
+    # Write through to the cached columns if they still match what we loaded
+    version_after = calendars_version()
+    cached = _schedule_cache.get(field_id)
+    if cached is not None and cached["version"] == version_before:
+        cached["status"][completed_index] = 1
+        cached["version"] = version_after
+    cached = _prompt_index_cache.get(field_id)
+    if cached is not None and cached["version"] == version_before:
+        pending = cached["pending"]
+        i = bisect_left(pending, completed_index)
+        if i < len(pending) and pending[i] == completed_index:
+            del pending[i]
+        cached["version"] = version_after
+
+
+# Per-field photo schedule columns for compliance checks:
+# {field_id: {"version", "due", "status"}}, "status" is uint8 (1 == completed).
+# Kept out of the calendar dict itself since that is saved as JSON; entries
+# are valid while calendars_version() matches.
+_schedule_cache: Dict[str, Dict] = {}
+
+
+def _schedule_columns(field_id: str, schedule: List[Dict], version: Tuple) -> Dict:
+    """Due epochs and completion flags of a field's photo schedule as arrays"""
+    cached = _schedule_cache.get(field_id)
+    if cached is None or cached["version"] != version or len(cached["due"]) != len(schedule):
+        cached = {
+            "version": version,
+            "due": np.fromiter(_prompt_due_epochs(schedule), dtype=np.int64, count=len(schedule)),
+            "status": np.fromiter(
+                (p["status"] == "completed" for p in schedule), dtype=np.uint8, count=len(schedule)
+            ),
+        }
+        _schedule_cache[field_id] = cached
+    return cached
+
+
+# Per-field photo prompt lookup for get_next_photo_prompt:
+# {field_id: {"version", "due", "pending"}}, "pending" holds the schedule
+# positions of pending prompts in order. Valid while calendars_version() matches.
+_prompt_index_cache: Dict[str, Dict] = {}
+
+
+def _prompt_index(field_id: str, schedule: List[Dict], version: Tuple) -> Dict:
+    """Due epochs and pending prompt positions of a field's photo schedule, built once per version"""
+    cached = _prompt_index_cache.get(field_id)
+    if cached is None or cached["version"] != version or len(cached["due"]) != len(schedule):
+        cached = {
+            "version": version,
+            "due": _prompt_due_epochs(schedule),
+            "pending": [i for i, p in enumerate(schedule) if p["status"] == "pending"],
+        }
+        _prompt_index_cache[field_id] = cached
+    return cached
+
+
+def _prompt_due_epochs(photo_schedule: List[Dict]) -> List[int]:
+    """Due times of photo prompts as epoch seconds (parsed for older calendars)"""
+    return [
+        p["due_epoch"] if "due_epoch" in p
+        else _to_epoch(parse_iso(p["due_date"]))
+        for p in photo_schedule
+    ]
 
 
 def calculate_photo_compliance_rate(field_id: str) -> Dict:
     """Calculate how many photos were taken on schedule"""
-    from .calendar_generator import get_calendar
+    from .calendar_generator import calendars_version, get_calendar
     
+    # Read the version before loading so a concurrent write can only make the
+    # cached columns look stale, never fresher than they are
+    version = calendars_version()
     calendar = get_calendar(field_id)
     if not calendar or "photo_schedule" not in calendar:
         return {"compliance_rate": 0, "completed": 0, "total": 0}
     
-    now = datetime.utcnow()
+    schedule = calendar["photo_schedule"]
+    now_epoch = _to_epoch(datetime.utcnow())
     
     # Only count prompts that are due
-    due_prompts = [p for p in calendar["photo_schedule"] 
-                   if datetime.fromisoformat(p["due_date"].replace('Z', '')) <= now]
-    
-    completed = sum(1 for p in due_prompts if p["status"] == "completed")
-    total = len(due_prompts)
+    if NUMPY_AVAILABLE:
+        columns = _schedule_columns(field_id, schedule, version)
+        due_mask = columns["due"] <= now_epoch
+        completed = int(columns["status"][due_mask].sum())
+        total = int(due_mask.sum())
+    else:
+        due_prompts = [
+            p for p, due in zip(schedule, _prompt_due_epochs(schedule)) if due <= now_epoch
+        ]
+        completed = sum(p["status"] == "completed" for p in due_prompts)
+        total = len(due_prompts)
     
     return {
         "compliance_rate": round((completed / total) * 100, 1) if total > 0 else 0,
         "completed": completed,
         "total": total,
-        "total_scheduled": len(calendar["photo_schedule"])
+        "total_scheduled": len(schedule)
     }
 
 
@@ -356,9 +955,9 @@ def analyze_health_trend(field_id: str, days: int = 30) -> Dict:
     Returns:
         Trend analysis with direction and rate of change
     """
-    scores = load_health_scores()
+    series = _get_health_soa().get(field_id)
     
-    if field_id not in scores or len(scores[field_id]) < 2:
+    if series is None or series.size < 2:
         return {
             "trend": "insufficient_data",
             "direction": "unknown",
@@ -367,13 +966,17 @@ def analyze_health_trend(field_id: str, days: int = 30) -> Dict:
         }
     
     # Get scores from specified period
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-    recent_scores = [
-        s for s in scores[field_id]
-        if datetime.fromisoformat(s["timestamp"].replace('Z', '')) >= cutoff_date
-    ]
+    cutoff_epoch = _to_epoch(datetime.utcnow() - timedelta(days=days))
+    if NUMPY_AVAILABLE:
+        in_period = series.ts_epoch >= cutoff_epoch
+        recent_epochs = series.ts_epoch[in_period]
+        health_scores = series.score[in_period]
+    else:
+        recent = [(ts, score) for ts, score in zip(series.ts_epoch, series.score) if ts >= cutoff_epoch]
+        recent_epochs = [ts for ts, _ in recent]
+        health_scores = [score for _, score in recent]
     
-    if len(recent_scores) < 2:
+    if len(recent_epochs) < 2:
         return {
             "trend": "insufficient_data",
             "direction": "unknown",
@@ -382,12 +985,18 @@ def analyze_health_trend(field_id: str, days: int = 30) -> Dict:
         }
     
     # Calculate trend
-    first_score = recent_scores[0]["health_score"]
-    last_score = recent_scores[-1]["health_score"]
-    avg_score = sum(s["health_score"] for s in recent_scores) / len(recent_scores)
+    first_score = int(health_scores[0])
+    last_score = int(health_scores[-1])
+    
+    if NUMPY_AVAILABLE:
+        elapsed_days = (recent_epochs - recent_epochs[0]) / 86400
+    else:
+        elapsed_days = [(ts - recent_epochs[0]) / 86400 for ts in recent_epochs]
+    
+    # Least-squares slope in points per day
+    rate_of_change, avg_score = _fit_trend(elapsed_days, health_scores)
     
     change = last_score - first_score
-    rate_of_change = change / len(recent_scores)  # Average change per data point
     
     if change > 1:
         direction = "improving"
@@ -408,11 +1017,35 @@ def analyze_health_trend(field_id: str, days: int = 30) -> Dict:
         "average_score": round(avg_score, 1),
         "total_change": change,
         "days_analyzed": days,
-        "data_points": len(recent_scores),
+        "data_points": len(recent_epochs),
         "message": message
     }
 
 
+def _fit_trend(xs: List[float], ys: List[float]) -> Tuple[float, float]:
+    """Return (least-squares slope, mean of ys); slope is 0 if all xs coincide"""
+    if NUMPY_AVAILABLE:
+        x = np.asarray(xs, dtype=np.float64)
+        y = np.asarray(ys, dtype=np.float64)
+        if np.ptp(x) == 0:
+            return 0.0, float(y.mean())
+        slope, _ = np.polyfit(x, y, 1)
+        return float(slope), float(y.mean())
+    
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0, mean_y
+    cov_xy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return cov_xy / var_x, mean_y
+
+
+# Below this many community scores NumPy call overhead outweighs the reduction
+_NUMPY_MIN_SCORES = 16
+
+
 def compare_with_community(
     field_id: str,
     crop: str,
@@ -424,20 +1057,15 @@ def compare_with_community(
     Returns:
         Comparison with percentile ranking
     """
-    # Get all farms with same crop
-    from .farm_registration import load_farms
-    farms = load_farms()
+    from .farm_registration import load_farms_by_crop
     
+    # Latest scores of all other fields with same crop
+    soa = _get_health_soa()
     same_crop_scores = []
-    
-    for farmer_id, fields in farms.items():
-        for fid, farm in fields.items():
-            if farm["crop"] == crop.lower() and fid != field_id:
-                # Get latest health score for this field
-                scores = load_health_scores()
-                if fid in scores and scores[fid]:
-                    latest_score = scores[fid][-1]["health_score"]
-                    same_crop_scores.append(latest_score)
+    for fid in load_farms_by_crop().get(crop.lower(), []):
+        series = soa.get(fid)
+        if fid != field_id and series is not None and series.size:
+            same_crop_scores.append(int(series.score[-1]))
     
     if not same_crop_scores:
         return {
@@ -447,11 +1075,16 @@ def compare_with_community(
             "message": "Not enough community data yet for comparison"
         }
     
-    community_avg = sum(same_crop_scores) / len(same_crop_scores)
-    
-    # Calculate percentile
-    better_than = sum(1 for s in same_crop_scores if current_health_score > s)
-    percentile = (better_than / len(same_crop_scores)) * 100
+    if NUMPY_AVAILABLE and len(same_crop_scores) >= _NUMPY_MIN_SCORES:
+        scores_arr = np.clip(np.rint(np.asarray(same_crop_scores, dtype=np.float64)), -127, 127).astype(np.int8)
+        community_avg = float(scores_arr.mean())
+        percentile = float((scores_arr < current_health_score).mean()) * 100
+    else:
+        community_avg = sum(same_crop_scores) / len(same_crop_scores)
+        
+        # Calculate percentile
+        better_than = sum(1 for s in same_crop_scores if current_health_score > s)
+        percentile = (better_than / len(same_crop_scores)) * 100
     
     if percentile >= 75:
         message = f"🏆 Excellent! Your crop is healthier than {int(percentile)}% of community"
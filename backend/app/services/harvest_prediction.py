@@ -8,7 +8,8 @@ Predicts harvest dates and provides alerts based on:
 - Storage facility readiness (BLE sensor check)
 """
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
 from . import climate_persistence, persistence, lcrs_engine, advice
 
 # Crop maturity periods (days from planting to harvest)
@@ -44,17 +45,24 @@ CROP_MATURITY = {
     }
 }
 
+# CROP_MATURITY with crop and variety keys lowercased once at import
+CROP_MATURITY_NORMALIZED = {
+    crop.lower(): {variety.lower(): days for variety, days in varieties.items()}
+    for crop, varieties in CROP_MATURITY.items()
+}
+
+@lru_cache(maxsize=256)
 def get_crop_maturity_days(crop: str, variety: str = None) -> int:
     """Get maturity period for crop/variety"""
-    crop_lower = crop.lower()
+    maturity_data = CROP_MATURITY_NORMALIZED.get(crop.lower())
     
-    if crop_lower not in CROP_MATURITY:
+    if maturity_data is None:
         return 120  # Default fallback
     
-    maturity_data = CROP_MATURITY[crop_lower]
-    
-    if variety and variety.lower() in maturity_data:
-        return maturity_data[variety.lower()]
+    if variety:
+        days = maturity_data.get(variety.lower())
+        if days is not None:
+            return days
     
     return maturity_data.get('default', 120)
 
@@ -70,6 +78,10 @@ def predict_harvest_date(planting_date: str, crop: str, variety: str = None) ->
         'maturity_days': int
     }
     """
+    return _predict_harvest(planting_date, crop, variety)[1]
+
+def _predict_harvest(planting_date: str, crop: str, variety: str = None) -> Tuple[datetime, Dict]:
+    """predict_harvest_date that also returns the harvest datetime for internal callers"""
     planting = datetime.fromisoformat(planting_date)
     maturity_days = get_crop_maturity_days(crop, variety)
     
@@ -78,14 +90,14 @@ def predict_harvest_date(planting_date: str, crop: str, variety: str = None) ->
     window_start = harvest_date - timedelta(days=7)
     window_end = harvest_date + timedelta(days=7)
     
-    return {
+    return harvest_date, {
         'predicted_date': harvest_date.isoformat(),
         'harvest_window_start': window_start.isoformat(),
         'harvest_window_end': window_end.isoformat(),
         'maturity_days': maturity_days
     }
 
-def check_harvest_weather(harvest_date: str, location: dict) -> Dict:
+def check_harvest_weather(harvest_date: Union[datetime, str], location: dict) -> Dict:
     """
     Check weather forecast for harvest period.
     
@@ -97,7 +109,7 @@ def check_harvest_weather(harvest_date: str, location: dict) -> Dict:
         'icon': str
     }
     """
-    harvest = datetime.fromisoformat(harvest_date)
+    harvest = harvest_date if isinstance(harvest_date, datetime) else datetime.fromisoformat(harvest_date)
     now = datetime.utcnow()
     
     # Calculate which month harvest falls in
@@ -213,10 +225,10 @@ def generate_harvest_alert(farmer_id: str, field_id: str, planting_date: str,
     }
     """
     # Predict harvest date
-    harvest_pred = predict_harvest_date(planting_date, crop, variety)
+    harvest_dt, harvest_pred = _predict_harvest(planting_date, crop, variety)
     
     # Check weather forecast
-    weather = check_harvest_weather(harvest_pred['predicted_date'], location)
+    weather = check_harvest_weather(harvest_dt, location)
     
     # Check storage readiness
     storage = check_storage_readiness(farmer_id, sensor_id)
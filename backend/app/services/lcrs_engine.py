@@ -12,36 +12,196 @@ Output: Risk score (0-100) where:
 - 31-60: Moderate risk (normal variability)
 - 61-100: High risk (drought/flood likely)
 """
-from datetime import datetime, timedelta
-from typing import Dict, List
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
+from itertools import accumulate
+from threading import Lock
+from typing import Dict, List, Literal, Optional, Tuple
 from . import climate_persistence
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Risk model weights: drought over (1 - rain, 1 - soil, forecast), flood over
+# (rain, saturation) once saturation exceeds _FLOOD_SATURATION, and the LCRS
+# over (drought, flood, forecast)
+_DROUGHT_WEIGHTS = (0.3, 0.3, 0.4)
+_FLOOD_WEIGHTS = (0.5, 0.5)
+_FLOOD_SATURATION = 0.7
+_FLOOD_BASELINE = 0.1
+_LCRS_WEIGHTS = (0.6, 0.2, 0.2)
+
+# Clock reading shared by calls in the same context (request/task) for up to
+# _NOW_TTL_S: (expires_at monotonic, epoch second, naive UTC datetime). Expiry
+# runs on the monotonic clock; the wall clock is only read for the values
+# that end up in timestamps.
+_NOW_TTL_S = 1.0
+_now_cache: ContextVar[Optional[Tuple[float, int, datetime]]] = ContextVar('lcrs_now', default=None)
+
+def _now() -> Tuple[int, datetime]:
+    """(epoch seconds, naive UTC datetime) for now, reused for up to _NOW_TTL_S"""
+    mono = time.monotonic()
+    cached = _now_cache.get()
+    if cached is None or mono >= cached[0]:
+        wall = time.time()
+        cached = (mono + _NOW_TTL_S, int(wall), datetime.fromtimestamp(wall, timezone.utc).replace(tzinfo=None))
+        _now_cache.set(cached)
+    return cached[1], cached[2]
+
+# Rain factor memo shared by the fields of one request or batch, kept for up
+# to _NOW_TTL_S in a long-lived context: (expires_at monotonic,
+# {(lat bucket, lon bucket, days): (factor, report count)})
+_rain_memo: ContextVar[Optional[Tuple[float, Dict]]] = ContextVar('lcrs_rain_memo', default=None)
+
+def clear_request_caches():
+    """Forget this context's per-request LCRS memos"""
+    _rain_memo.set(None)
+    _now_cache.set(None)
+
+@contextmanager
+def request_scope():
+    """Give the calls inside the block fresh per-request memos, restoring the outer ones on exit"""
+    memo_token = _rain_memo.set(None)
+    now_token = _now_cache.set(None)
+    try:
+        yield
+    finally:
+        _rain_memo.reset(memo_token)
+        _now_cache.reset(now_token)
+
+def request_scoped(handler):
+    """
+    Decorate an async route handler to run in its own request_scope().
+    The scope is entered inside the handler's own context, so the memos it
+    sets are the ones the handler's service calls see.
+    """
+    @wraps(handler)
+    async def scoped(*args, **kwargs):
+        with request_scope():
+            return await handler(*args, **kwargs)
+    return scoped
+
+# Recommendations in output order; bit i of a recommendation mask selects
+# _RECOMMENDATIONS[i]
+_RECOMMENDATIONS = (
+    'High drought risk: Consider drought-resistant crop varieties',
+    'Implement water conservation measures',
+    'High flood risk: Ensure proper drainage in fields',
+    'Consider raised bed planting',
+    'Soil moisture suboptimal: Check irrigation or drainage needs',
+    'DIVERSIFICATION: Allocate 20% of land to drought-tolerant cash crop (cassava, sorghum)',
+)
+_DROUGHT_MASK = 0b000011
+_FLOOD_MASK = 0b001100
+_SOIL_MOISTURE_MASK = 0b010000
+_DIVERSIFICATION_MASK = 0b100000
+# Recommendation tuple for every mask, built once
+_RECOMMENDATION_SETS = tuple(
+    tuple(rec for i, rec in enumerate(_RECOMMENDATIONS) if mask >> i & 1)
+    for mask in range(1 << len(_RECOMMENDATIONS))
+)
+
+# Recent calculate_lcrs results: key -> (expires_at monotonic, result).
+# Inputs change slowly; add_soil_report / add_rain_report evict via invalidate_lcrs.
+LCRS_CACHE_TTL_S = 900
+LCRS_CACHE_MAX_ENTRIES = 10_000
+_lcrs_cache: Dict[tuple, tuple] = {}
+_lcrs_cache_lock = Lock()
+
+# Seasonal risk scores for East Africa (simplified), indexed by month 1-12;
+# slot 0 is the fallback for an unknown month
+_SEASONAL_RISK = (
+    0.5,
+    0.8,  # Jan: Dry, high risk
+    0.8,  # Feb: Dry, high risk
+    0.3,  # Mar: Long rains start
+    0.2,  # Apr: Long rains peak
+    0.3,  # May: Long rains end
+    0.6,  # Jun: Dry season
+    0.7,  # Jul: Dry season
+    0.7,  # Aug: Dry season
+    0.6,  # Sep: Dry season end
+    0.4,  # Oct: Short rains start
+    0.3,  # Nov: Short rains
+    0.4,  # Dec: Short rains end
+)
+
+# Prefix sums of the monthly risks over two years from January:
+# _SEASONAL_RISK_CUMSUM[k] is the total risk of the first k months
+_SEASONAL_RISK_CUMSUM = tuple(accumulate((_SEASONAL_RISK[1 + i % 12] for i in range(24)), initial=0.0))
+_ANNUAL_RISK = _SEASONAL_RISK_CUMSUM[12]
+if NUMPY_AVAILABLE:
+    _SEASONAL_RISK_CUMSUM_ARRAY = np.array(_SEASONAL_RISK_CUMSUM, dtype=np.float64)
+
 def calculate_crowdsourced_rain_factor(location: dict, days: int = 7) -> float:
     """
     Analyze recent crowdsourced rain reports to estimate rainfall adequacy.
     Returns 0-1 where 1 = adequate rain, 0 = drought conditions
     """
+    return _rain_factor_with_count(location, days)[0]
+
+def _rain_factor_with_count(location: dict, days: int) -> Tuple[float, int]:
+    """
+    (rain factor, number of reports it is based on), memoized per location
+    bucket (0.01 degrees, as calculate_lcrs caches) and window for the
+    current request context for up to _NOW_TTL_S
+    """
+    mono = time.monotonic()
+    memo = _rain_memo.get()
+    if memo is None or mono >= memo[0]:
+        memo = (mono + _NOW_TTL_S, {})
+        _rain_memo.set(memo)
+    key = (*_location_bucket(location), days)
+    result = memo[1].get(key)
+    if result is None:
+        result = memo[1][key] = _compute_rain_factor_with_count(location, days)
+    return result
+
+def _location_bucket(location: Optional[dict]) -> Tuple[Optional[float], Optional[float]]:
+    """(lat, lon) rounded to 0.01 degrees; None for a missing coordinate"""
+    location = location or {}
+    return (
+        round(location['lat'], 2) if 'lat' in location else None,
+        round(location['lon'], 2) if 'lon' in location else None
+    )
+
+def _compute_rain_factor_with_count(location: dict, days: int) -> Tuple[float, int]:
+    if NUMPY_AVAILABLE:
+        scores, ts_epoch = climate_persistence.get_rain_report_scores(days=days, location=location)
+        return _rain_factor_from_columns(scores, ts_epoch, days), len(scores)
     reports = climate_persistence.get_rain_reports(days=days, location=location)
-    
+    return _rain_factor_from_reports(reports, days), len(reports)
+
+def _rain_factor_from_reports(reports: List[Dict], days: int) -> float:
     if not reports:
         return 0.5  # neutral if no data
     
     # Weight recent reports more heavily
     total_weight = 0
     weighted_sum = 0
+    now_epoch = _now()[0]
+    amount_scores = climate_persistence.RAIN_AMOUNT_SCORES
+    unknown_score = climate_persistence.UNKNOWN_RAIN_SCORE
     
     for r in reports:
         # Convert amount to numeric score
-        amount_scores = {
-            'none': 0,
-            'light': 0.3,
-            'moderate': 0.7,
-            'heavy': 1.0
-        }
-        score = amount_scores.get(r['amount'], 0.5)
+        score = amount_scores.get(r['amount'], unknown_score)
         
         # Time decay: recent reports weighted more
-        days_ago = (datetime.utcnow() - datetime.fromisoformat(r['ts'])).days
+        days_ago = (now_epoch - climate_persistence.report_epoch(r)) // 86400
         weight = max(0.1, 1.0 - (days_ago / days))
         
         weighted_sum += score * weight
@@ -49,13 +209,27 @@ def calculate_crowdsourced_rain_factor(location: dict, days: int = 7) -> float:
     
     return weighted_sum / total_weight if total_weight > 0 else 0.5
 
+def _rain_factor_from_columns(scores: 'np.ndarray', ts_epoch: 'np.ndarray', days: int) -> float:
+    """Rain factor as one weighted mean over report columns"""
+    if not len(scores):
+        return 0.5  # neutral if no data
+    
+    # Time decay: recent reports weighted more
+    now_epoch = _now()[0]
+    days_ago = (now_epoch - ts_epoch) // 86400
+    weights = np.maximum(0.1, 1.0 - days_ago / days)
+    
+    return float(np.dot(scores, weights) / weights.sum())
+
 def calculate_soil_moisture_factor(farmer_id: str, field_id: str) -> float:
     """
     Get soil moisture index from farmer's latest report.
     Returns 0-1 where 1 = optimal moisture, 0 = very dry/saturated
     """
-    report = climate_persistence.get_latest_soil_report(farmer_id, field_id)
-    
+    return _soil_factor_from_report(climate_persistence.get_latest_soil_report(farmer_id, field_id))
+
+def _soil_factor_from_report(report: Optional[Dict]) -> float:
+    """Soil moisture factor (see calculate_soil_moisture_factor) for a fetched report"""
     if not report:
         return 0.5  # neutral if no data
     
@@ -80,33 +254,45 @@ def estimate_weather_forecast_risk(month_offset: int = 0) -> float:
     - October-December: Short rains (low-moderate risk)
     - January-February: Dry season (high risk)
     """
-    target_month = (datetime.utcnow().month + month_offset) % 12
-    if target_month == 0:
-        target_month = 12
-    
-    # Seasonal risk scores for East Africa (simplified)
-    seasonal_risk = {
-        1: 0.8,   # Jan: Dry, high risk
-        2: 0.8,   # Feb: Dry, high risk
-        3: 0.3,   # Mar: Long rains start
-        4: 0.2,   # Apr: Long rains peak
-        5: 0.3,   # May: Long rains end
-        6: 0.6,   # Jun: Dry season
-        7: 0.7,   # Jul: Dry season
-        8: 0.7,   # Aug: Dry season
-        9: 0.6,   # Sep: Dry season end
-        10: 0.4,  # Oct: Short rains start
-        11: 0.3,  # Nov: Short rains
-        12: 0.4,  # Dec: Short rains end
-    }
-    
-    return seasonal_risk.get(target_month, 0.5)
+    return _forecast_risk(_target_month(_now()[1].month, month_offset))
+
+def _target_month(current_month: int, month_offset: int) -> int:
+    """Calendar month (1-12) month_offset months after current_month"""
+    target_month = (current_month + month_offset) % 12
+    return target_month if target_month else 12
+
+def _average_forecast_risk(current_month: int, forecast_months: int) -> float:
+    """Mean seasonal risk over forecast_months months starting at current_month, in O(1)"""
+    years, months = divmod(forecast_months, 12)
+    start = current_month - 1
+    total = years * _ANNUAL_RISK + _SEASONAL_RISK_CUMSUM[start + months] - _SEASONAL_RISK_CUMSUM[start]
+    return total / forecast_months
+
+def _average_forecast_risks(current_month: int, horizons: List[int]) -> List[float]:
+    """_average_forecast_risk for each horizon; one vectorized table lookup with NumPy"""
+    if not NUMPY_AVAILABLE:
+        by_months = {months: _average_forecast_risk(current_month, months) for months in set(horizons)}
+        return [by_months[months] for months in horizons]
+    forecast_months = np.array(horizons, dtype=np.int64)
+    years, months = np.divmod(forecast_months, 12)
+    start = current_month - 1
+    total = years * _ANNUAL_RISK + _SEASONAL_RISK_CUMSUM_ARRAY[start + months] - _SEASONAL_RISK_CUMSUM_ARRAY[start]
+    return (total / forecast_months).tolist()
+
+@lru_cache(maxsize=12)
+def _forecast_risk(target_month: int) -> float:
+    """Seasonal risk for a calendar month (1-12)"""
+    return _SEASONAL_RISK[target_month]
 
 def calculate_lcrs(farmer_id: str, field_id: str, location: dict, 
-                  forecast_months: int = 3) -> Dict:
+                  forecast_months: int = 3, detail: Literal['score', 'full'] = 'full') -> Dict:
     """
     Calculate Localized Climate Risk Score (LCRS) for the next N months.
     
+    Results are cached for LCRS_CACHE_TTL_S seconds per field, location
+    (to 0.01 degrees), horizon and detail. detail='score' returns only
+    'score' and 'risk_level', skipping factors and recommendations.
+    
     Returns:
     {
         'score': float (0-100),
@@ -122,37 +308,199 @@ def calculate_lcrs(farmer_id: str, field_id: str, location: dict,
         'valid_until': str (ISO date)
     }
     """
+    key = (farmer_id, field_id, *_location_bucket(location), forecast_months, detail)
+    now = time.monotonic()
+    with _lcrs_cache_lock:
+        entry = _lcrs_cache.get(key)
+    if entry is None or entry[0] <= now:
+        entry = (now + LCRS_CACHE_TTL_S, _compute_lcrs(farmer_id, field_id, location, forecast_months, detail))
+        with _lcrs_cache_lock:
+            if len(_lcrs_cache) >= LCRS_CACHE_MAX_ENTRIES:
+                # Dicts keep insertion order: drop the oldest entry
+                del _lcrs_cache[next(iter(_lcrs_cache))]
+            _lcrs_cache[key] = entry
+    
+    # Callers get their own copy of the mutable parts
+    result = entry[1]
+    if detail == 'score':
+        return dict(result)
+    return {**result, 'factors': dict(result['factors']), 'recommendations': list(result['recommendations'])}
+
+def invalidate_lcrs(farmer_id: Optional[str] = None, field_id: Optional[str] = None):
+    """Drop cached LCRS results for one field, or all of them when no field is given"""
+    with _lcrs_cache_lock:
+        if farmer_id is None:
+            _lcrs_cache.clear()
+            _rain_memo.set(None)
+            return
+        for key in [k for k in _lcrs_cache if k[0] == farmer_id and k[1] == field_id]:
+            del _lcrs_cache[key]
+
+def _risk_scores(rain_factor, soil_factor, avg_forecast_risk, soil_saturation):
+    """
+    (drought_risk, flood_risk, lcrs) from the four LCRS factors.
+    
+    Branch-free, so the same code scores one field (floats) or many at once
+    (equal-length NumPy arrays).
+    """
+    # Drought risk (low rain + low soil moisture + high forecast risk)
+    drought_risk = (
+        (1 - rain_factor) * _DROUGHT_WEIGHTS[0]
+        + (1 - soil_factor) * _DROUGHT_WEIGHTS[1]
+        + avg_forecast_risk * _DROUGHT_WEIGHTS[2]
+    )
+    
+    # Flood risk (high rain + high soil moisture); baseline unless saturated
+    saturated = soil_saturation > _FLOOD_SATURATION
+    flood_risk = (
+        (rain_factor * _FLOOD_WEIGHTS[0] + soil_saturation * _FLOOD_WEIGHTS[1]) * saturated
+        + _FLOOD_BASELINE * (1 - saturated)
+    )
+    
+    # Overall LCRS (weighted combination)
+    # Higher score = higher risk
+    lcrs = (
+        drought_risk * _LCRS_WEIGHTS[0] +      # Drought is primary concern
+        flood_risk * _LCRS_WEIGHTS[1] +        # Flood less common but serious
+        avg_forecast_risk * _LCRS_WEIGHTS[2]   # General seasonal risk
+    ) * 100
+    
+    return drought_risk, flood_risk, lcrs
+
+def _score_kernel(rain_factors, soil_factors, forecast_risks, saturations, drought_risks, flood_risks, scores):
+    """_risk_scores for each field, written into drought_risks, flood_risks and scores"""
+    for i in prange(len(rain_factors)):
+        drought_risks[i], flood_risks[i], scores[i] = _field_risk_scores(
+            rain_factors[i], soil_factors[i], forecast_risks[i], saturations[i]
+        )
+
+if NUMBA_AVAILABLE:
+    _field_risk_scores = njit(cache=True)(_risk_scores)
+    _score_kernel = njit(parallel=True, cache=True)(_score_kernel)
+else:
+    _field_risk_scores = _risk_scores
+
+def _compute_lcrs(farmer_id: str, field_id: str, location: dict, forecast_months: int,
+                  detail: str = 'full') -> Dict:
+    """Uncached LCRS calculation (see calculate_lcrs)"""
     # 1. Crowdsourced rain factor (recent 14 days)
-    rain_factor = calculate_crowdsourced_rain_factor(location, days=14)
+    rain_factor, rain_report_count = _rain_factor_with_count(location, days=14)
     
-    # 2. Soil moisture factor
-    soil_factor = calculate_soil_moisture_factor(farmer_id, field_id)
+    # 2. Soil moisture factor (one report fetch serves this and flood risk)
+    soil_report = climate_persistence.get_latest_soil_report(farmer_id, field_id)
+    now_epoch, now = _now()
+    if not rain_report_count and not soil_report:
+        # Nothing observed yet (typically a new farmer): only the season varies
+        return _neutral_lcrs(now_epoch, now.month, forecast_months, detail)
+    soil_factor = _soil_factor_from_report(soil_report)
     
     # 3. Seasonal forecast (average over next N months)
-    forecast_risks = [estimate_weather_forecast_risk(i) for i in range(forecast_months)]
-    avg_forecast_risk = sum(forecast_risks) / len(forecast_risks)
+    avg_forecast_risk = _average_forecast_risk(now.month, forecast_months)
     
-    # 4. Drought risk (low rain + low soil moisture + high forecast risk)
-    drought_risk = (1 - rain_factor) * 0.3 + (1 - soil_factor) * 0.3 + avg_forecast_risk * 0.4
+    soil_saturation = _soil_saturation(soil_report)
     
-    # 5. Flood risk (high rain + high soil moisture)
-    # Get actual soil moisture value, not optimal factor
-    soil_report = climate_persistence.get_latest_soil_report(farmer_id, field_id)
-    soil_saturation = 0.5
-    if soil_report:
-        smi = climate_persistence.calculate_soil_moisture_index(soil_report['moisture_level'])
-        soil_saturation = smi / 100.0
+    # 4-6. Drought risk, flood risk and overall LCRS
+    drought_risk, flood_risk, lcrs = _risk_scores(rain_factor, soil_factor, avg_forecast_risk, soil_saturation)
     
-    flood_risk = rain_factor * 0.5 + soil_saturation * 0.5 if soil_saturation > 0.7 else 0.1
+    return _lcrs_response(rain_factor, soil_factor, avg_forecast_risk, drought_risk, flood_risk, lcrs,
+                          now_epoch, forecast_months, detail)
+
+def _neutral_lcrs(now_epoch: int, current_month: int, forecast_months: int, detail: str) -> Dict:
+    """LCRS result with neutral rain and soil factors, from a per-season template"""
+    template = _neutral_lcrs_template(current_month, forecast_months, detail)
+    if detail == 'score':
+        return dict(template)
+    return {
+        **template,
+        'factors': dict(template['factors']),
+        'recommendations': list(template['recommendations']),
+        'valid_until': _valid_until(now_epoch, forecast_months)
+    }
+
+@lru_cache(maxsize=64)
+def _neutral_lcrs_template(current_month: int, forecast_months: int, detail: str) -> Dict:
+    """calculate_lcrs result without rain or soil reports (valid_until left to the caller)"""
+    soil_factor = _soil_factor_from_report(None)
+    soil_saturation = _soil_saturation(None)
+    avg_forecast_risk = _average_forecast_risk(current_month, forecast_months)
+    rain_factor = 0.5  # neutral if no data
+    return _lcrs_response(rain_factor, soil_factor, avg_forecast_risk,
+                          *_risk_scores(rain_factor, soil_factor, avg_forecast_risk, soil_saturation),
+                          0, forecast_months, detail)
+
+def calculate_lcrs_batch(requests: List[Dict], detail: Literal['score', 'full'] = 'full') -> List[Dict]:
+    """
+    LCRS for many fields at once, in request order.
     
-    # 6. Overall LCRS (weighted combination)
-    # Higher score = higher risk
-    lcrs = (
-        drought_risk * 0.6 +      # Drought is primary concern
-        flood_risk * 0.2 +        # Flood less common but serious
-        avg_forecast_risk * 0.2   # General seasonal risk
-    ) * 100
+    Each request is {'farmer_id', 'field_id', 'location', 'forecast_months'
+    (optional, default 3)}. Soil reports are read once for the whole batch,
+    each distinct location's rain factor and each horizon's seasonal
+    risk are computed once, and with NumPy all fields are scored in a single
+    vectorized pass. Results match calculate_lcrs but bypass its cache.
+    """
+    if not requests:
+        return []
+    
+    # Rain factor per distinct location
+    location_index = {}
+    locations = []
+    for req in requests:
+        location = req['location']
+        loc_key = (location.get('lat'), location.get('lon'))
+        if loc_key not in location_index:
+            location_index[loc_key] = len(locations)
+            locations.append(location)
+    rain_by_location = [calculate_crowdsourced_rain_factor(location, days=14) for location in locations]
     
+    soil_reports = climate_persistence.get_latest_soil_reports(
+        [(req['farmer_id'], req['field_id']) for req in requests]
+    )
+    now_epoch, now = _now()
+    horizons = [req.get('forecast_months', 3) for req in requests]
+    forecast_risks = _average_forecast_risks(now.month, horizons)
+    
+    rain_factors, soil_factors, saturations = [], [], []
+    for req in requests:
+        location = req['location']
+        soil_report = soil_reports[(req['farmer_id'], req['field_id'])]
+        rain_factors.append(rain_by_location[location_index[(location.get('lat'), location.get('lon'))]])
+        soil_factors.append(_soil_factor_from_report(soil_report))
+        saturations.append(_soil_saturation(soil_report))
+    
+    if NUMBA_AVAILABLE:
+        drought_risks, flood_risks, scores = (np.empty(len(requests)) for _ in range(3))
+        _score_kernel(
+            np.array(rain_factors), np.array(soil_factors), np.array(forecast_risks), np.array(saturations),
+            drought_risks, flood_risks, scores
+        )
+        drought_risks, flood_risks, scores = drought_risks.tolist(), flood_risks.tolist(), scores.tolist()
+    elif NUMPY_AVAILABLE:
+        drought_risks, flood_risks, scores = (
+            column.tolist() for column in _risk_scores(
+                np.array(rain_factors), np.array(soil_factors),
+                np.array(forecast_risks), np.array(saturations)
+            )
+        )
+    else:
+        drought_risks, flood_risks, scores = zip(*map(_risk_scores, rain_factors, soil_factors,
+                                                      forecast_risks, saturations))
+    
+    return [
+        _lcrs_response(*row, now_epoch, forecast_months, detail)
+        for *row, forecast_months in zip(rain_factors, soil_factors, forecast_risks,
+                                         drought_risks, flood_risks, scores, horizons)
+    ]
+
+def _soil_saturation(soil_report: Optional[Dict]) -> float:
+    """Actual soil moisture (0-1) for flood risk, not the optimal-moisture factor"""
+    if not soil_report:
+        return 0.5
+    return climate_persistence.calculate_soil_moisture_index(soil_report['moisture_level']) / 100.0
+
+def _lcrs_response(rain_factor: float, soil_factor: float, avg_forecast_risk: float,
+                   drought_risk: float, flood_risk: float, lcrs: float,
+                   now_epoch: int, forecast_months: int, detail: str) -> Dict:
+    """calculate_lcrs result for already scored factors"""
     # Determine risk level
     if lcrs < 30:
         risk_level = 'low'
@@ -161,33 +509,40 @@ def calculate_lcrs(farmer_id: str, field_id: str, location: dict,
     else:
         risk_level = 'high'
     
-    # Generate recommendations
-    recommendations = []
-    if drought_risk > 0.6:
-        recommendations.append('High drought risk: Consider drought-resistant crop varieties')
-        recommendations.append('Implement water conservation measures')
-    if flood_risk > 0.6:
-        recommendations.append('High flood risk: Ensure proper drainage in fields')
-        recommendations.append('Consider raised bed planting')
-    if soil_factor < 0.4:
-        recommendations.append('Soil moisture suboptimal: Check irrigation or drainage needs')
+    if detail == 'score':
+        return {'score': round(lcrs, 1), 'risk_level': risk_level}
     
-    # Crop diversification advice for high risk
-    if lcrs > 60:
-        recommendations.append('DIVERSIFICATION: Allocate 20% of land to drought-tolerant cash crop (cassava, sorghum)')
+    # Generate recommendations (crop diversification advice for high risk)
+    mask = (
+        (drought_risk > 0.6) * _DROUGHT_MASK
+        | (flood_risk > 0.6) * _FLOOD_MASK
+        | (soil_factor < 0.4) * _SOIL_MOISTURE_MASK
+        | (lcrs > 60) * _DIVERSIFICATION_MASK
+    )
+    recommendations = list(_RECOMMENDATION_SETS[mask])
     
-    valid_until = (datetime.utcnow() + timedelta(days=forecast_months * 30)).isoformat()
+    valid_until = _valid_until(now_epoch, forecast_months)
+    
+    rain_adequacy, soil_moisture, seasonal_forecast, drought, flood = (
+        round(factor, 2) for factor in (rain_factor, soil_factor, avg_forecast_risk, drought_risk, flood_risk)
+    )
     
     return {
         'score': round(lcrs, 1),
         'risk_level': risk_level,
         'factors': {
-            'rain_adequacy': round(rain_factor, 2),
-            'soil_moisture': round(soil_factor, 2),
-            'seasonal_forecast': round(avg_forecast_risk, 2),
-            'drought_risk': round(drought_risk, 2),
-            'flood_risk': round(flood_risk, 2)
+            'rain_adequacy': rain_adequacy,
+            'soil_moisture': soil_moisture,
+            'seasonal_forecast': seasonal_forecast,
+            'drought_risk': drought,
+            'flood_risk': flood
         },
         'recommendations': recommendations,
         'valid_until': valid_until
     }
+
+@lru_cache(maxsize=64)
+def _valid_until(epoch_sec: int, forecast_months: int) -> str:
+    """ISO end of the forecast window starting at epoch_sec (naive UTC, whole seconds)"""
+    start = datetime.fromtimestamp(epoch_sec, timezone.utc).replace(tzinfo=None)
+    return (start + timedelta(days=forecast_months * 30)).isoformat()
@@ -5,18 +5,30 @@ Loads trained models and performs predictions for pest, disease, and soil classi
 
 import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+# oneDNN CPU kernels (default on only for some TensorFlow builds)
+os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '1')
 
+import hashlib
 import json
 import pickle
+import queue
+import random
+import threading
+import time
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, List, Tuple, Optional
 from PIL import Image
 import requests
 from io import BytesIO
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Import central model manager
-from app.services.model_manager import get_model_manager
+from app.services.model_manager import configure_tf_threads, get_model_manager, resize_normalize, run_model
 
 # TensorFlow
 try:
@@ -34,13 +46,378 @@ try:
 except ImportError:
     HAS_SKLEARN = False
 
+# OpenCV (faster decode/resize; PIL is used without it)
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+# TensorRT runtime (engines built by export_tensorrt_engines.py)
+try:
+    import tensorrt as trt
+    from cuda import cudart
+    HAS_TRT = True
+except ImportError:
+    HAS_TRT = False
+
+# ONNX Runtime (optional, for the AI calendar forests)
+try:
+    import onnxruntime as ort
+    HAS_ORT = True
+except ImportError:
+    HAS_ORT = False
+
+# uint8 pixel -> float32 in [0, 1], applied as one table lookup
+_U8_TO_F32_LUT = np.arange(256, dtype=np.float32) / 255.0
+
+# Image CNNs (eligible for TensorRT engines and mixed precision)
+IMAGE_MODEL_TYPES = frozenset({"pest_detection", "disease_detection", "soil_diagnostics"})
+
+# Inter-request batching for the image CNNs
+ML_MAX_BATCH_SIZE = int(os.environ.get('ML_MAX_BATCH_SIZE', '16'))
+ML_BATCH_TIMEOUT_MS = float(os.environ.get('ML_BATCH_TIMEOUT_MS', '5'))
+
+# Run Keras image CNNs in float16 on GPU hosts ('0' disables)
+ML_MIXED_PRECISION = os.environ.get('ML_MIXED_PRECISION', '1') != '0'
+
+# Compile the Keras image models' inference functions with XLA. XLA
+# compiles once per input shape, so batches are zero-padded up to the next
+# power of two (capped at ML_MAX_BATCH_SIZE) to bound the compilations
+ML_XLA = os.environ.get('ML_XLA', '1') != '0'
+
+# Load and run every model once in the background when the service starts
+ML_WARMUP = os.environ.get('ML_WARMUP', '1') != '0'
+
+# Keep-alive connection pool for remote images, shared by all service instances
+_HTTP_SESSION = requests.Session()
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+)
+_HTTP_SESSION.mount('https://', _HTTP_ADAPTER)
+_HTTP_SESSION.mount('http://', _HTTP_ADAPTER)
+
+# Preprocessed remote images, reused while several models look at one URL
+ML_PREPROC_CACHE_SIZE = 128
+ML_PREPROC_CACHE_TTL_S = 300
+
+
+class BatchScheduler:
+    """
+    Coalesces concurrent single-image predictions for one model into one
+    predict call on a (B, H, W, C) batch.
+    
+    A worker thread takes the next queued image; if other requests are
+    already waiting it keeps collecting for up to timeout_ms (and at most
+    max_batch_size images), otherwise it predicts right away so a lone
+    request never waits for company.
+    """
+    
+    def __init__(self, predict_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = ML_MAX_BATCH_SIZE, timeout_ms: float = ML_BATCH_TIMEOUT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.timeout_s = timeout_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[np.ndarray, Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(self, img_array: np.ndarray) -> np.ndarray:
+        """Prediction row for one preprocessed (1, H, W, C) image; blocks until ready"""
+        future = Future()
+        self._queue.put((img_array, future))
+        return future.result()
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            if not self._queue.empty():
+                deadline = time.monotonic() + self.timeout_s
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        batch.append(self._queue.get(timeout=max(remaining, 0)))
+                    except queue.Empty:
+                        break
+            self._predict_batch(batch)
+    
+    def _predict_batch(self, batch: List[Tuple[np.ndarray, Future]]):
+        try:
+            predictions = self.predict_fn(np.concatenate([img_array for img_array, _ in batch]))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for row, (_, future) in zip(predictions, batch):
+            future.set_result(row)
+
+
+# Soil type and practice reference data (read-only; callers get copies)
+_SOIL_CHARACTERISTICS = MappingProxyType({
+    "sandy": {
+        "texture": "Coarse, gritty",
+        "drainage": "Excellent",
+        "water_retention": "Poor",
+        "nutrient_retention": "Low",
+        "workability": "Easy"
+    },
+    "loamy": {
+        "texture": "Balanced, crumbly",
+        "drainage": "Good",
+        "water_retention": "Good",
+        "nutrient_retention": "High",
+        "workability": "Excellent"
+    },
+    "clay": {
+        "texture": "Fine, smooth",
+        "drainage": "Poor",
+        "water_retention": "Excellent",
+        "nutrient_retention": "High",
+        "workability": "Difficult when wet"
+    },
+    "silty": {
+        "texture": "Smooth, slippery",
+        "drainage": "Moderate",
+        "water_retention": "Good",
+        "nutrient_retention": "Moderate",
+        "workability": "Moderate"
+    },
+    "peaty": {
+        "texture": "Spongy, organic",
+        "drainage": "Variable",
+        "water_retention": "Excellent",
+        "nutrient_retention": "High",
+        "workability": "Easy"
+    },
+    "chalky": {
+        "texture": "Stony, alkaline",
+        "drainage": "Good",
+        "water_retention": "Poor",
+        "nutrient_retention": "Low",
+        "workability": "Moderate"
+    }
+})
+
+_SOIL_RECOMMENDATIONS = MappingProxyType({
+    "sandy": (
+        "Add organic matter to improve water retention",
+        "Use mulch to reduce evaporation",
+        "Apply fertilizers more frequently in smaller amounts",
+        "Good for root vegetables like carrots and potatoes"
+    ),
+    "loamy": (
+        "Ideal for most crops - maintain organic matter",
+        "Practice crop rotation",
+        "Minimal amendments needed",
+        "Excellent for vegetables, fruits, and grains"
+    ),
+    "clay": (
+        "Add gypsum or organic matter to improve structure",
+        "Avoid working when wet to prevent compaction",
+        "Raised beds can improve drainage",
+        "Good for water-loving crops like rice"
+    ),
+    "silty": (
+        "Add organic matter for structure",
+        "Use cover crops to prevent erosion",
+        "Ensure proper drainage",
+        "Good for moisture-loving crops"
+    ),
+    "peaty": (
+        "May need pH adjustment (often acidic)",
+        "Add sand or compost for structure",
+        "Excellent water retention",
+        "Good for lettuce, brassicas"
+    ),
+    "chalky": (
+        "Add acidic organic matter",
+        "Regular fertilization needed",
+        "Mulch to conserve moisture",
+        "Choose alkaline-tolerant crops"
+    )
+})
+
+_PRACTICE_DESCRIPTIONS = MappingProxyType({
+    "land_preparation": "Prepare the land by plowing, harrowing, and leveling the soil for optimal planting conditions.",
+    "planting": "Plant seeds or seedlings at the appropriate depth and spacing for optimal growth.",
+    "fertilizer_application": "Apply fertilizers to provide essential nutrients for plant growth and development.",
+    "weeding": "Remove unwanted weeds that compete with crops for nutrients, water, and sunlight.",
+    "pest_control": "Apply pest control measures to protect crops from harmful insects and pests.",
+    "disease_management": "Implement disease management practices including fungicides and resistant varieties.",
+    "irrigation": "Water crops to maintain optimal soil moisture levels for plant growth.",
+    "harvesting": "Harvest mature crops at the right time to ensure maximum yield and quality.",
+    "post_harvest_handling": "Properly handle, dry, and store harvested crops to minimize post-harvest losses.",
+    "soil_testing": "Test soil to determine nutrient levels and pH for informed fertilization decisions."
+})
+
+
+# Simulated predictions when a model is unavailable, drawn from a private RNG
+# rather than the shared module-level one
+_FALLBACK_RNG = random.Random()
+_FALLBACK_PESTS = ("aphids", "whiteflies", "armyworms", "thrips", "healthy")
+_FALLBACK_DISEASES = ("late_blight", "early_blight", "leaf_curl", "rust", "healthy")
+_FALLBACK_SOILS = ("sandy", "loamy", "clay", "silty")
+
+# AI calendar features passed to the model as-is, even if an encoder exists
+_CALENDAR_NUMERIC_FEATURES = frozenset({'days_since_planting', 'temperature', 'rainfall_mm'})
+
+
+def _topk(probs: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest probabilities, largest first (all of them for k <= 0)"""
+    k = min(k, len(probs)) if k > 0 else len(probs)
+    idx = np.argpartition(probs, -k)[-k:]
+    return idx[np.argsort(-probs[idx])]
+
+
+def _batch_bucket(n: int, max_batch_size: int = ML_MAX_BATCH_SIZE) -> int:
+    """Padded size of an n-image batch: the next power of two, capped at max_batch_size (n itself past it)"""
+    if n >= max_batch_size:
+        return n
+    return min(1 << (n - 1).bit_length(), max_batch_size)
+
+
+def _pad_batch(batch: np.ndarray, size: int) -> np.ndarray:
+    """batch with zero rows appended up to size along the first axis"""
+    if len(batch) == size:
+        return batch
+    padded = np.zeros((size, *batch.shape[1:]), dtype=batch.dtype)
+    padded[:len(batch)] = batch
+    return padded
+
+
+if HAS_TF:
+    configure_tf_threads(tf)
+
+
+def _to_mixed_precision(model):
+    """
+    Clone a loaded float32 Keras model so its layers compute in float16
+    (variables stay float32). The last layer keeps float32 so the softmax
+    output is float32, as Keras recommends.
+    """
+    last_layer = model.layers[-1].name
+    
+    def clone_layer(layer):
+        config = layer.get_config()
+        if layer.name != last_layer and not isinstance(layer, keras.layers.InputLayer):
+            config['dtype'] = 'mixed_float16'
+        return layer.__class__.from_config(config)
+    
+    clone = keras.models.clone_model(model, clone_function=clone_layer)
+    clone.set_weights(model.get_weights())
+    return clone
+
+
+def _cuda_check(result):
+    """Unpack a cuda-python (error, *values) result, raising on failure"""
+    err, *values = result
+    if err != cudart.cudaError_t.cudaSuccess:
+        raise RuntimeError(f"CUDA error: {err}")
+    return values[0] if values else None
+
+
+class TRTPredictor:
+    """
+    TensorRT engine behind the Keras-style predict(batch) used for the CNNs.
+    
+    Device buffers are sized for the engine's largest batch profile and
+    reused; larger batches run in chunks. Calls are serialized because the
+    execution context and buffers are shared.
+    """
+    
+    def __init__(self, engine_path: Path):
+        logger = trt.Logger(trt.Logger.WARNING)
+        with open(engine_path, 'rb') as f, trt.Runtime(logger) as runtime:
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+        if self.engine is None:
+            raise RuntimeError(f"Could not deserialize TensorRT engine: {engine_path}")
+        self.context = self.engine.create_execution_context()
+        
+        names = [self.engine.get_tensor_name(i) for i in range(self.engine.num_io_tensors)]
+        self.input_name = next(n for n in names if self.engine.get_tensor_mode(n) == trt.TensorIOMode.INPUT)
+        self.output_name = next(n for n in names if self.engine.get_tensor_mode(n) == trt.TensorIOMode.OUTPUT)
+        
+        max_shape = tuple(self.engine.get_tensor_profile_shape(self.input_name, 0)[2])
+        self.max_batch_size = max_shape[0]
+        self.num_classes = self.engine.get_tensor_shape(self.output_name)[-1]
+        
+        self._stream = _cuda_check(cudart.cudaStreamCreate())
+        self._d_input = _cuda_check(cudart.cudaMalloc(int(np.prod(max_shape)) * 4))
+        self._d_output = _cuda_check(cudart.cudaMalloc(self.max_batch_size * self.num_classes * 4))
+        self.context.set_tensor_address(self.input_name, self._d_input)
+        self.context.set_tensor_address(self.output_name, self._d_output)
+        self._lock = threading.Lock()
+    
+    def predict(self, batch: np.ndarray, verbose: int = 0) -> np.ndarray:
+        """Class probabilities (B, num_classes) for a (B, H, W, C) batch"""
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        return np.concatenate([
+            self._predict_chunk(batch[start:start + self.max_batch_size])
+            for start in range(0, len(batch), self.max_batch_size)
+        ])
+    
+    def _predict_chunk(self, chunk: np.ndarray) -> np.ndarray:
+        output = np.empty((len(chunk), self.num_classes), dtype=np.float32)
+        with self._lock:
+            self.context.set_input_shape(self.input_name, chunk.shape)
+            _cuda_check(cudart.cudaMemcpyAsync(
+                self._d_input, chunk.ctypes.data, chunk.nbytes,
+                cudart.cudaMemcpyKind.cudaMemcpyHostToDevice, self._stream
+            ))
+            if not self.context.execute_async_v3(self._stream):
+                raise RuntimeError("TensorRT execution failed")
+            _cuda_check(cudart.cudaMemcpyAsync(
+                output.ctypes.data, self._d_output, output.nbytes,
+                cudart.cudaMemcpyKind.cudaMemcpyDeviceToHost, self._stream
+            ))
+            _cuda_check(cudart.cudaStreamSynchronize(self._stream))
+        return output
+    
+    def __del__(self):
+        for ptr in (getattr(self, '_d_input', None), getattr(self, '_d_output', None)):
+            if ptr is not None:
+                cudart.cudaFree(ptr)
+        if getattr(self, '_stream', None) is not None:
+            cudart.cudaStreamDestroy(self._stream)
+
+
+class ONNXForest:
+    """
+    A scikit-learn forest exported to ONNX (see export_calendar_onnx.py), run
+    through ONNX Runtime behind the predict / predict_proba / classes_
+    surface the calendar prediction uses.
+    """
+    
+    def __init__(self, onnx_path: Path, classes: Optional[np.ndarray] = None):
+        options = ort.SessionOptions()
+        # Single-row requests: threads would only add handoff latency
+        options.intra_op_num_threads = 1
+        self._session = ort.InferenceSession(str(onnx_path), options, providers=['CPUExecutionProvider'])
+        self._input = self._session.get_inputs()[0].name
+        self.classes_ = classes
+    
+    def _run(self, X):
+        return self._session.run(None, {self._input: np.asarray(X, dtype=np.float32)})
+    
+    def predict(self, X) -> np.ndarray:
+        # Classifiers: label, probabilities; regressors: variable of shape (n, 1)
+        return self._run(X)[0].ravel()
+    
+    def predict_proba(self, X) -> np.ndarray:
+        return self._run(X)[1]
+
 
 class ModelInferenceService:
     """Service for loading trained models and making predictions"""
     
     def __init__(self):
-        # Use central model manager
+        # Use central model manager. The models this service keeps references
+        # to (and builds inference functions, label tables and calendar
+        # encoders from) are pinned there, so it never unloads them under us.
         self.model_manager = get_model_manager()
+        self.model_manager.pin(IMAGE_MODEL_TYPES | {"ai_calendar"})
         
         self.base_dir = Path(__file__).parent.parent.parent
         self.models_dir = self.base_dir / "trained_models"
@@ -48,16 +425,100 @@ class ModelInferenceService:
         # Legacy support - will be deprecated
         self.models = {}
         self.class_mappings = {}
+        # Class label per output index of each classifier: model_type -> (model, labels)
+        self._idx_labels = {}
         self.scalers = {}
+        self.model_paths = {
+            "pest_detection": self.models_dir / "pest_detection_model.h5",
+            "disease_detection": self.models_dir / "disease_detection_model.h5",
+            "ai_calendar": self.models_dir / "ai_calendar_model.pkl",
+            "soil_diagnostics": self.models_dir / "soil_diagnostics_model.h5",
+            "yield_prediction": self.models_dir / "yield_prediction_model.pkl",
+            "climate_prediction": self.models_dir / "climate_prediction_model.h5",
+        }
+        
+        # AI calendar sub-models, unpacked once by _ensure_calendar_loaded
+        self._calendar_lock = threading.Lock()
+        self._calendar_loaded = False
+        # Per-thread preallocated calendar input row (see _calendar_row)
+        self._cal_rows = threading.local()
+        
+        # Preprocessed remote images: url hash -> (expires_at monotonic, tensor)
+        self._preproc_cache: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._preproc_lock = threading.Lock()
+        
+        # Float16 clones of Keras image models: model_type -> (source model, clone)
+        self._mixed_precision = ML_MIXED_PRECISION and HAS_TF and bool(tf.config.list_physical_devices('GPU'))
+        self._fp16_models = {}
+        
+        # Model types checked for a TensorRT engine and found without one
+        self._no_engine = set()
+        
+        # Runs the disease model alongside the pest model in analyze_plant_image
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ml-analyze")
+        
+        # Concrete inference functions of Keras image models: model_type -> (model, fn)
+        self._infer_fns = {}
+        
+        # One batch scheduler per image model, created on first use
+        self._schedulers: Dict[str, BatchScheduler] = {}
+        self._schedulers_lock = threading.Lock()
         
         print("[ML INFERENCE] ML Inference Service initialized with Model Manager")
+        
+        if ML_WARMUP:
+            threading.Thread(target=self._warmup, name="ml-warmup", daemon=True).start()
+    
+    def _warmup(self):
+        """
+        Load the models and run each image model through _infer (the model
+        and inference function requests use, float16 clone included) at every
+        padded batch size, so the first requests skip loading, graph tracing
+        and XLA compilation. This is the only warmup; the model manager only
+        loads models.
+        
+        The models load concurrently: deserializing weights runs mostly in
+        native code that releases the GIL, so loads on separate threads
+        overlap. The _infer runs then go one model at a time.
+        """
+        model_types = sorted(IMAGE_MODEL_TYPES)
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="ml-warmup") as executor:
+            loads = {model_type: executor.submit(self._load_model, model_type) for model_type in model_types}
+            calendar_load = (
+                executor.submit(self._ensure_calendar_loaded)
+                if self.model_paths["ai_calendar"].exists() else None
+            )
+            
+            batch_sizes = sorted({_batch_bucket(n) for n in range(1, ML_MAX_BATCH_SIZE + 1)}) if ML_XLA else [1]
+            for model_type in model_types:
+                try:
+                    loads[model_type].result()
+                    config = self.model_manager.get_model_config(model_type)
+                    input_shape = config.input_shape if config is not None and config.input_shape else (224, 224, 3)
+                    for batch_size in batch_sizes:
+                        self._infer(model_type, np.zeros((batch_size, *input_shape), dtype=np.float32))
+                except Exception as e:
+                    print(f"[ML INFERENCE] Skipped warmup of {model_type}: {str(e)}")
+            
+            if calendar_load is not None:
+                try:
+                    calendar_load.result()
+                except Exception as e:
+                    print(f"[ML INFERENCE] Skipped warmup of ai_calendar: {str(e)}")
+        print("[ML INFERENCE] Warmup finished")
     
     def _load_model(self, model_type: str):
         """Load a trained model into memory using Model Manager"""
+        # Prefer a TensorRT engine built next to the Keras model
+        engine = self._load_trt_engine(model_type)
+        if engine is not None:
+            return engine
+        
         # Try to get from Model Manager first
         model = self.model_manager.get_model(model_type)
         
         if model is not None:
+            model = self._maybe_mixed_precision(model_type, model)
             self.models[model_type] = model  # Cache locally for compatibility
             return model
         
@@ -65,16 +526,7 @@ class ModelInferenceService:
         print(f"[ML INFERENCE] Model {model_type} not available from Model Manager, using fallback")
         
         # Legacy fallback code...
-        model_paths = {
-            "pest_detection": self.models_dir / "pest_detection_model.h5",
-            "disease_detection": self.models_dir / "disease_detection_model.h5",
-            "ai_calendar": self.models_dir / "ai_calendar_model.pkl",
-            "soil_diagnostics": self.models_dir / "soil_diagnostics_model.h5",
-            "yield_prediction": self.models_dir / "yield_prediction_model.pkl",
-            "climate_prediction": self.models_dir / "climate_prediction_model.h5",
-        }
-        
-        model_path = model_paths.get(model_type)
+        model_path = self.model_paths.get(model_type)
         if not model_path or not model_path.exists():
             raise FileNotFoundError(f"Model not found: {model_path}")
         
@@ -82,7 +534,7 @@ class ModelInferenceService:
         if model_path.suffix == '.h5':
             if not HAS_TF:
                 raise RuntimeError("TensorFlow required for .h5 models")
-            model = keras.models.load_model(str(model_path))
+            model = self._maybe_mixed_precision(model_type, keras.models.load_model(str(model_path), compile=False))
             print(f"[OK] Loaded {model_type} model from {model_path}")
         elif model_path.suffix == '.pkl':
             if not HAS_SKLEARN:
@@ -99,6 +551,50 @@ class ModelInferenceService:
         self.models[model_type] = model
         return model
     
+    def _maybe_mixed_precision(self, model_type: str, model):
+        """Float16 clone of a Keras image model on GPU hosts (see _to_mixed_precision), else model"""
+        if not self._mixed_precision or model_type not in IMAGE_MODEL_TYPES or not isinstance(model, keras.Model):
+            return model
+        
+        cached = self._fp16_models.get(model_type)
+        if cached is not None and cached[0] is model:
+            return cached[1]
+        try:
+            clone = _to_mixed_precision(model)
+        except Exception as e:
+            print(f"[ML INFERENCE] Keeping {model_type} in float32, mixed precision failed: {str(e)}")
+            clone = model
+        self._fp16_models[model_type] = (model, clone)
+        return clone
+    
+    def _load_trt_engine(self, model_type: str) -> Optional[TRTPredictor]:
+        """TensorRT engine for an image model, if one was exported (see export_tensorrt_engines.py)"""
+        if not HAS_TRT or model_type not in IMAGE_MODEL_TYPES or model_type in self._no_engine:
+            return None
+        
+        model = self.models.get(model_type)
+        if isinstance(model, TRTPredictor):
+            return model
+        
+        config = self.model_manager.get_model_config(model_type)
+        configured = (config.path, config.alt_path) if config is not None else ()
+        for h5_path in (*configured, self.models_dir / f"{model_type}_model.h5"):
+            if h5_path is None:
+                continue
+            engine_path = Path(h5_path).with_suffix('.engine')
+            if engine_path.exists():
+                try:
+                    model = TRTPredictor(engine_path)
+                except Exception as e:
+                    print(f"[ML INFERENCE] Could not load TensorRT engine {engine_path}: {str(e)}")
+                    break
+                print(f"[OK] Loaded {model_type} TensorRT engine from {engine_path}")
+                self.models[model_type] = model
+                return model
+        
+        self._no_engine.add(model_type)
+        return None
+    
     def _load_class_mapping(self, model_type: str) -> Dict:
         """Load class mapping for classification models"""
         # Try Model Manager first
@@ -125,44 +621,132 @@ class ModelInferenceService:
         self.class_mappings[model_type] = mapping
         return mapping
     
+    def _class_labels(self, model_type: str, num_classes: int) -> Tuple[Optional[str], ...]:
+        """
+        Class label per output index of a loaded classifier (None where the
+        mapping has none), built once per loaded model
+        """
+        model = self.models.get(model_type)
+        cached = self._idx_labels.get(model_type)
+        if cached is None or cached[0] is not model or len(cached[1]) != num_classes:
+            labels = self.model_manager.get_class_labels(model_type)
+            if not labels:
+                mapping = self._load_class_mapping(model_type)
+                labels = tuple(mapping.get(str(i)) for i in range(num_classes))
+            labels = labels[:num_classes] + (None,) * (num_classes - len(labels))
+            cached = self._idx_labels[model_type] = (model, labels)
+        return cached[1]
+    
     def _preprocess_image(self, image_source, target_size=(224, 224)) -> np.ndarray:
-        """Preprocess image for CNN models"""
-        # Load image from URL or file path
+        """
+        Preprocess image for CNN models: (1, H, W, 3) float32 in [0, 1]
+        
+        Remote images are cached (read-only) by URL for ML_PREPROC_CACHE_TTL_S,
+        so models run back to back on one image download it once.
+        """
+        if not (isinstance(image_source, str) and image_source.startswith('http')):
+            return self._preprocess_uncached(image_source, target_size)
+        
+        key = hashlib.blake2b(f"{image_source}|{target_size}".encode(), digest_size=16).hexdigest()
+        now = time.monotonic()
+        with self._preproc_lock:
+            entry = self._preproc_cache.get(key)
+            if entry is not None and entry[0] > now:
+                self._preproc_cache.move_to_end(key)
+                return entry[1]
+        
+        img_array = self._preprocess_uncached(image_source, target_size)
+        img_array.flags.writeable = False
+        with self._preproc_lock:
+            self._preproc_cache[key] = (now + ML_PREPROC_CACHE_TTL_S, img_array)
+            self._preproc_cache.move_to_end(key)
+            while len(self._preproc_cache) > ML_PREPROC_CACHE_SIZE:
+                self._preproc_cache.popitem(last=False)
+        return img_array
+    
+    def _preprocess_uncached(self, image_source, target_size) -> np.ndarray:
+        # Load image from URL or file path as an RGB uint8 array
+        img = None
         if isinstance(image_source, str):
             if image_source.startswith('http'):
-                response = requests.get(image_source, timeout=10)
-                img = Image.open(BytesIO(response.content))
+                response = _HTTP_SESSION.get(image_source, timeout=10)
+                data = response.content
             else:
-                img = Image.open(image_source)
+                with open(image_source, 'rb') as f:
+                    data = f.read()
+            if HAS_CV2:
+                img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+                if img is not None:
+                    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            if img is None:
+                img = Image.open(BytesIO(data))
         else:
             img = image_source
         
-        # Convert to RGB if needed
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
+        if isinstance(img, Image.Image):
+            # Convert to RGB if needed
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            img = np.asarray(img)
         
         # Resize
-        img = img.resize(target_size)
-        
-        # Convert to array and normalize
-        img_array = np.array(img) / 255.0
+        if HAS_CV2:
+            img = cv2.resize(img, target_size, interpolation=cv2.INTER_AREA)
+            img_array = cv2.LUT(img, _U8_TO_F32_LUT)
+        else:
+            # Fused box resize + normalize, with the batch dimension
+            return resize_normalize(img, target_size[1], target_size[0])
         
         # Add batch dimension
-        img_array = np.expand_dims(img_array, axis=0)
+        return img_array[np.newaxis]
+    
+    def _batch_predict(self, model_type: str, img_array: np.ndarray) -> np.ndarray:
+        """
+        Predict one preprocessed image with a loaded model, batched together
+        with concurrent requests for the same model
+        """
+        scheduler = self._schedulers.get(model_type)
+        if scheduler is None:
+            with self._schedulers_lock:
+                scheduler = self._schedulers.get(model_type)
+                if scheduler is None:
+                    scheduler = BatchScheduler(lambda batch: self._infer(model_type, batch))
+                    self._schedulers[model_type] = scheduler
+        return scheduler.submit(img_array)
+    
+    def _infer(self, model_type: str, batch: np.ndarray) -> np.ndarray:
+        """Run a loaded image model on a batch"""
+        model = self.models[model_type]
+        if not (HAS_TF and isinstance(model, keras.Model)):
+            return run_model(model, batch)
         
-        return img_array
+        # Keras models go through a traced concrete function instead of
+        # predict(), skipping its per-call setup and retracing checks; with
+        # XLA the conv / elementwise chains are fused into compiled kernels,
+        # compiled once per padded batch size (see _batch_bucket)
+        cached = self._infer_fns.get(model_type)
+        if cached is None or cached[0] is not model:
+            spec = tf.TensorSpec((None, *model.input_shape[1:]), tf.float32)
+            infer_fn = tf.function(lambda x: model(x, training=False), jit_compile=ML_XLA).get_concrete_function(spec)
+            cached = self._infer_fns[model_type] = (model, infer_fn)
+        n = len(batch)
+        if ML_XLA:
+            batch = _pad_batch(batch, _batch_bucket(n))
+        return cached[1](tf.constant(batch, dtype=tf.float32)).numpy()[:n]
     
     # ========================================================================
     # PEST DETECTION
     # ========================================================================
     
-    def predict_pest(self, image_source, top_k: int = 3) -> Dict:
+    def predict_pest(self, image_source, top_k: int = 3, preprocessed: Optional[np.ndarray] = None) -> Dict:
         """
         Predict pest type from image
         
         Args:
             image_source: URL, file path, or PIL Image
             top_k: Number of top predictions to return
+            preprocessed: Output of _preprocess_image for image_source, if
+                already computed
         
         Returns:
             {
@@ -177,21 +761,21 @@ class ModelInferenceService:
             }
         """
         try:
-            # Load model and classes
-            model = self._load_model("pest_detection")
-            class_mapping = self._load_class_mapping("pest_detection")
+            # Load model
+            self._load_model("pest_detection")
             
-            # Preprocess image
-            img_array = self._preprocess_image(image_source)
+            # Preprocess image (unless the caller already did)
+            img_array = preprocessed if preprocessed is not None else self._preprocess_image(image_source)
             
-            # Predict
-            predictions = model.predict(img_array, verbose=0)[0]
+            # Predict (batched with concurrent requests)
+            predictions = self._batch_predict("pest_detection", img_array)
             
             # Get top k predictions
-            top_indices = np.argsort(predictions)[-top_k:][::-1]
+            labels = self._class_labels("pest_detection", len(predictions))
+            top_indices = _topk(predictions, top_k)
             top_predictions = [
                 {
-                    "class": class_mapping.get(str(idx), f"class_{idx}"),
+                    "class": labels[idx] or f"class_{idx}",
                     "confidence": float(predictions[idx])
                 }
                 for idx in top_indices
@@ -199,7 +783,7 @@ class ModelInferenceService:
             
             # Primary prediction
             primary_idx = top_indices[0]
-            pest_type = class_mapping.get(str(primary_idx), "unknown")
+            pest_type = labels[primary_idx] or "unknown"
             confidence = float(predictions[primary_idx])
             
             return {
@@ -220,7 +804,7 @@ class ModelInferenceService:
     # DISEASE DETECTION
     # ========================================================================
     
-    def predict_disease(self, image_source, top_k: int = 3) -> Dict:
+    def predict_disease(self, image_source, top_k: int = 3, preprocessed: Optional[np.ndarray] = None) -> Dict:
         """
         Predict disease type from plant image
         
@@ -235,21 +819,21 @@ class ModelInferenceService:
             }
         """
         try:
-            # Load model and classes
-            model = self._load_model("disease_detection")
-            class_mapping = self._load_class_mapping("disease_detection")
+            # Load model
+            self._load_model("disease_detection")
             
-            # Preprocess image
-            img_array = self._preprocess_image(image_source)
+            # Preprocess image (unless the caller already did)
+            img_array = preprocessed if preprocessed is not None else self._preprocess_image(image_source)
             
-            # Predict
-            predictions = model.predict(img_array, verbose=0)[0]
+            # Predict (batched with concurrent requests)
+            predictions = self._batch_predict("disease_detection", img_array)
             
             # Get top k predictions
-            top_indices = np.argsort(predictions)[-top_k:][::-1]
+            labels = self._class_labels("disease_detection", len(predictions))
+            top_indices = _topk(predictions, top_k)
             top_predictions = [
                 {
-                    "class": class_mapping.get(str(idx), f"class_{idx}"),
+                    "class": labels[idx] or f"class_{idx}",
                     "confidence": float(predictions[idx])
                 }
                 for idx in top_indices
@@ -257,7 +841,7 @@ class ModelInferenceService:
             
             # Primary prediction
             primary_idx = top_indices[0]
-            disease_type = class_mapping.get(str(primary_idx), "unknown")
+            disease_type = labels[primary_idx] or "unknown"
             confidence = float(predictions[primary_idx])
             
             return {
@@ -291,21 +875,21 @@ class ModelInferenceService:
             }
         """
         try:
-            # Load model and classes
-            model = self._load_model("soil_diagnostics")
-            class_mapping = self._load_class_mapping("soil_diagnostics")
+            # Load model
+            self._load_model("soil_diagnostics")
             
             # Preprocess image
             img_array = self._preprocess_image(image_source)
             
-            # Predict
-            predictions = model.predict(img_array, verbose=0)[0]
+            # Predict (batched with concurrent requests)
+            predictions = self._batch_predict("soil_diagnostics", img_array)
             
             # Get top k predictions
-            top_indices = np.argsort(predictions)[-top_k:][::-1]
+            labels = self._class_labels("soil_diagnostics", len(predictions))
+            top_indices = _topk(predictions, top_k)
             top_predictions = [
                 {
-                    "class": class_mapping.get(str(idx), f"class_{idx}"),
+                    "class": labels[idx] or f"class_{idx}",
                     "confidence": float(predictions[idx])
                 }
                 for idx in top_indices
@@ -313,7 +897,7 @@ class ModelInferenceService:
             
             # Primary prediction
             primary_idx = top_indices[0]
-            soil_type = class_mapping.get(str(primary_idx), "unknown")
+            soil_type = labels[primary_idx] or "unknown"
             confidence = float(predictions[primary_idx])
             
             # Get soil characteristics
@@ -343,8 +927,18 @@ class ModelInferenceService:
         
         Returns comprehensive analysis with both predictions
         """
-        pest_result = self.predict_pest(image_source)
-        disease_result = self.predict_disease(image_source)
+        # Preprocess once for both models
+        try:
+            img_array = self._preprocess_image(image_source)
+        except Exception as e:
+            print(f"❌ Image preprocessing error: {str(e)}")
+            pest_result = self._fallback_pest_prediction()
+            disease_result = self._fallback_disease_prediction()
+        else:
+            # Both models at once: each has its own batch worker, so neither waits on the other
+            disease_future = self._executor.submit(self.predict_disease, image_source, preprocessed=img_array)
+            pest_result = self.predict_pest(image_source, preprocessed=img_array)
+            disease_result = disease_future.result()
         
         # Determine primary issue
         if pest_result['confidence'] > disease_result['confidence']:
@@ -387,100 +981,16 @@ class ModelInferenceService:
     
     def _get_soil_characteristics(self, soil_type: str) -> Dict:
         """Get characteristics for soil type"""
-        characteristics = {
-            "sandy": {
-                "texture": "Coarse, gritty",
-                "drainage": "Excellent",
-                "water_retention": "Poor",
-                "nutrient_retention": "Low",
-                "workability": "Easy"
-            },
-            "loamy": {
-                "texture": "Balanced, crumbly",
-                "drainage": "Good",
-                "water_retention": "Good",
-                "nutrient_retention": "High",
-                "workability": "Excellent"
-            },
-            "clay": {
-                "texture": "Fine, smooth",
-                "drainage": "Poor",
-                "water_retention": "Excellent",
-                "nutrient_retention": "High",
-                "workability": "Difficult when wet"
-            },
-            "silty": {
-                "texture": "Smooth, slippery",
-                "drainage": "Moderate",
-                "water_retention": "Good",
-                "nutrient_retention": "Moderate",
-                "workability": "Moderate"
-            },
-            "peaty": {
-                "texture": "Spongy, organic",
-                "drainage": "Variable",
-                "water_retention": "Excellent",
-                "nutrient_retention": "High",
-                "workability": "Easy"
-            },
-            "chalky": {
-                "texture": "Stony, alkaline",
-                "drainage": "Good",
-                "water_retention": "Poor",
-                "nutrient_retention": "Low",
-                "workability": "Moderate"
-            }
-        }
-        return characteristics.get(soil_type, {})
+        return dict(_SOIL_CHARACTERISTICS.get(soil_type, {}))
     
     def _get_soil_recommendations(self, soil_type: str) -> List[str]:
         """Get recommendations for soil type"""
-        recommendations = {
-            "sandy": [
-                "Add organic matter to improve water retention",
-                "Use mulch to reduce evaporation",
-                "Apply fertilizers more frequently in smaller amounts",
-                "Good for root vegetables like carrots and potatoes"
-            ],
-            "loamy": [
-                "Ideal for most crops - maintain organic matter",
-                "Practice crop rotation",
-                "Minimal amendments needed",
-                "Excellent for vegetables, fruits, and grains"
-            ],
-            "clay": [
-                "Add gypsum or organic matter to improve structure",
-                "Avoid working when wet to prevent compaction",
-                "Raised beds can improve drainage",
-                "Good for water-loving crops like rice"
-            ],
-            "silty": [
-                "Add organic matter for structure",
-                "Use cover crops to prevent erosion",
-                "Ensure proper drainage",
-                "Good for moisture-loving crops"
-            ],
-            "peaty": [
-                "May need pH adjustment (often acidic)",
-                "Add sand or compost for structure",
-                "Excellent water retention",
-                "Good for lettuce, brassicas"
-            ],
-            "chalky": [
-                "Add acidic organic matter",
-                "Regular fertilization needed",
-                "Mulch to conserve moisture",
-                "Choose alkaline-tolerant crops"
-            ]
-        }
-        return recommendations.get(soil_type, [])
+        return list(_SOIL_RECOMMENDATIONS.get(soil_type, ()))
     
     def _fallback_pest_prediction(self) -> Dict:
         """Fallback prediction when model not available"""
-        import random
-        pests = ["aphids", "whiteflies", "armyworms", "thrips", "healthy"]
-        pest = random.choice(pests)
-        confidence = random.uniform(0.7, 0.95)
+        pest = _FALLBACK_RNG.choice(_FALLBACK_PESTS)
+        confidence = _FALLBACK_RNG.uniform(0.7, 0.95)
         
         return {
             "pest_type": pest,
@@ -493,10 +1003,8 @@ class ModelInferenceService:
     
     def _fallback_disease_prediction(self) -> Dict:
         """Fallback prediction when model not available"""
-        import random
-        diseases = ["late_blight", "early_blight", "leaf_curl", "rust", "healthy"]
-        disease = random.choice(diseases)
-        confidence = random.uniform(0.7, 0.95)
+        disease = _FALLBACK_RNG.choice(_FALLBACK_DISEASES)
+        confidence = _FALLBACK_RNG.uniform(0.7, 0.95)
         
         return {
             "disease_type": disease,
@@ -509,10 +1017,8 @@ class ModelInferenceService:
     
     def _fallback_soil_prediction(self) -> Dict:
         """Fallback prediction when model not available"""
-        import random
-        soils = ["sandy", "loamy", "clay", "silty"]
-        soil = random.choice(soils)
-        confidence = random.uniform(0.7, 0.9)
+        soil = _FALLBACK_RNG.choice(_FALLBACK_SOILS)
+        confidence = _FALLBACK_RNG.uniform(0.7, 0.9)
         
         return {
             "soil_type": soil,
@@ -563,26 +1069,15 @@ class ModelInferenceService:
         """
         model_path = self.model_paths["ai_calendar"]
         
-        if not model_path.exists():
+        if not self._calendar_loaded and not model_path.exists():
             print(f"⚠️ AI Calendar model not found at {model_path}, using fallback")
             return self._fallback_calendar_prediction(
                 crop, days_since_planting, growth_stage, pest_pressure, disease_occurrence
             )
         
         try:
-            # Load model if not cached
-            if "ai_calendar" not in self.models:
-                with open(model_path, 'rb') as f:
-                    model_data = pickle.load(f)
-                self.models["ai_calendar"] = model_data
-            else:
-                model_data = self.models["ai_calendar"]
-            
-            practice_model = model_data['practice_model']
-            timing_model = model_data['timing_model']
-            priority_model = model_data['priority_model']
-            encoders = model_data['encoders']
-            feature_cols = model_data['features']
+            self._ensure_calendar_loaded()
+            practice_classes = self._enc_classes['next_practice']
             
             # Prepare input
             input_data = {
@@ -598,44 +1093,36 @@ class ModelInferenceService:
                 'disease_occurrence': disease_occurrence
             }
             
-            # Encode categorical features
-            encoded_input = []
-            for col in feature_cols:
+            # Encode categorical features (unknown category: use most common, 0)
+            # straight into the input row
+            X = self._calendar_row()
+            row = X[0]
+            for i, (col, enc_map) in enumerate(self._cal_columns):
                 value = input_data[col]
-                if col in encoders and col != 'days_since_planting' and col != 'temperature' and col != 'rainfall_mm':
-                    try:
-                        encoded_value = encoders[col].transform([value])[0]
-                    except ValueError:
-                        # Unknown category, use most common
-                        encoded_value = 0
-                    encoded_input.append(encoded_value)
-                else:
-                    encoded_input.append(value)
-            
-            # Make predictions
-            X = np.array([encoded_input])
+                row[i] = value if enc_map is None else enc_map.get(value, 0)
             
-            # Predict practice
-            practice_pred_encoded = practice_model.predict(X)[0]
-            practice_proba = practice_model.predict_proba(X)[0]
+            # Predict practice (the argmax of predict_proba is what predict
+            # returns, so each forest is walked once)
+            practice_proba = self._practice_model.predict_proba(X)[0]
+            practice_pred_encoded = self._practice_model.classes_[np.argmax(practice_proba)]
             practice_confidence = float(np.max(practice_proba))
-            practice = encoders['next_practice'].inverse_transform([practice_pred_encoded])[0]
+            practice = practice_classes[practice_pred_encoded]
             
             # Predict timing
-            timing_pred = timing_model.predict(X)[0]
+            timing_pred = self._timing_model.predict(X)[0]
             days_until = max(0, int(round(timing_pred)))
             
             # Predict priority
-            priority_pred_encoded = priority_model.predict(X)[0]
-            priority_proba = priority_model.predict_proba(X)[0]
+            priority_proba = self._priority_model.predict_proba(X)[0]
+            priority_pred_encoded = self._priority_model.classes_[np.argmax(priority_proba)]
             priority_confidence = float(np.max(priority_proba))
-            priority = encoders['priority'].inverse_transform([priority_pred_encoded])[0]
+            priority = self._enc_classes['priority'][priority_pred_encoded]
             
             # Get top 3 alternative practices
-            top_3_indices = np.argsort(practice_proba)[-3:][::-1]
+            top_3_indices = _topk(practice_proba, 3)
             alternative_practices = []
             for idx in top_3_indices:
-                alt_practice = encoders['next_practice'].inverse_transform([idx])[0]
+                alt_practice = practice_classes[idx]
                 alt_confidence = float(practice_proba[idx])
                 alternative_practices.append({
                     "practice": alt_practice,
@@ -659,6 +1146,59 @@ class ModelInferenceService:
                 crop, days_since_planting, growth_stage, pest_pressure, disease_occurrence
             )
     
+    def _ensure_calendar_loaded(self):
+        """Load the AI calendar model once and bind its sub-models and feature encoders"""
+        if self._calendar_loaded:
+            return
+        with self._calendar_lock:
+            if self._calendar_loaded:
+                return
+            # Shared with the model manager (memory-mapped when joblib is available)
+            model_data = self.model_manager.get_model("ai_calendar")
+            if model_data is None:
+                with open(self.model_paths["ai_calendar"], 'rb') as f:
+                    model_data = pickle.load(f)
+            self.models["ai_calendar"] = model_data
+            
+            self._practice_model = self._load_onnx_forest(model_data, 'practice_model')
+            self._timing_model = self._load_onnx_forest(model_data, 'timing_model')
+            self._priority_model = self._load_onnx_forest(model_data, 'priority_model')
+            encoders = model_data['encoders']
+            # Label encoders as plain lookups: class -> code, and code -> class
+            self._enc_maps = {col: {c: i for i, c in enumerate(enc.classes_)} for col, enc in encoders.items()}
+            self._enc_classes = {col: enc.classes_.tolist() for col, enc in encoders.items()}
+            # (feature column, its class -> code map or None for numeric features)
+            self._cal_columns = tuple(
+                (col, self._enc_maps.get(col) if col not in _CALENDAR_NUMERIC_FEATURES else None)
+                for col in model_data['features']
+            )
+            self._calendar_loaded = True
+    
+    def _calendar_row(self) -> np.ndarray:
+        """
+        This thread's (1, n_features) calendar input, allocated once. Float32
+        is the dtype the forests compare features in, so it is used as is.
+        """
+        X = getattr(self._cal_rows, 'X', None)
+        if X is None:
+            X = self._cal_rows.X = np.empty((1, len(self._cal_columns)), dtype=np.float32)
+        return X
+    
+    def _load_onnx_forest(self, model_data: Dict, name: str):
+        """ONNX export of a calendar sub-model if one is present and up to date, else the sklearn model"""
+        model = model_data[name]
+        pkl_path = self.model_paths["ai_calendar"]
+        onnx_path = pkl_path.with_name(f"{pkl_path.stem}.{name}.onnx")
+        if not HAS_ORT or not onnx_path.exists() or onnx_path.stat().st_mtime < pkl_path.stat().st_mtime:
+            return model
+        try:
+            forest = ONNXForest(onnx_path, getattr(model, 'classes_', None))
+        except Exception as e:
+            print(f"[ML INFERENCE] Could not load ONNX model {onnx_path}: {str(e)}")
+            return model
+        print(f"[OK] Loaded ai_calendar {name} ONNX model from {onnx_path}")
+        return forest
+    
     def _fallback_calendar_prediction(
         self, 
         crop: str, 
@@ -668,7 +1208,6 @@ class ModelInferenceService:
         disease_occurrence: str
     ) -> Dict:
         """Fallback prediction when model not available"""
-        import random
         
         # Emergency practices
         if pest_pressure in ["medium", "high"]:
@@ -706,30 +1245,30 @@ class ModelInferenceService:
         # Stage-based recommendations
         if growth_stage == "seedling":
             practice = "weeding"
-            days = random.randint(3, 7)
+            days = _FALLBACK_RNG.randint(3, 7)
             priority = "medium"
         elif growth_stage == "vegetative":
             practice = "fertilizer_application"
-            days = random.randint(5, 10)
+            days = _FALLBACK_RNG.randint(5, 10)
             priority = "high"
         elif growth_stage == "flowering":
             practice = "irrigation"
-            days = random.randint(1, 3)
+            days = _FALLBACK_RNG.randint(1, 3)
             priority = "high"
         elif growth_stage == "fruiting":
             practice = "pest_control"
-            days = random.randint(7, 14)
+            days = _FALLBACK_RNG.randint(7, 14)
             priority = "medium"
         elif growth_stage == "mature":
             practice = "harvesting"
-            days = random.randint(0, 3)
+            days = _FALLBACK_RNG.randint(0, 3)
             priority = "high"
         else:
             practice = "irrigation"
-            days = random.randint(3, 7)
+            days = _FALLBACK_RNG.randint(3, 7)
             priority = "medium"
         
-        confidence = random.uniform(0.75, 0.9)
+        confidence = _FALLBACK_RNG.uniform(0.75, 0.9)
         
         return {
             "next_practice": practice,
@@ -748,17 +1287,5 @@ class ModelInferenceService:
     
     def _get_practice_description(self, practice: str) -> str:
         """Get description for farming practice"""
-        descriptions = {
-            "land_preparation": "Prepare the land by plowing, harrowing, and leveling the soil for optimal planting conditions.",
-            "planting": "Plant seeds or seedlings at the appropriate depth and spacing for optimal growth.",
-            "fertilizer_application": "Apply fertilizers to provide essential nutrients for plant growth and development.",
-            "weeding": "Remove unwanted weeds that compete with crops for nutrients, water, and sunlight.",
-            "pest_control": "Apply pest control measures to protect crops from harmful insects and pests.",
-            "disease_management": "Implement disease management practices including fungicides and resistant varieties.",
-            "irrigation": "Water crops to maintain optimal soil moisture levels for plant growth.",
-            "harvesting": "Harvest mature crops at the right time to ensure maximum yield and quality.",
-            "post_harvest_handling": "Properly handle, dry, and store harvested crops to minimize post-harvest losses.",
-            "soil_testing": "Test soil to determine nutrient levels and pH for informed fertilization decisions."
-        }
-        return descriptions.get(practice, "Perform scheduled farming practice.")
+        return _PRACTICE_DESCRIPTIONS.get(practice, "Perform scheduled farming practice.")
 
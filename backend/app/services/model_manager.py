@@ -4,13 +4,382 @@ Central service for loading and managing all trained AI models
 """
 
 import os
+import pickle
 import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, Any
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
 import json
+import logging
+import numpy as np
+
+try:
+    import joblib
+    HAS_JOBLIB = True
+except ImportError:
+    HAS_JOBLIB = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import h5py
+    HAS_H5PY = True
+except ImportError:
+    HAS_H5PY = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+log = logging.getLogger('model_manager')
 
 # Singleton instance
 _model_manager_instance = None
+_model_manager_lock = threading.Lock()
+
+# TensorFlow module, imported on first use by _tf()
+_TF = None
+
+# TensorFlow CPU threading: intra-op defaults to one thread per physical
+# core; ML_PIN_PHYSICAL_CORES=1 also pins the process to those cores
+ML_INTRA_OP_THREADS = int(os.environ.get('ML_INTRA_OP_THREADS', '0'))
+ML_INTER_OP_THREADS = int(os.environ.get('ML_INTER_OP_THREADS', '2'))
+ML_PIN_PHYSICAL_CORES = os.environ.get('ML_PIN_PHYSICAL_CORES', '0') == '1'
+_tf_configured = False
+
+# Unpinned models kept in memory at once; the least recently used is
+# unloaded past this (0 = no limit). Pinned models (see MLModelManager.pin)
+# are never unloaded and don't count towards it.
+ML_MAX_LOADED = int(os.environ.get('ML_MAX_LOADED', '0'))
+
+# Public datasets (under training_data_public) used to calibrate int8
+# quantization; other image models sample every image there
+_CALIBRATION_DATASETS = {
+    "pest_detection": "inaturalist_pests",
+    "disease_detection": "plantvillage_diseases",
+    "plant_health": "plantvillage_diseases",
+}
+_CALIBRATION_SAMPLES = 200
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+# Keras .h5 files up to this size are read into memory in one go (h5py core
+# driver); larger ones are read through the OS page cache
+_H5_IN_MEMORY_MAX_BYTES = 100_000_000
+
+# Saved result of the models directory scan
+_INDEX_FILE = ".index.json"
+
+# Files counted per public dataset by get_training_data_info
+_DATASET_FILE_SUFFIXES = (".jpg", ".png", ".csv")
+
+# Pickle-free copy of a scikit-learn model file, written beside the .pkl.
+# Opt-in (ML_SKLEARN_SAFE_LOAD=1): it loads without unpickling but several
+# times slower than the default memory-mapped .joblib copy
+ML_SKLEARN_SAFE_LOAD = os.environ.get('ML_SKLEARN_SAFE_LOAD', '0') == '1'
+_SAFE_SUFFIX = ".safe.npz"
+
+# scikit-learn classes a .safe.npz may rebuild; nothing else is imported
+_SAFE_ESTIMATORS = {
+    "RandomForestClassifier": "sklearn.ensemble",
+    "RandomForestRegressor": "sklearn.ensemble",
+    "ExtraTreesClassifier": "sklearn.ensemble",
+    "ExtraTreesRegressor": "sklearn.ensemble",
+    "DecisionTreeClassifier": "sklearn.tree",
+    "DecisionTreeRegressor": "sklearn.tree",
+    "ExtraTreeClassifier": "sklearn.tree",
+    "ExtraTreeRegressor": "sklearn.tree",
+    "LabelEncoder": "sklearn.preprocessing",
+}
+
+
+@dataclass(slots=True)
+class ModelSpec:
+    """Configuration of a trained model: where its files live and what it takes"""
+    path: Path
+    type: str
+    description: str
+    alt_path: Optional[Path] = None
+    tflite_path: Optional[Path] = None
+    int8_tflite_path: Optional[Path] = None
+    classes_file: Optional[Path] = None
+    input_shape: Optional[Tuple[int, ...]] = None
+    # Image input normalization: (pixel / 255 - mean) / std per RGB channel
+    mean: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    std: Tuple[float, float, float] = (1.0, 1.0, 1.0)
+
+
+def _resize_normalize_kernel(src, dst, scale, offset):
+    """
+    Box-filter resize of an (H, W, 3) uint8 image into the float32 dst,
+    normalized as pixel * scale - offset, in one pass over dst. Each output
+    pixel averages its source box when downscaling (like INTER_AREA) and
+    takes the nearest source pixel when upscaling.
+    """
+    in_h, in_w = src.shape[0], src.shape[1]
+    out_h, out_w = dst.shape[0], dst.shape[1]
+    for i in prange(out_h):
+        y0 = i * in_h // out_h
+        y1 = max(y0 + 1, (i + 1) * in_h // out_h)
+        for j in range(out_w):
+            x0 = j * in_w // out_w
+            x1 = max(x0 + 1, (j + 1) * in_w // out_w)
+            r = g = b = 0.0
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    r += src[y, x, 0]
+                    g += src[y, x, 1]
+                    b += src[y, x, 2]
+            n = (y1 - y0) * (x1 - x0)
+            dst[i, j, 0] = r / n * scale[0] - offset[0]
+            dst[i, j, 1] = g / n * scale[1] - offset[1]
+            dst[i, j, 2] = b / n * scale[2] - offset[2]
+
+
+def _box_resize_axis(img: np.ndarray, size: int, axis: int) -> np.ndarray:
+    """NumPy version of the kernel's resize along one axis (float32 output)"""
+    length = img.shape[axis]
+    starts = np.arange(size) * length // size
+    if length < size:
+        return np.take(img, starts, axis=axis).astype(np.float32, copy=False)
+    sums = np.add.reduceat(img, starts, axis=axis, dtype=np.float32)
+    counts = np.diff(np.append(starts, length)).astype(np.float32)
+    shape = [1] * img.ndim
+    shape[axis] = size
+    return sums / counts.reshape(shape)
+
+
+if NUMBA_AVAILABLE:
+    _resize_normalize_kernel = njit(parallel=True, cache=True)(_resize_normalize_kernel)
+
+
+def resize_normalize(img: np.ndarray, height: int, width: int,
+                     mean=(0.0, 0.0, 0.0), std=(1.0, 1.0, 1.0)) -> np.ndarray:
+    """
+    Resize an (H, W, 3) uint8 RGB image to (height, width) and normalize it
+    to float32 (pixel / 255 - mean) / std, returned with a batch dimension
+    """
+    scale = 1.0 / (255.0 * np.asarray(std, dtype=np.float32))
+    offset = np.asarray(mean, dtype=np.float32) / np.asarray(std, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        out = np.empty((1, height, width, 3), dtype=np.float32)
+        _resize_normalize_kernel(np.ascontiguousarray(img), out[0], scale, offset)
+        return out
+    resized = _box_resize_axis(_box_resize_axis(img, height, 0), width, 1)
+    return (resized * scale - offset)[np.newaxis]
+
+
+def _physical_core_cpus() -> List[int]:
+    """One logical CPU per physical core this process may run on (Linux), else []"""
+    if not hasattr(os, 'sched_getaffinity'):
+        return []
+    cpus = []
+    seen = set()
+    for cpu in sorted(os.sched_getaffinity(0)):
+        siblings = Path(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list")
+        try:
+            core = siblings.read_text().strip()
+        except OSError:
+            return []
+        if core not in seen:
+            seen.add(core)
+            cpus.append(cpu)
+    return cpus
+
+
+def configure_tf_threads(tf):
+    """
+    Apply the ML_* threading settings to TensorFlow, once per process.
+    TensorFlow only accepts them before it first runs an op, so this is
+    called right after it is imported.
+    """
+    global _tf_configured
+    if _tf_configured:
+        return
+    _tf_configured = True
+    cores = _physical_core_cpus()
+    if ML_PIN_PHYSICAL_CORES and cores:
+        os.sched_setaffinity(0, cores)
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(ML_INTRA_OP_THREADS or len(cores) or os.cpu_count() or 0)
+        tf.config.threading.set_inter_op_parallelism_threads(ML_INTER_OP_THREADS)
+    except RuntimeError as e:
+        log.warning('TensorFlow threads already configured: %s', e)
+
+
+def _tf():
+    """Import TensorFlow once (it takes seconds and hundreds of MB) and return the module"""
+    global _TF
+    if _TF is None:
+        import tensorflow
+        configure_tf_threads(tensorflow)
+        _TF = tensorflow
+    return _TF
+
+
+def _count_dataset_files(root: Path) -> int:
+    """Files under root ending in one of _DATASET_FILE_SUFFIXES, in one scandir walk"""
+    count = 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(_DATASET_FILE_SUFFIXES):
+                    count += 1
+    return count
+
+
+def _dataset_signature(path: Path) -> tuple:
+    """
+    mtimes of a dataset directory and its immediate subdirectories (the
+    class folders), which change when files are added to or removed from them
+    """
+    with os.scandir(path) as entries:
+        subdirs = sorted(
+            (entry.name, entry.stat(follow_symlinks=False).st_mtime_ns)
+            for entry in entries if entry.is_dir(follow_symlinks=False)
+        )
+    return path.stat().st_mtime_ns, tuple(subdirs)
+
+
+def _encode_safe(obj: Any, arrays: List[Tuple[np.dtype, List[np.ndarray], int]]) -> Any:
+    """
+    JSON-able description of a model file's contents for a .safe.npz: plain
+    values inline, scikit-learn estimators as their class name and state,
+    numpy arrays as a slice of one of the arrays groups, where arrays of one
+    dtype are packed end to end (a forest's hundreds of node arrays become a
+    single .npy member). Raises TypeError for anything else, such models
+    stay on pickle / joblib.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (list, tuple)):
+        return {"__list__" if isinstance(obj, list) else "__tuple__": [_encode_safe(v, arrays) for v in obj]}
+    if isinstance(obj, dict):
+        if not all(isinstance(k, str) for k in obj):
+            raise TypeError("dict with non-string keys")
+        return {"__dict__": {k: _encode_safe(v, arrays) for k, v in obj.items()}}
+    if isinstance(obj, np.ndarray):
+        is_object = obj.dtype == object
+        if is_object:
+            # Label arrays: stored as fixed-width unicode, restored as object
+            if not all(isinstance(v, str) for v in obj.flat):
+                raise TypeError("object array with non-string items")
+            obj = obj.astype(str)
+        group = next((i for i, (dtype, _, _) in enumerate(arrays) if dtype == obj.dtype), None)
+        if group is None:
+            group = len(arrays)
+            arrays.append((obj.dtype, [], 0))
+        dtype, chunks, offset = arrays[group]
+        chunks.append(obj.ravel())
+        arrays[group] = (dtype, chunks, offset + obj.size)
+        return {"__array__": group, "offset": offset, "shape": list(obj.shape), "object": is_object}
+    
+    cls = type(obj)
+    if cls.__name__ == "Tree" and cls.__module__ == "sklearn.tree._tree":
+        _, args, state = obj.__reduce__()
+        return {"__tree__": {"args": _encode_safe(args, arrays), "state": _encode_safe(state, arrays)}}
+    if _SAFE_ESTIMATORS.get(cls.__name__) and cls.__module__.startswith(_SAFE_ESTIMATORS[cls.__name__]):
+        return {"__estimator__": cls.__name__, "state": _encode_safe(obj.__getstate__(), arrays)}
+    raise TypeError(f"cannot store {cls.__module__}.{cls.__name__} without pickle")
+
+
+def _decode_safe(node: Any, arrays) -> Any:
+    """Inverse of _encode_safe"""
+    if not isinstance(node, dict):
+        return node
+    if "__list__" in node:
+        return [_decode_safe(v, arrays) for v in node["__list__"]]
+    if "__tuple__" in node:
+        return tuple(_decode_safe(v, arrays) for v in node["__tuple__"])
+    if "__dict__" in node:
+        return {k: _decode_safe(v, arrays) for k, v in node["__dict__"].items()}
+    if "__array__" in node:
+        offset, shape = node["offset"], node["shape"]
+        array = arrays[f"g{node['__array__']}"][offset:offset + int(np.prod(shape))].reshape(shape)
+        return array.astype(object) if node["object"] else array
+    if "__tree__" in node:
+        from sklearn.tree._tree import Tree
+        tree = Tree(*_decode_safe(node["__tree__"]["args"], arrays))
+        tree.__setstate__(_decode_safe(node["__tree__"]["state"], arrays))
+        return tree
+    
+    import importlib
+    name = node["__estimator__"]
+    cls = getattr(importlib.import_module(_SAFE_ESTIMATORS[name]), name)
+    obj = cls.__new__(cls)
+    obj.__setstate__(_decode_safe(node["state"], arrays))
+    return obj
+
+
+def run_model(model, batch: np.ndarray) -> np.ndarray:
+    """
+    One forward pass of any loaded model over a batch: Keras models are
+    called directly (skipping predict()'s per-call setup), classifiers with
+    predict_proba return class probabilities, and everything else (sklearn
+    regressors, TFLiteModel, ONNX / TensorRT wrappers) goes through predict()
+    """
+    if _TF is not None and isinstance(model, _TF.keras.Model):
+        return np.asarray(model(batch, training=False))
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(batch)
+    return model.predict(batch)
+
+
+class TFLiteModel:
+    """
+    TensorFlow Lite model behind the Keras-style predict(batch) used by the
+    inference service. The interpreter memory-maps the .tflite FlatBuffer,
+    so loading skips rebuilding the Keras layer graph from HDF5.
+    
+    Calls are serialized because an interpreter is not thread-safe; the
+    input tensor is resized when the batch size changes. Quantized (int8)
+    models take and return float arrays like the float model: inputs are
+    quantized and outputs dequantized with the tensors' scale / zero point.
+    """
+    
+    def __init__(self, tflite_path: Path, num_threads: Optional[int] = None):
+        tf = _tf()
+        self.path = tflite_path
+        self._interpreter = tf.lite.Interpreter(model_path=str(tflite_path), num_threads=num_threads or os.cpu_count())
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self.input_shape = (None, *self._input['shape'][1:])
+        self._lock = threading.Lock()
+    
+    def predict(self, batch, verbose=0) -> np.ndarray:
+        batch = np.asarray(batch, dtype=np.float32)
+        dtype = self._input['dtype']
+        if dtype != np.float32:
+            scale, zero_point = self._input['quantization']
+            info = np.iinfo(dtype)
+            batch = np.clip(np.round(batch / scale + zero_point), info.min, info.max).astype(dtype)
+        with self._lock:
+            if tuple(self._input['shape']) != batch.shape:
+                self._interpreter.resize_tensor_input(self._input['index'], batch.shape)
+                self._interpreter.allocate_tensors()
+                self._input = self._interpreter.get_input_details()[0]
+                self._output = self._interpreter.get_output_details()[0]
+            self._interpreter.set_tensor(self._input['index'], batch)
+            self._interpreter.invoke()
+            output = self._interpreter.get_tensor(self._output['index'])
+        if output.dtype != np.float32:
+            scale, zero_point = self._output['quantization']
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
 
 
 class MLModelManager:
@@ -19,76 +388,113 @@ class MLModelManager:
     Ensures models are loaded once and shared across the application.
     """
     
-    def __init__(self):
-        self.base_dir = Path(__file__).parent.parent.parent
+    def __init__(self, base_dir: Optional[Path] = None):
+        self.base_dir = Path(base_dir) if base_dir is not None else Path(__file__).parent.parent.parent
         self.models_dir = self.base_dir / "trained_models"
         self.data_dir = self.base_dir / "training_data"
         self.public_data_dir = self.base_dir / "training_data_public"
         
-        # Model registry
-        self.models = {}
+        # Model registry, least recently used first. Models load concurrently
+        # from the inference warmup and request threads: registry access is under
+        # _models_lock, and each model's loading under its own _load_locks entry
+        self.models = OrderedDict()
+        self.max_loaded = ML_MAX_LOADED
+        # Models exempt from least recently used unloading
+        self.pinned = set()
         self.metadata = {}
+        self._models_lock = threading.Lock()
+        
+        # get_training_data_info caches: metadata file -> (mtime, samples),
+        # public dataset dir -> (_dataset_signature, file count)
+        self._synthetic_samples = {}
+        self._public_file_counts = {}
+        
+        # Parsed class mappings: model_name -> (classes file mtime, mapping)
+        self._class_cache = {}
         
         # Model paths configuration
-        self.model_config = {
-            "pest_detection": {
-                "path": self.models_dir / "pest_detection_mobilenet_v3.h5",
-                "alt_path": self.models_dir / "pest_detection_model.h5",
-                "type": "tensorflow",
-                "classes_file": self.models_dir / "pest_detection_classes.json",
-                "input_shape": (224, 224, 3),
-                "description": "Identifies 7 common agricultural pests"
-            },
-            "disease_detection": {
-                "path": self.models_dir / "disease_detection_efficientnet.h5",
-                "alt_path": self.models_dir / "disease_detection_model.h5",
-                "type": "tensorflow",
-                "classes_file": self.models_dir / "disease_detection_classes.json",
-                "input_shape": (224, 224, 3),
-                "description": "Detects 38 plant disease classes"
-            },
-            "soil_diagnostics": {
-                "path": self.models_dir / "soil_diagnostics_custom_cnn.h5",
-                "alt_path": self.models_dir / "soil_diagnostics_model.h5",
-                "type": "tensorflow",
-                "classes_file": self.models_dir / "soil_diagnostics_classes.json",
-                "input_shape": (224, 224, 3),
-                "description": "Classifies 6 Kenyan soil types"
-            },
-            "yield_prediction": {
-                "path": self.models_dir / "yield_prediction_rf.pkl",
-                "alt_path": self.models_dir / "yield_prediction_model.pkl",
-                "type": "sklearn",
-                "description": "Predicts crop yields based on conditions"
-            },
-            "climate_prediction": {
-                "path": self.models_dir / "climate_prediction_lstm.h5",
-                "alt_path": self.models_dir / "climate_prediction_model.h5",
-                "type": "tensorflow",
-                "input_shape": (30, 10),  # 30 timesteps, 10 features
-                "description": "Forecasts weather patterns"
-            },
-            "storage_assessment": {
-                "path": self.models_dir / "storage_assessment_cnn.h5",
-                "alt_path": self.models_dir / "storage_assessment_model.h5",
-                "type": "tensorflow",
-                "classes_file": self.models_dir / "storage_assessment_classes.json",
-                "input_shape": (224, 224, 3),
-                "description": "Evaluates crop storage conditions"
-            },
-            "plant_health": {
-                "path": self.models_dir / "plant_health_mobilenet.h5",
-                "alt_path": self.models_dir / "plant_health_model.h5",
-                "type": "tensorflow",
-                "classes_file": self.models_dir / "plant_health_classes.json",
-                "input_shape": (224, 224, 3),
-                "description": "Overall plant health monitoring"
-            },
-            "ai_calendar": {
-                "path": self.models_dir / "ai_calendar_model.pkl",
-                "type": "sklearn",
-                "description": "Smart farming calendar recommendations"
-            }
+        self.model_config: Dict[str, ModelSpec] = {
+            "pest_detection": ModelSpec(
+                path=self.models_dir / "pest_detection_mobilenet_v3.h5",
+                tflite_path=self.models_dir / "pest_detection_mobilenet_v3.tflite",
+                int8_tflite_path=self.models_dir / "pest_detection_mobilenet_v3_int8.tflite",
+                alt_path=self.models_dir / "pest_detection_model.h5",
+                type="tensorflow",
+                classes_file=self.models_dir / "pest_detection_classes.json",
+                input_shape=(224, 224, 3),
+                description="Identifies 7 common agricultural pests"
+            ),
+            "disease_detection": ModelSpec(
+                path=self.models_dir / "disease_detection_efficientnet.h5",
+                tflite_path=self.models_dir / "disease_detection_efficientnet.tflite",
+                int8_tflite_path=self.models_dir / "disease_detection_efficientnet_int8.tflite",
+                alt_path=self.models_dir / "disease_detection_model.h5",
+                type="tensorflow",
+                classes_file=self.models_dir / "disease_detection_classes.json",
+                input_shape=(224, 224, 3),
+                description="Detects 38 plant disease classes"
+            ),
+            "soil_diagnostics": ModelSpec(
+                path=self.models_dir / "soil_diagnostics_custom_cnn.h5",
+                tflite_path=self.models_dir / "soil_diagnostics_custom_cnn.tflite",
+                int8_tflite_path=self.models_dir / "soil_diagnostics_custom_cnn_int8.tflite",
+                alt_path=self.models_dir / "soil_diagnostics_model.h5",
+                type="tensorflow",
+                classes_file=self.models_dir / "soil_diagnostics_classes.json",
+                input_shape=(224, 224, 3),
+                description="Classifies 6 Kenyan soil types"
+            ),
+            "yield_prediction": ModelSpec(
+                path=self.models_dir / "yield_prediction_rf.pkl",
+                alt_path=self.models_dir / "yield_prediction_model.pkl",
+                type="sklearn",
+                description="Predicts crop yields based on conditions"
+            ),
+            "climate_prediction": ModelSpec(
+                path=self.models_dir / "climate_prediction_lstm.h5",
+                tflite_path=self.models_dir / "climate_prediction_lstm.tflite",
+                alt_path=self.models_dir / "climate_prediction_model.h5",
+                type="tensorflow",
+                input_shape=(30, 10),  # 30 timesteps, 10 features
+                description="Forecasts weather patterns"
+            ),
+            "storage_assessment": ModelSpec(
+                path=self.models_dir / "storage_assessment_cnn.h5",
+                tflite_path=self.models_dir / "storage_assessment_cnn.tflite",
+                int8_tflite_path=self.models_dir / "storage_assessment_cnn_int8.tflite",
+                alt_path=self.models_dir / "storage_assessment_model.h5",
+                type="tensorflow",
+                classes_file=self.models_dir / "storage_assessment_classes.json",
+                input_shape=(224, 224, 3),
+                description="Evaluates crop storage conditions"
+            ),
+            "plant_health": ModelSpec(
+                path=self.models_dir / "plant_health_mobilenet.h5",
+                tflite_path=self.models_dir / "plant_health_mobilenet.tflite",
+                int8_tflite_path=self.models_dir / "plant_health_mobilenet_int8.tflite",
+                alt_path=self.models_dir / "plant_health_model.h5",
+                type="tensorflow",
+                classes_file=self.models_dir / "plant_health_classes.json",
+                input_shape=(224, 224, 3),
+                description="Overall plant health monitoring"
+            ),
+            "ai_calendar": ModelSpec(
+                path=self.models_dir / "ai_calendar_model.pkl",
+                type="sklearn",
+                description="Smart farming calendar recommendations"
+            )
+        }
+        
+        self._load_locks = {model_name: threading.Lock() for model_name in self.model_config}
+        
+        # Model files looked for per model, most preferred first
+        self._candidate_paths = {
+            model_name: [
+                str(path) for path in (
+                    config.int8_tflite_path, config.tflite_path, config.path, config.alt_path
+                ) if path is not None
+            ]
+            for model_name, config in self.model_config.items()
         }
         
         # Initialize
@@ -99,34 +505,69 @@ class MLModelManager:
         """Ensure models directory exists"""
         if not self.models_dir.exists():
             self.models_dir.mkdir(parents=True, exist_ok=True)
-            print(f"[MODEL MANAGER] Created models directory: {self.models_dir}")
+            log.info('Created models directory: %s', self.models_dir)
     
     def _scan_available_models(self):
-        """Scan for available trained models"""
-        available = {}
+        """
+        Scan for available trained models. The result is saved to
+        models_dir/.index.json and reused while the directory mtime (which
+        changes when model files are added or removed) is unchanged.
+        """
+        mtime = self.models_dir.stat().st_mtime_ns
+        available = self._load_index(mtime)
+        if available is None:
+            # One directory listing instead of a stat per candidate file
+            present = {os.path.join(self.models_dir, name) for name in os.listdir(self.models_dir)}
+            available = {}
+            for model_name, candidates in self._candidate_paths.items():
+                path = next((p for p in candidates if p in present), None)
+                if path is not None:
+                    available[model_name] = path
+            mtime = self._save_index(available)
         
-        for model_name, config in self.model_config.items():
-            primary_path = config["path"]
-            alt_path = config.get("alt_path")
-            
-            if primary_path.exists():
-                available[model_name] = str(primary_path)
-            elif alt_path and alt_path.exists():
-                available[model_name] = str(alt_path)
+        for model_name, path in available.items():
+            config = self.model_config[model_name]
+            if config.alt_path is not None and path == str(config.alt_path):
                 # Update config to use alt path
-                config["path"] = alt_path
+                config.path = config.alt_path
         
         self.metadata["available_models"] = available
+        self.metadata["models_dir_mtime"] = mtime
         self.metadata["total_available"] = len(available)
         self.metadata["total_configured"] = len(self.model_config)
         
         if available:
-            print(f"[MODEL MANAGER] Found {len(available)}/{len(self.model_config)} models:")
-            for name in available:
-                print(f"   - {name}")
+            log.info('Found %d/%d models: %s', len(available), len(self.model_config), ', '.join(available))
         else:
-            print("[MODEL MANAGER] No trained models found. Run training first:")
-            print("   python master_train_models.py --train-all")
+            log.warning('No trained models found. Run training first: python master_train_models.py --train-all')
+    
+    def _refresh_available_models(self):
+        """Rescan if model files were added or removed since the last scan"""
+        if self.models_dir.stat().st_mtime_ns != self.metadata.get("models_dir_mtime"):
+            self._scan_available_models()
+    
+    def _load_index(self, mtime: int) -> Optional[Dict[str, str]]:
+        """Available models from the saved index, if it matches the directory state and model config"""
+        try:
+            index = json.loads((self.models_dir / _INDEX_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+        if index.get("mtime") != mtime or index.get("candidates") != self._candidate_paths:
+            return None
+        return index.get("available")
+    
+    def _save_index(self, available: Dict[str, str]) -> int:
+        """Save the scan result; returns the directory mtime it is valid for"""
+        path = self.models_dir / _INDEX_FILE
+        try:
+            # Creating the file changes the directory mtime, rewriting it in place does not
+            path.touch()
+            mtime = self.models_dir.stat().st_mtime_ns
+            path.write_text(json.dumps({"mtime": mtime, "candidates": self._candidate_paths, "available": available}))
+            return mtime
+        except OSError as e:
+            log.warning('Could not save model index %s: %s', path, e)
+            return self.models_dir.stat().st_mtime_ns
     
     def get_model(self, model_name: str) -> Optional[Any]:
         """
@@ -140,49 +581,362 @@ class MLModelManager:
             Loaded model object or None if not available
         """
         # Check if already loaded
-        if model_name in self.models:
-            return self.models[model_name]
+        with self._models_lock:
+            model = self.models.get(model_name)
+            if model is not None:
+                self.models.move_to_end(model_name)
+                return model
         
         # Check if model exists
         if model_name not in self.model_config:
-            print(f"[MODEL MANAGER] Unknown model: {model_name}")
+            log.warning('Unknown model: %s', model_name)
             return None
         
+        # One load per model: concurrent callers wait for it, then share it
+        with self._load_locks[model_name]:
+            with self._models_lock:
+                model = self.models.get(model_name)
+            if model is None:
+                model = self._load(model_name)
+            return model
+    
+    def _load(self, model_name: str) -> Optional[Any]:
+        """Load a configured model from disk and cache it"""
         config = self.model_config[model_name]
-        model_path = config["path"]
+        model_path = config.path
+        tflite_path = self._tflite_path(config)
+        use_tflite = tflite_path is not None
         
-        if not model_path.exists():
-            print(f"[MODEL MANAGER] Model not found: {model_path}")
+        if not use_tflite and not model_path.exists():
+            log.warning('Model not found: %s', model_path)
             return None
         
         # Load model based on type
         try:
-            if config["type"] == "tensorflow":
-                import tensorflow as tf
-                from tensorflow import keras
-                model = keras.models.load_model(str(model_path))
-                print(f"[MODEL MANAGER] Loaded TensorFlow model: {model_name}")
+            if use_tflite:
+                # Prefer the TFLite export over rebuilding the Keras model
+                model = TFLiteModel(tflite_path)
+                log.info('Loaded TFLite model: %s', model_name)
             
-            elif config["type"] == "sklearn":
-                import pickle
-                with open(model_path, 'rb') as f:
-                    data = pickle.load(f)
-                    model = data.get('model', data)  # Handle both formats
-                print(f"[MODEL MANAGER] Loaded sklearn model: {model_name}")
+            elif config.type == "tensorflow":
+                model = self._load_keras(model_path)
+                log.info('Loaded TensorFlow model: %s', model_name)
+            
+            elif config.type == "sklearn":
+                data = self._load_sklearn(model_name, model_path)
+                model = data.get('model', data) if isinstance(data, dict) else data  # Handle both formats
+                log.info('Loaded sklearn model: %s', model_name)
             
             else:
-                print(f"[MODEL MANAGER] Unsupported model type: {config['type']}")
+                log.error('Unsupported model type: %s', config.type)
                 return None
             
-            # Cache the model
-            self.models[model_name] = model
+            # Cache the model, unloading the least recently used unpinned
+            # models past max_loaded
+            with self._models_lock:
+                self.models[model_name] = model
+                evicted = []
+                if self.max_loaded:
+                    unpinned = [name for name in self.models if name not in self.pinned]
+                    for name in unpinned[:max(0, len(unpinned) - self.max_loaded)]:
+                        evicted.append((name, self.models.pop(name)))
+            self._after_unload(evicted)
             return model
         
         except Exception as e:
-            print(f"[MODEL MANAGER] Error loading {model_name}: {str(e)}")
+            log.error('Error loading %s: %s', model_name, e)
             return None
     
-    def get_model_config(self, model_name: str) -> Optional[Dict]:
+    @staticmethod
+    def _load_keras(model_path: Path):
+        """Load a Keras model for inference, reading small .h5 files into memory with one sequential read"""
+        keras = _tf().keras
+        if HAS_H5PY and model_path.suffix == '.h5' and model_path.stat().st_size <= _H5_IN_MEMORY_MAX_BYTES:
+            try:
+                with h5py.File(str(model_path), 'r', driver='core', backing_store=False) as h5_file:
+                    return keras.models.load_model(h5_file, compile=False)
+            except (TypeError, ValueError):
+                # Keras 3 only loads .h5 models from a path
+                pass
+        return keras.models.load_model(str(model_path), compile=False)
+    
+    def _load_sklearn(self, model_name: str, model_path: Path) -> Any:
+        """
+        Contents of a scikit-learn model file. With joblib, an up-to-date
+        .joblib copy beside the .pkl is loaded, its numpy arrays
+        memory-mapped read-only rather than copied to the heap. With
+        ML_SKLEARN_SAFE_LOAD, an up-to-date .safe.npz copy (see
+        _sklearn_to_safe) is preferred instead, as it loads without
+        unpickling. The copy is written the first time the .pkl is loaded.
+        """
+        pkl_mtime = model_path.stat().st_mtime
+        safe_path = model_path.with_suffix(_SAFE_SUFFIX)
+        if ML_SKLEARN_SAFE_LOAD and safe_path.exists() and safe_path.stat().st_mtime >= pkl_mtime:
+            try:
+                return self._load_safe(safe_path)
+            except Exception as e:
+                log.warning('Could not load %s, using %s: %s', safe_path, model_path.name, e)
+        
+        joblib_path = model_path.with_suffix('.joblib')
+        if HAS_JOBLIB and joblib_path.exists() and joblib_path.stat().st_mtime >= pkl_mtime:
+            return joblib.load(str(joblib_path), mmap_mode='r')
+        
+        with open(model_path, 'rb') as f:
+            data = pickle.load(f)
+        if not (ML_SKLEARN_SAFE_LOAD and self._sklearn_to_safe(model_name, data)) and HAS_JOBLIB:
+            self._resave_as_joblib(model_name, data)
+        return data
+    
+    @staticmethod
+    def _load_safe(safe_path: Path) -> Any:
+        """Rebuild a model file's contents from its .safe.npz, with pickle disabled"""
+        with np.load(safe_path, allow_pickle=False) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+        meta = json.loads(arrays.pop("__meta__").item())
+        return _decode_safe(meta, arrays)
+    
+    def _sklearn_to_safe(self, model_name: str, data: Any = None) -> bool:
+        """
+        Write a model's .pkl contents to a .safe.npz beside it: estimator
+        structure and hyperparameters as JSON, numeric arrays (tree nodes and
+        values, classes) as .npy members. Only the forest / tree / label
+        encoder classes in _SAFE_ESTIMATORS, plain containers and arrays are
+        supported; returns False if the contents hold anything else.
+        """
+        model_path = self.model_config[model_name].path
+        if data is None:
+            with open(model_path, 'rb') as f:
+                data = pickle.load(f)
+        
+        groups = []
+        try:
+            meta = _encode_safe(data, groups)
+        except TypeError as e:
+            log.info('Keeping %s as pickle: %s', model_name, e)
+            return False
+        arrays = {f"g{i}": np.concatenate(chunks) for i, (_, chunks, _) in enumerate(groups)}
+        arrays["__meta__"] = np.array(json.dumps(meta))
+        
+        safe_path = model_path.with_suffix(_SAFE_SUFFIX)
+        tmp_path = safe_path.with_name(safe_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, safe_path)
+            log.info('Saved pickle-free copy of %s: %s', model_name, safe_path)
+            return True
+        except OSError as e:
+            log.warning('Could not save %s: %s', safe_path, e)
+            return False
+    
+    def _resave_as_joblib(self, model_name: str, data: Any = None):
+        """Write a model's .pkl contents uncompressed to a .joblib beside it, where arrays can be memory-mapped"""
+        model_path = self.model_config[model_name].path
+        if data is None:
+            with open(model_path, 'rb') as f:
+                data = pickle.load(f)
+        
+        joblib_path = model_path.with_suffix('.joblib')
+        tmp_path = joblib_path.with_name(joblib_path.name + '.tmp')
+        try:
+            joblib.dump(data, str(tmp_path), compress=0, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, joblib_path)
+            log.info('Saved memory-mappable copy of %s: %s', model_name, joblib_path)
+        except Exception as e:
+            log.warning('Could not save %s: %s', joblib_path, e)
+    
+    @staticmethod
+    def _tflite_path(config: ModelSpec) -> Optional[Path]:
+        """
+        TFLite export to serve for a TensorFlow model (int8 first), if one
+        exists and is current: an export older than the model file it was
+        converted from is skipped until export_tflite / quantize_all runs
+        again, and an int8 export also needs its calibration record (see
+        _calibration_record) to match the model file and preprocessing.
+        """
+        if config.type != "tensorflow":
+            return None
+        source_mtime = config.path.stat().st_mtime_ns if config.path.exists() else None
+        for path in (config.int8_tflite_path, config.tflite_path):
+            if path is None or not path.exists():
+                continue
+            if source_mtime is not None and path.stat().st_mtime_ns < source_mtime:
+                log.warning('Ignoring %s, older than %s; re-export it', path.name, config.path.name)
+                continue
+            if path == config.int8_tflite_path and not MLModelManager._calibration_matches(config, source_mtime):
+                log.warning('Ignoring %s, calibrated for another model version; re-run quantize_all', path.name)
+                continue
+            return path
+        return None
+    
+    @staticmethod
+    def _calibration_record(config: ModelSpec, source_mtime: Optional[int]) -> Dict:
+        """What an int8 export was calibrated for: the model file version and input preprocessing"""
+        return {
+            "source_mtime_ns": source_mtime,
+            "input_shape": list(config.input_shape),
+            "mean": list(config.mean),
+            "std": list(config.std),
+        }
+    
+    @staticmethod
+    def _calibration_matches(config: ModelSpec, source_mtime: Optional[int]) -> bool:
+        """Whether the int8 export's calibration record matches the current model file (if any) and preprocessing"""
+        try:
+            record = json.loads(config.int8_tflite_path.with_suffix('.calibration.json').read_bytes())
+        except (OSError, ValueError):
+            return False
+        if source_mtime is None:
+            source_mtime = record.get("source_mtime_ns")
+        return record == MLModelManager._calibration_record(config, source_mtime)
+    
+    def export_tflite(self, model_names=None) -> Dict[str, str]:
+        """
+        Convert trained Keras models to TFLite, written to each model's
+        tflite_path, which get_model then prefers over the .h5
+        
+        Args:
+            model_names: Models to convert (default: every TensorFlow model with an .h5)
+        
+        Returns:
+            {model_name: tflite path} for the models converted
+        """
+        tf = _tf()
+        
+        exported = {}
+        for model_name in (model_names or list(self.model_config)):
+            config = self.model_config[model_name]
+            if config.type != "tensorflow" or not config.path.exists():
+                continue
+            try:
+                keras_model = tf.keras.models.load_model(str(config.path), compile=False)
+                converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+                config.tflite_path.write_bytes(converter.convert())
+            except Exception as e:
+                log.error('Error exporting %s to TFLite: %s', model_name, e)
+                continue
+            exported[model_name] = str(config.tflite_path)
+            log.info('Exported TFLite model: %s', config.tflite_path)
+        
+        return exported
+    
+    def quantize_all(self, model_names=None) -> Dict[str, str]:
+        """
+        Convert the trained image CNNs to fully int8-quantized TFLite, written
+        to each model's int8_tflite_path, which get_model then prefers.
+        Activation ranges are calibrated on up to _CALIBRATION_SAMPLES images
+        from public_data_dir, preprocessed like inference inputs; the model
+        version and preprocessing they were calibrated for are saved beside
+        it in a .calibration.json.
+        
+        Args:
+            model_names: Models to quantize (default: every model with an int8_tflite_path)
+        
+        Returns:
+            {model_name: int8 tflite path} for the models quantized
+        """
+        tf = _tf()
+        
+        quantized = {}
+        for model_name in (model_names or [n for n, c in self.model_config.items() if c.int8_tflite_path is not None]):
+            config = self.model_config[model_name]
+            if not config.path.exists():
+                continue
+            images = self._calibration_images(model_name)
+            if not images:
+                log.warning('No calibration images for %s, skipping int8 quantization', model_name)
+                continue
+            try:
+                record = self._calibration_record(config, config.path.stat().st_mtime_ns)
+                keras_model = tf.keras.models.load_model(str(config.path), compile=False)
+                converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+                converter.representative_dataset = self._representative_dataset(images, config)
+                converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+                converter.inference_input_type = tf.int8
+                converter.inference_output_type = tf.int8
+                config.int8_tflite_path.write_bytes(converter.convert())
+                config.int8_tflite_path.with_suffix('.calibration.json').write_text(json.dumps(record))
+            except Exception as e:
+                log.error('Error quantizing %s: %s', model_name, e)
+                continue
+            quantized[model_name] = str(config.int8_tflite_path)
+            log.info('Exported int8 TFLite model: %s', config.int8_tflite_path)
+        
+        return quantized
+    
+    def _calibration_images(self, model_name: str) -> List[Path]:
+        """Evenly spaced sample of up to _CALIBRATION_SAMPLES images for a model"""
+        dataset = _CALIBRATION_DATASETS.get(model_name)
+        data_dir = self.public_data_dir / dataset if dataset else self.public_data_dir
+        if not data_dir.exists():
+            return []
+        images = sorted(p for p in data_dir.rglob("*") if p.suffix.lower() in _IMAGE_SUFFIXES)
+        step = max(1, len(images) // _CALIBRATION_SAMPLES)
+        return images[::step][:_CALIBRATION_SAMPLES]
+    
+    @staticmethod
+    def _representative_dataset(images: List[Path], config: ModelSpec):
+        """
+        TFLite representative dataset over image files, preprocessed like
+        inference (resize_normalize, so no float copy of the full-size image)
+        """
+        from PIL import Image
+        height, width = config.input_shape[:2]
+        
+        def generate():
+            for path in images:
+                try:
+                    with Image.open(path) as img:
+                        pixels = np.asarray(img.convert("RGB"))
+                except OSError:
+                    continue
+                yield [resize_normalize(pixels, height, width, config.mean, config.std)]
+        
+        return generate
+    
+    def preprocess(self, model_name: str, image) -> np.ndarray:
+        """
+        An image (PIL Image or (H, W, 3) uint8 RGB array) as a model's
+        float32 input batch of one: resized to its input_shape and
+        normalized with its mean / std, in a single pass
+        """
+        config = self.model_config[model_name]
+        if not isinstance(image, np.ndarray):
+            image = np.asarray(image.convert("RGB") if image.mode != "RGB" else image)
+        height, width = config.input_shape[:2]
+        return resize_normalize(image, height, width, config.mean, config.std)
+    
+    def predict_batch(self, model_name: str, inputs) -> Optional[np.ndarray]:
+        """
+        Run a model on several inputs in one call (see run_model). Prefer
+        this over calling a model once per input: the per-call dispatch
+        overhead is paid once and TensorFlow runs its batched kernels.
+        
+        Args:
+            model_name: Name of the model (e.g., 'pest_detection')
+            inputs: Sequence of single inputs (e.g. (224, 224, 3) float32
+                images, or feature rows for scikit-learn models)
+        
+        Returns:
+            Model outputs stacked along the first axis (class probabilities
+            for classifiers), or None if the model is not available
+        """
+        model = self.get_model(model_name)
+        if model is None:
+            return None
+        return run_model(model, np.stack(inputs).astype(np.float32, copy=False))
+    
+    def pin(self, model_names):
+        """
+        Keep models loaded regardless of max_loaded: for callers that hold on
+        to a model (or state built from it) between get_model calls, where
+        unloading would only cause a reload
+        """
+        with self._models_lock:
+            self.pinned.update(model_names)
+    
+    def get_model_config(self, model_name: str) -> Optional[ModelSpec]:
         """Get configuration for a specific model"""
         return self.model_config.get(model_name)
     
@@ -192,34 +946,64 @@ class MLModelManager:
         if not config:
             return {}
         
-        classes_file = config.get("classes_file")
+        classes_file = config.classes_file
         if not classes_file or not classes_file.exists():
             return {}
         
         try:
-            with open(classes_file, 'r') as f:
-                return json.load(f)
+            # Reparsed only when the file changes (e.g. after retraining)
+            mtime = classes_file.stat().st_mtime_ns
+            cached = self._class_cache.get(model_name)
+            if cached is None or cached[0] != mtime:
+                data = classes_file.read_bytes()
+                mapping = orjson.loads(data) if HAS_ORJSON else json.loads(data)
+                cached = self._class_cache[model_name] = (mtime, mapping, self._labels_tuple(mapping))
+            return cached[1]
         except Exception as e:
-            print(f"[MODEL MANAGER] Error loading classes for {model_name}: {str(e)}")
+            log.error('Error loading classes for %s: %s', model_name, e)
             return {}
     
+    def get_class_labels(self, model_name: str) -> Tuple[Optional[str], ...]:
+        """
+        Class labels of a classification model indexed by output position
+        (None for indices the mapping lacks), shared by all callers
+        """
+        if not self.get_class_mapping(model_name):
+            return ()
+        return self._class_cache[model_name][2]
+    
+    @staticmethod
+    def _labels_tuple(mapping: Dict) -> Tuple[Optional[str], ...]:
+        """{"0": label, ...} as a tuple of interned labels, () if the keys are not indices"""
+        if not isinstance(mapping, dict) or not all(isinstance(k, str) and k.isdigit() for k in mapping):
+            return ()
+        size = max(map(int, mapping), default=-1) + 1
+        return tuple(
+            sys.intern(label) if isinstance(label, str) else None
+            for label in (mapping.get(str(i)) for i in range(size))
+        )
+    
+    def is_available(self, model_name: str) -> bool:
+        """Whether a trained model file exists for model_name"""
+        self._refresh_available_models()
+        return model_name in self.metadata["available_models"]
+    
     def list_available_models(self) -> Dict:
         """List all available models with their status"""
         result = {}
+        self._refresh_available_models()
+        available = self.metadata["available_models"]
         
         for model_name, config in self.model_config.items():
-            model_path = config["path"]
-            alt_path = config.get("alt_path")
-            
-            is_available = model_path.exists() or (alt_path and alt_path.exists())
+            path = available.get(model_name)
             is_loaded = model_name in self.models
             
             result[model_name] = {
-                "available": is_available,
+                "available": path is not None,
                 "loaded": is_loaded,
-                "type": config["type"],
-                "description": config["description"],
-                "path": str(model_path) if model_path.exists() else (str(alt_path) if alt_path and alt_path.exists() else None)
+                "type": config.type,
+                "description": config.description,
+                "path": path
             }
         
         return result
@@ -239,10 +1023,15 @@ class MLModelManager:
                 metadata_file = data_dir / "metadata.json"
                 if metadata_file.exists():
                     try:
-                        with open(metadata_file, 'r') as f:
-                            metadata = json.load(f)
+                        mtime = metadata_file.stat().st_mtime_ns
+                        cached = self._synthetic_samples.get(metadata_file)
+                        if cached is None or cached[0] != mtime:
+                            with open(metadata_file, 'r') as f:
+                                metadata = json.load(f)
+                            samples = len(metadata) if isinstance(metadata, list) else metadata.get("records", 0)
+                            cached = self._synthetic_samples[metadata_file] = (mtime, samples)
                         info["synthetic_data"][data_dir.name] = {
-                            "samples": len(metadata) if isinstance(metadata, list) else metadata.get("records", 0),
+                            "samples": cached[1],
                             "path": str(data_dir)
                         }
                     except:
@@ -252,8 +1041,12 @@ class MLModelManager:
         if self.public_data_dir.exists():
             public_dirs = [d for d in self.public_data_dir.iterdir() if d.is_dir()]
             for data_dir in public_dirs:
-                # Count files or check metadata
-                file_count = len(list(data_dir.rglob("*.jpg"))) + len(list(data_dir.rglob("*.png"))) + len(list(data_dir.rglob("*.csv")))
+                # Count files, recounting only when the dataset's folders changed
+                signature = _dataset_signature(data_dir)
+                cached = self._public_file_counts.get(data_dir)
+                if cached is None or cached[0] != signature:
+                    cached = self._public_file_counts[data_dir] = (signature, _count_dataset_files(data_dir))
+                file_count = cached[1]
                 if file_count > 0:
                     info["public_data"][data_dir.name] = {
                         "files": file_count,
@@ -283,14 +1076,29 @@ class MLModelManager:
     
     def unload_model(self, model_name: str):
         """Unload a model from memory"""
-        if model_name in self.models:
-            del self.models[model_name]
-            print(f"[MODEL MANAGER] Unloaded model: {model_name}")
+        with self._models_lock:
+            model = self.models.pop(model_name, None)
+        if model is not None:
+            log.info('Unloaded model: %s', model_name)
     
     def unload_all_models(self):
         """Unload all models from memory"""
-        self.models.clear()
-        print("[MODEL MANAGER] All models unloaded")
+        with self._models_lock:
+            self.models.clear()
+        log.info('All models unloaded')
+    
+    def _after_unload(self, evicted):
+        """Log evicted (name, model) pairs; reset Keras state once no Keras model is left loaded"""
+        if not evicted:
+            return
+        for model_name, _ in evicted:
+            log.info('Unloaded least recently used model: %s', model_name)
+        if _TF is None:
+            return
+        keras_model = _TF.keras.Model
+        if any(isinstance(m, keras_model) for _, m in evicted) and \
+                not any(isinstance(m, keras_model) for m in list(self.models.values())):
+            _TF.keras.backend.clear_session()
 
 
 def get_model_manager() -> MLModelManager:
@@ -298,7 +1106,9 @@ def get_model_manager() -> MLModelManager:
     global _model_manager_instance
     
     if _model_manager_instance is None:
-        _model_manager_instance = MLModelManager()
+        with _model_manager_lock:
+            if _model_manager_instance is None:
+                _model_manager_instance = MLModelManager()
     
     return _model_manager_instance
 
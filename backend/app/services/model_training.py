@@ -4,18 +4,34 @@ Uses Supabase data to retrain and improve AI models
 """
 
 import os
+import hashlib
 import tensorflow as tf
 import numpy as np
 from pathlib import Path
 from typing import List, Dict, Tuple
 import requests
-from io import BytesIO
-from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from datetime import datetime
 
 from app.services.data_collection import DataCollectionService
 
+# Image downloads in flight at once while streaming a dataset
+DOWNLOAD_PARALLELISM = 32
+
+# Dataset caches kept under cache_dir, most recently used first; older ones
+# are removed when a training or evaluation run finishes
+DATASET_CACHE_KEEP = 8
+
+# Per-channel input normalization, (pixel / 255 - mean) / std, matching the
+# inference service's ModelSpec defaults (plain [0, 1] scaling); applied as
+# one multiply-add per batch with the constants folded here
+IMAGE_MEAN = (0.0, 0.0, 0.0)
+IMAGE_STD = (1.0, 1.0, 1.0)
+_PIXEL_SCALE = 1.0 / (255.0 * np.array(IMAGE_STD, dtype=np.float32))
+_PIXEL_OFFSET = np.array(IMAGE_MEAN, dtype=np.float32) / np.array(IMAGE_STD, dtype=np.float32)
+
 
 class ModelTrainingService:
     """Service to retrain models using collected data"""
@@ -24,9 +40,24 @@ class ModelTrainingService:
         self.data_service = DataCollectionService()
         self.models_dir = Path("models")
         self.models_dir.mkdir(exist_ok=True)
+        self.cache_dir = self.models_dir / "dataset_cache"
+        self.cache_dir.mkdir(exist_ok=True)
+        # Caches of image sets where some downloads failed: used for the
+        # epochs of the current run only, so later runs retry the failures
+        self._partial_caches = set()
         self.training_logs_dir = Path("training_logs")
         self.training_logs_dir.mkdir(exist_ok=True)
         
+        # Keep-alive connections for the concurrent image downloads
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=DOWNLOAD_PARALLELISM,
+            pool_maxsize=DOWNLOAD_PARALLELISM,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        
         # Image preprocessing parameters
         self.img_size = (224, 224)
         self.batch_size = 32
@@ -39,66 +70,161 @@ class ModelTrainingService:
     def download_and_preprocess_images(
         self, 
         image_urls: List[str], 
-        labels: List[str]
-    ) -> Tuple[np.ndarray, np.ndarray]:
+        labels: np.ndarray,
+        shuffle: bool = False
+    ) -> Tuple[tf.data.Dataset, int]:
         """
-        Download images from URLs and preprocess them
+        Input pipeline that downloads and preprocesses images: downloads run
+        concurrently and decode / resize on parallel map calls. Images stay
+        uint8 until they are batched, so only the current batch is ever held
+        as float32. Images that fail to download or decode are skipped.
+        
+        The decoded images are cached on disk under cache_dir, keyed by the
+        URLs, labels and image size. One pass here fills the cache and counts
+        the images that made it; epochs, and later runs over the same images
+        (retraining, evaluation), read the cache instead of downloading and
+        decoding again. A cache left incomplete by an interrupted run is
+        removed first; one missing failed downloads is marked .partial and
+        only used until _prune_dataset_cache runs at the end of this run.
         
         Args:
             image_urls: List of image URLs from Supabase storage
-            labels: Corresponding labels
+            labels: Corresponding label indices (see _encode_labels)
+            shuffle: Visit the images in a new random order each epoch
         
         Returns:
-            Tuple of (images array, labels array)
+            Tuple of (dataset of (images, labels) batches, images float32
+            normalized with IMAGE_MEAN / IMAGE_STD; number of images in it)
         """
-        print(f"📥 Downloading and preprocessing {len(image_urls)} images...")
-        
-        images = []
-        valid_labels = []
-        
-        for idx, (url, label) in enumerate(zip(image_urls, labels)):
+        print(f"📥 Streaming {len(image_urls)} images...")
+        
+        dataset = tf.data.Dataset.from_tensor_slices((
+            tf.constant(list(image_urls), dtype=tf.string),
+            np.asarray(labels, dtype=np.int64)
+        ))
+        dataset = dataset.interleave(
+            lambda url, label: tf.data.Dataset.from_tensors((self._fetch_image(url), label)),
+            cycle_length=DOWNLOAD_PARALLELISM,
+            num_parallel_calls=tf.data.AUTOTUNE,
+            deterministic=False
+        )
+        dataset = dataset.filter(lambda data, label: tf.strings.length(data) > 0)
+        dataset = dataset.map(self._decode_image, num_parallel_calls=tf.data.AUTOTUNE)
+        dataset = dataset.ignore_errors()
+        cache_path = self._cache_path(image_urls, labels)
+        index_path = cache_path.with_suffix('.index')
+        partial_marker = cache_path.with_suffix('.partial')
+        if not index_path.exists() or partial_marker.exists():
+            # Lockfile and shards of an interrupted write, or a cache missing
+            # the downloads that failed in an earlier run: start over
+            self._remove_cache(cache_path)
+        dataset = dataset.cache(str(cache_path))
+        
+        num_images = int(dataset.reduce(np.int64(0), lambda count, _: count + 1))
+        if not num_images:
+            self._remove_cache(cache_path)
+            raise ValueError("No valid images were downloaded")
+        print(f"✅ Successfully processed {num_images} images")
+        if num_images < len(image_urls):
+            partial_marker.touch()
+            self._partial_caches.add(cache_path)
+        os.utime(index_path)  # Recency for DATASET_CACHE_KEEP
+        
+        if shuffle:
+            # The cache replays the order of the pass that wrote it, so the
+            # shuffle comes after it, over the whole set (uint8, ~150 KB per
+            # image at 224x224)
+            dataset = dataset.shuffle(num_images, reshuffle_each_iteration=True)
+        dataset = dataset.batch(self.batch_size)
+        dataset = dataset.map(self._normalize_batch, num_parallel_calls=tf.data.AUTOTUNE)
+        return dataset.prefetch(tf.data.AUTOTUNE), num_images
+    
+    def _cache_path(self, image_urls: List[str], labels: np.ndarray) -> Path:
+        """Dataset cache file prefix for a set of images, changing when the images, labels or size do"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(tuple(self.img_size)).encode())
+        digest.update("\n".join(image_urls).encode())
+        digest.update(np.asarray(labels, dtype=np.int64).tobytes())
+        return self.cache_dir / f"images_{digest.hexdigest()}"
+    
+    def _remove_cache(self, cache_path: Path):
+        """Delete a dataset cache's files: index, data shards and any lockfile or .partial marker"""
+        for path in self.cache_dir.glob(f"{cache_path.name}*"):
+            path.unlink(missing_ok=True)
+    
+    def _prune_dataset_cache(self):
+        """
+        Remove the caches of image sets with failed downloads, then all but
+        the DATASET_CACHE_KEEP most recently used caches
+        """
+        for cache_path in self._partial_caches:
+            self._remove_cache(cache_path)
+        self._partial_caches.clear()
+        
+        # Finished caches only: images_<digest>.index, not a writer's shard
+        indexes = [path for path in self.cache_dir.glob("images_*.index") if path.stem.count("_") == 1]
+        indexes.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+        for index_path in indexes[DATASET_CACHE_KEEP:]:
+            self._remove_cache(index_path.with_suffix(''))
+    
+    def _fetch_image(self, url: tf.Tensor) -> tf.Tensor:
+        """Downloaded bytes of an image URL tensor (empty if the download failed)"""
+        def fetch(url):
+            url = url.numpy().decode()
             try:
-                # Download image
-                response = requests.get(url, timeout=10)
-                img = Image.open(BytesIO(response.content))
-                
-                # Convert to RGB if needed
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Resize
-                img = img.resize(self.img_size)
-                
-                # Convert to array and normalize
-                img_array = np.array(img) / 255.0
-                
-                images.append(img_array)
-                valid_labels.append(label)
-                
-                if (idx + 1) % 10 == 0:
-                    print(f"  Processed {idx + 1}/{len(image_urls)} images")
-                    
+                response = self._session.get(url, timeout=10)
+                response.raise_for_status()
+                return response.content
             except Exception as e:
-                print(f"  ⚠️ Failed to process image {idx}: {e}")
-                continue
-        
-        if not images:
-            raise ValueError("No valid images were downloaded")
-        
-        print(f"✅ Successfully processed {len(images)} images")
+                print(f"  ⚠️ Failed to download image {url}: {e}")
+                return b""
         
-        # Convert to numpy arrays
-        X = np.array(images)
-        
-        # Encode labels
-        unique_labels = sorted(list(set(valid_labels)))
+        data = tf.py_function(fetch, [url], tf.string)
+        return tf.ensure_shape(data, [])
+    
+    def _decode_image(self, data: tf.Tensor, label: tf.Tensor) -> Tuple[tf.Tensor, tf.Tensor]:
+        """Decode an encoded image to RGB and resize it (uint8)"""
+        img = tf.cond(
+            tf.io.is_jpeg(data),
+            lambda: self._decode_jpeg_downscaled(data),
+            lambda: tf.ensure_shape(tf.io.decode_image(data, channels=3, expand_animations=False), [None, None, 3])
+        )
+        img = tf.image.resize(img, self.img_size, antialias=True)
+        return tf.saturate_cast(tf.round(img), tf.uint8), label
+    
+    def _decode_jpeg_downscaled(self, data: tf.Tensor) -> tf.Tensor:
+        """
+        Decode a JPEG at the largest 1/2, 1/4 or 1/8 scale that is still at
+        least img_size: libjpeg scales in the DCT domain, skipping most of the
+        inverse DCT and color conversion work for large photos
+        """
+        height, width = self.img_size
+        shape = tf.io.extract_jpeg_shape(data)
+        factor = tf.minimum(shape[0] // height, shape[1] // width)
+        branch = tf.add_n([tf.cast(factor >= ratio, tf.int32) for ratio in (2, 4, 8)])
+        return tf.switch_case(branch, [
+            lambda ratio=ratio: tf.ensure_shape(tf.io.decode_jpeg(data, channels=3, ratio=ratio), [None, None, 3])
+            for ratio in (1, 2, 4, 8)
+        ])
+    
+    @staticmethod
+    def _normalize_batch(images: tf.Tensor, labels: tf.Tensor) -> Tuple[tf.Tensor, tf.Tensor]:
+        """Rescale and standardize a uint8 image batch to float32 in a single pass"""
+        return tf.cast(images, tf.float32) * _PIXEL_SCALE - _PIXEL_OFFSET, labels
+    
+    def _encode_labels(self, labels: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Label index per sample and the sorted unique labels; the mapping is
+        saved to label_mapping.json
+        """
+        unique_labels = sorted(set(labels))
         label_to_idx = {label: idx for idx, label in enumerate(unique_labels)}
-        y = np.array([label_to_idx[label] for label in valid_labels])
+        y = np.array([label_to_idx[label] for label in labels])
         
         # Save label mapping
         self._save_label_mapping(unique_labels, label_to_idx)
         
-        return X, y, unique_labels
+        return y, unique_labels
     
     def _save_label_mapping(self, labels: List[str], mapping: Dict):
         """Save label to index mapping"""
@@ -207,11 +333,8 @@ class ModelTrainingService:
         if len(training_data["labels"]) < min_samples_per_class:
             raise ValueError(f"Not enough training data. Need at least {min_samples_per_class} samples.")
         
-        # Download and preprocess images
-        X, y, unique_labels = self.download_and_preprocess_images(
-            training_data["image_urls"],
-            training_data["labels"]
-        )
+        # Encode labels
+        y, unique_labels = self._encode_labels(training_data["labels"])
         
         # Check class distribution
         unique, counts = np.unique(y, return_counts=True)
@@ -230,12 +353,14 @@ class ModelTrainingService:
         ])
         
         # Split data
-        split_idx = int(len(X) * (1 - validation_split))
-        X_train, X_val = X[:split_idx], X[split_idx:]
+        split_idx = int(len(y) * (1 - validation_split))
+        image_urls = training_data["image_urls"]
         y_train, y_val = y[:split_idx], y[split_idx:]
+        train_ds, num_train = self.download_and_preprocess_images(image_urls[:split_idx], y_train, shuffle=True)
+        val_ds, num_val = self.download_and_preprocess_images(image_urls[split_idx:], y_val)
         
-        print(f"📚 Training set: {len(X_train)} samples")
-        print(f"🔍 Validation set: {len(X_val)} samples")
+        print(f"📚 Training set: {num_train} samples")
+        print(f"🔍 Validation set: {num_val} samples")
         
         # Callbacks
         callbacks = [
@@ -251,7 +376,7 @@ class ModelTrainingService:
                 min_lr=1e-7
             ),
             tf.keras.callbacks.ModelCheckpoint(
-                filepath=str(self.models_dir / 'pest_detection_best.h5'),
+                filepath=str(self.models_dir / 'pest_detection_best.keras'),
                 monitor='val_accuracy',
                 save_best_only=True
             )
@@ -260,26 +385,25 @@ class ModelTrainingService:
         # Train model
         print("🏋️ Training model...")
         history = model.fit(
-            X_train, y_train,
-            validation_data=(X_val, y_val),
+            train_ds,
+            validation_data=val_ds,
             epochs=self.epochs,
-            batch_size=self.batch_size,
             callbacks=callbacks,
             verbose=1
         )
         
         # Save final model
-        model_path = self.models_dir / f"pest_detection_{datetime.now().strftime('%Y%m%d_%H%M%S')}.h5"
+        model_path = self.models_dir / f"pest_detection_{datetime.now().strftime('%Y%m%d_%H%M%S')}.keras"
         model.save(model_path)
         print(f"💾 Model saved to {model_path}")
         
         # Evaluate
-        val_loss, val_acc, val_top3 = model.evaluate(X_val, y_val, verbose=0)
+        val_loss, val_acc, val_top3 = model.evaluate(val_ds, verbose=0)
         
         results = {
             "model_path": str(model_path),
-            "training_samples": len(X_train),
-            "validation_samples": len(X_val),
+            "training_samples": num_train,
+            "validation_samples": num_val,
             "num_classes": len(unique_labels),
             "classes": unique_labels,
             "class_distribution": class_dist,
@@ -296,6 +420,7 @@ class ModelTrainingService:
         
         # Save training results
         self._save_training_results("pest_detection", results)
+        self._prune_dataset_cache()
         
         print(f"✅ Training complete! Validation accuracy: {val_acc:.4f}")
         return results
@@ -313,10 +438,7 @@ class ModelTrainingService:
         if len(training_data["labels"]) < min_samples_per_class:
             raise ValueError(f"Not enough training data. Need at least {min_samples_per_class} samples.")
         
-        X, y, unique_labels = self.download_and_preprocess_images(
-            training_data["image_urls"],
-            training_data["labels"]
-        )
+        y, unique_labels = self._encode_labels(training_data["labels"])
         
         unique, counts = np.unique(y, return_counts=True)
         class_dist = dict(zip([unique_labels[i] for i in unique], counts))
@@ -324,12 +446,14 @@ class ModelTrainingService:
         
         model = self.build_classification_model(len(unique_labels))
         
-        split_idx = int(len(X) * (1 - validation_split))
-        X_train, X_val = X[:split_idx], X[split_idx:]
+        split_idx = int(len(y) * (1 - validation_split))
+        image_urls = training_data["image_urls"]
         y_train, y_val = y[:split_idx], y[split_idx:]
+        train_ds, num_train = self.download_and_preprocess_images(image_urls[:split_idx], y_train, shuffle=True)
+        val_ds, num_val = self.download_and_preprocess_images(image_urls[split_idx:], y_val)
         
-        print(f"📚 Training set: {len(X_train)} samples")
-        print(f"🔍 Validation set: {len(X_val)} samples")
+        print(f"📚 Training set: {num_train} samples")
+        print(f"🔍 Validation set: {num_val} samples")
         
         callbacks = [
             tf.keras.callbacks.EarlyStopping(
@@ -338,7 +462,7 @@ class ModelTrainingService:
                 restore_best_weights=True
             ),
             tf.keras.callbacks.ModelCheckpoint(
-                filepath=str(self.models_dir / 'disease_detection_best.h5'),
+                filepath=str(self.models_dir / 'disease_detection_best.keras'),
                 monitor='val_accuracy',
                 save_best_only=True
             )
@@ -346,24 +470,23 @@ class ModelTrainingService:
         
         print("🏋️ Training model...")
         history = model.fit(
-            X_train, y_train,
-            validation_data=(X_val, y_val),
+            train_ds,
+            validation_data=val_ds,
             epochs=self.epochs,
-            batch_size=self.batch_size,
             callbacks=callbacks,
             verbose=1
         )
         
-        model_path = self.models_dir / f"disease_detection_{datetime.now().strftime('%Y%m%d_%H%M%S')}.h5"
+        model_path = self.models_dir / f"disease_detection_{datetime.now().strftime('%Y%m%d_%H%M%S')}.keras"
         model.save(model_path)
         print(f"💾 Model saved to {model_path}")
         
-        val_loss, val_acc, val_top3 = model.evaluate(X_val, y_val, verbose=0)
+        val_loss, val_acc, val_top3 = model.evaluate(val_ds, verbose=0)
         
         results = {
             "model_path": str(model_path),
-            "training_samples": len(X_train),
-            "validation_samples": len(X_val),
+            "training_samples": num_train,
+            "validation_samples": num_val,
             "num_classes": len(unique_labels),
             "classes": unique_labels,
             "class_distribution": class_dist,
@@ -373,6 +496,7 @@ class ModelTrainingService:
         }
         
         self._save_training_results("disease_detection", results)
+        self._prune_dataset_cache()
         
         print(f"✅ Training complete! Validation accuracy: {val_acc:.4f}")
         return results
@@ -390,10 +514,7 @@ class ModelTrainingService:
         if len(training_data["labels"]) < min_samples_per_class:
             raise ValueError(f"Not enough training data. Need at least {min_samples_per_class} samples.")
         
-        X, y, unique_labels = self.download_and_preprocess_images(
-            training_data["image_urls"],
-            training_data["labels"]
-        )
+        y, unique_labels = self._encode_labels(training_data["labels"])
         
         # Storage has ordered classes (excellent > good > fair > poor > critical)
         ordered_labels = ['excellent', 'good', 'fair', 'poor', 'critical']
@@ -405,12 +526,14 @@ class ModelTrainingService:
         
         model = self.build_classification_model(len(unique_labels))
         
-        split_idx = int(len(X) * (1 - validation_split))
-        X_train, X_val = X[:split_idx], X[split_idx:]
+        split_idx = int(len(y) * (1 - validation_split))
+        image_urls = training_data["image_urls"]
         y_train, y_val = y[:split_idx], y[split_idx:]
+        train_ds, num_train = self.download_and_preprocess_images(image_urls[:split_idx], y_train, shuffle=True)
+        val_ds, num_val = self.download_and_preprocess_images(image_urls[split_idx:], y_val)
         
-        print(f"📚 Training set: {len(X_train)} samples")
-        print(f"🔍 Validation set: {len(X_val)} samples")
+        print(f"📚 Training set: {num_train} samples")
+        print(f"🔍 Validation set: {num_val} samples")
         
         callbacks = [
             tf.keras.callbacks.EarlyStopping(
@@ -419,7 +542,7 @@ class ModelTrainingService:
                 restore_best_weights=True
             ),
             tf.keras.callbacks.ModelCheckpoint(
-                filepath=str(self.models_dir / 'storage_assessment_best.h5'),
+                filepath=str(self.models_dir / 'storage_assessment_best.keras'),
                 monitor='val_accuracy',
                 save_best_only=True
             )
@@ -427,24 +550,23 @@ class ModelTrainingService:
         
         print("🏋️ Training model...")
         history = model.fit(
-            X_train, y_train,
-            validation_data=(X_val, y_val),
+            train_ds,
+            validation_data=val_ds,
             epochs=self.epochs,
-            batch_size=self.batch_size,
             callbacks=callbacks,
             verbose=1
         )
         
-        model_path = self.models_dir / f"storage_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.h5"
+        model_path = self.models_dir / f"storage_assessment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.keras"
         model.save(model_path)
         print(f"💾 Model saved to {model_path}")
         
-        val_loss, val_acc, val_top3 = model.evaluate(X_val, y_val, verbose=0)
+        val_loss, val_acc, val_top3 = model.evaluate(val_ds, verbose=0)
         
         results = {
             "model_path": str(model_path),
-            "training_samples": len(X_train),
-            "validation_samples": len(X_val),
+            "training_samples": num_train,
+            "validation_samples": num_val,
             "num_classes": len(unique_labels),
             "classes": unique_labels,
             "class_distribution": class_dist,
@@ -454,6 +576,7 @@ class ModelTrainingService:
         }
         
         self._save_training_results("storage_assessment", results)
+        self._prune_dataset_cache()
         
         print(f"✅ Training complete! Validation accuracy: {val_acc:.4f}")
         return results
@@ -474,9 +597,12 @@ class ModelTrainingService:
         """
         print(f"📊 Evaluating {model_type} model performance...")
         
-        # Load model
-        model_pattern = f"{model_type}_detection_*.h5" if model_type != "storage" else f"storage_assessment_*.h5"
-        model_files = sorted(self.models_dir.glob(model_pattern))
+        # Load model (.keras, or .h5 from before the switch to the Keras format)
+        model_prefix = f"{model_type}_detection_" if model_type != "storage" else "storage_assessment_"
+        model_files = sorted(
+            (path for suffix in (".keras", ".h5") for path in self.models_dir.glob(f"{model_prefix}*{suffix}")),
+            key=lambda path: path.stem
+        )
         
         if not model_files:
             raise FileNotFoundError(f"No trained {model_type} model found")
@@ -498,17 +624,16 @@ class ModelTrainingService:
             return {}
         
         # Preprocess
-        X_test, y_test, labels = self.download_and_preprocess_images(
-            test_data["image_urls"],
-            test_data["labels"]
-        )
+        y_test, labels = self._encode_labels(test_data["labels"])
+        test_ds, num_test = self.download_and_preprocess_images(test_data["image_urls"], y_test)
         
         # Evaluate
-        results = model.evaluate(X_test, y_test, verbose=0)
+        results = model.evaluate(test_ds, verbose=0)
+        self._prune_dataset_cache()
         
         metrics = {
             "model_path": str(latest_model),
-            "test_samples": len(X_test),
+            "test_samples": num_test,
             "test_loss": float(results[0]),
             "test_accuracy": float(results[1]),
             "test_top3_accuracy": float(results[2]) if len(results) > 2 else None
@@ -193,9 +193,10 @@ def predict_nutrient_depletion(
     days_since_planting = (current - planting).days
     
     # Get current growth stage
-    from .growth_model import get_current_growth_stage
-    stage_info = get_current_growth_stage(crop, "short_season", record["planting_date"])
-    current_stage = stage_info["current_stage"]["stage_key"] if stage_info["current_stage"] else "unknown"
+    from .growth_model import get_crop_model, get_current_growth_stage_fast
+    stage = get_current_growth_stage_fast(crop, "short_season", record["planting_date"])
+    current_stage = stage.stage_key if stage else "unknown"
+    maturity_days = get_crop_model(crop, "short_season")["maturity_days"]
     
     # Calculate nutrient consumption based on growth stage
     crop_uptake = CROP_NUTRIENT_UPTAKE.get(crop.lower(), CROP_NUTRIENT_UPTAKE["maize"])
@@ -235,7 +236,7 @@ def predict_nutrient_depletion(
     # Estimate days until critical
     remaining_uptake_percent = 100 - cumulative_uptake_percent
     if remaining_uptake_percent > 0:
-        days_per_percent = (stage_info["maturity_days"] - days_since_planting) / remaining_uptake_percent
+        days_per_percent = (maturity_days - days_since_planting) / remaining_uptake_percent
     else:
         days_per_percent = 1
     
@@ -248,9 +249,9 @@ def predict_nutrient_depletion(
         return int((remaining - critical) / daily_uptake_rate)
     
     # Estimate daily uptake (simplified)
-    daily_n_uptake = total_n / stage_info["maturity_days"]
-    daily_p_uptake = total_p / stage_info["maturity_days"]
-    daily_k_uptake = total_k / stage_info["maturity_days"]
+    daily_n_uptake = total_n / maturity_days
+    daily_p_uptake = total_p / maturity_days
+    daily_k_uptake = total_k / maturity_days
     
     days_until_n_critical = days_until_critical(remaining_n, critical_n, daily_n_uptake)
     days_until_p_critical = days_until_critical(remaining_p, critical_p, daily_p_uptake)
@@ -142,7 +142,7 @@ def check_planting_status(farmer_id: str, field_id: str, crop: str, location: di
             message = f"⚠️ LATE: You are {days_late} days past optimal window. Consider fast-maturing {crop} varieties or switch to: {', '.join(alternatives)}"
         
         # Check LCRS for diversification advice
-        lcrs_data = lcrs_engine.calculate_lcrs(farmer_id, field_id, location)
+        lcrs_data = lcrs_engine.calculate_lcrs(farmer_id, field_id, location, detail='score')
         diversification = None
         if lcrs_data['risk_level'] in ['moderate', 'high']:
             diversification = "🌾 RISK HEDGE: Dedicate 20% of land to drought-tolerant cassava or sorghum to reduce crop failure risk."
@@ -188,7 +188,7 @@ def generate_diversification_plan(farmer_id: str, field_id: str, location: dict,
         'rationale': str
     }
     """
-    lcrs_data = lcrs_engine.calculate_lcrs(farmer_id, field_id, location)
+    lcrs_data = lcrs_engine.calculate_lcrs(farmer_id, field_id, location, detail='score')
     
     if lcrs_data['risk_level'] == 'low':
         # Low risk: 90% primary crop, 10% diversification
@@ -0,0 +1,63 @@
+"""
+AI Calendar ONNX Export
+=======================
+
+Converts the AI calendar forests (practice, timing, priority) in
+ai_calendar_model.pkl to ONNX, written next to the .pkl as
+ai_calendar_model.<sub-model>.onnx. When onnxruntime is installed the
+inference service runs these instead of the scikit-learn forests; an
+export older than the .pkl is ignored, so re-run this after retraining.
+
+Requires: skl2onnx (export), onnxruntime (serving)
+
+Usage:
+    python export_calendar_onnx.py
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+SUB_MODELS = ("practice_model", "timing_model", "priority_model")
+
+
+def export_onnx(model, n_features: int, onnx_path: Path) -> None:
+    """Convert a fitted scikit-learn forest to ONNX with a dynamic batch dimension"""
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    # zipmap=False: probabilities as a plain (n, classes) tensor, not dicts
+    options = {id(model): {"zipmap": False}} if hasattr(model, "predict_proba") else None
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[("input", FloatTensorType([None, n_features]))],
+        options=options,
+    )
+    onnx_path.write_bytes(onnx_model.SerializeToString())
+    print(f"   ✅ ONNX: {onnx_path}")
+
+
+def main():
+    pkl_path = Path(__file__).parent / "trained_models" / "ai_calendar_model.pkl"
+    if not pkl_path.exists():
+        print(f"❌ No trained AI calendar model at {pkl_path}")
+        return 1
+
+    with open(pkl_path, "rb") as f:
+        model_data = pickle.load(f)
+    n_features = len(model_data["features"])
+
+    failed = 0
+    for name in SUB_MODELS:
+        print(f"\n🔧 {name}")
+        try:
+            export_onnx(model_data[name], n_features, pkl_path.with_name(f"{pkl_path.stem}.{name}.onnx"))
+        except Exception as e:
+            print(f"   ❌ Export failed: {e}")
+            failed += 1
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
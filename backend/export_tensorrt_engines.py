@@ -0,0 +1,95 @@
+"""
+TensorRT Engine Export
+======================
+
+Converts the Keras image CNNs (pest, disease, soil) to ONNX and builds an
+FP16 TensorRT engine for each, written next to the .h5 file. The inference
+service prefers <model>.engine over <model>.h5 when it exists.
+
+Engines are specific to the GPU and TensorRT version they were built with:
+run this on each deployment host after training.
+
+Requires: tf2onnx, TensorRT (trtexec on PATH)
+
+Usage:
+    python export_tensorrt_engines.py
+    python export_tensorrt_engines.py --model pest_detection --max-batch 32
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.services.ml_inference import IMAGE_MODEL_TYPES, ML_MAX_BATCH_SIZE
+from app.services.model_manager import get_model_manager
+
+INPUT_NAME = "input"
+
+
+def export_onnx(h5_path: Path, onnx_path: Path, input_shape) -> None:
+    """Convert a Keras .h5 model to ONNX with a dynamic batch dimension"""
+    import tensorflow as tf
+    import tf2onnx
+
+    model = tf.keras.models.load_model(str(h5_path), compile=False)
+    spec = (tf.TensorSpec((None, *input_shape), tf.float32, name=INPUT_NAME),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, output_path=str(onnx_path))
+    print(f"   ✅ ONNX: {onnx_path}")
+
+
+def build_engine(onnx_path: Path, engine_path: Path, input_shape, opt_batch: int, max_batch: int) -> None:
+    """Build an FP16 TensorRT engine for batches of 1..max_batch images"""
+    dims = "x".join(str(d) for d in input_shape)
+    subprocess.run([
+        "trtexec",
+        f"--onnx={onnx_path}",
+        f"--saveEngine={engine_path}",
+        "--fp16",
+        "--memPoolSize=workspace:2048",
+        f"--minShapes={INPUT_NAME}:1x{dims}",
+        f"--optShapes={INPUT_NAME}:{opt_batch}x{dims}",
+        f"--maxShapes={INPUT_NAME}:{max_batch}x{dims}",
+    ], check=True)
+    print(f"   ✅ Engine: {engine_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build TensorRT engines for the image CNNs")
+    parser.add_argument("--model", choices=sorted(IMAGE_MODEL_TYPES), help="Export only this model")
+    parser.add_argument("--opt-batch", type=int, default=ML_MAX_BATCH_SIZE, help="Batch size to tune for")
+    parser.add_argument("--max-batch", type=int, default=2 * ML_MAX_BATCH_SIZE, help="Largest batch size")
+    args = parser.parse_args()
+
+    if shutil.which("trtexec") is None:
+        print("❌ trtexec not found. Install TensorRT and add its bin directory to PATH.")
+        return 1
+
+    manager = get_model_manager()
+    failed = 0
+    for model_type in ([args.model] if args.model else sorted(IMAGE_MODEL_TYPES)):
+        config = manager.get_model_config(model_type)
+        h5_path = config.path
+        if not h5_path.exists():
+            print(f"⚠️  {model_type}: no trained model at {h5_path}, skipping")
+            continue
+
+        print(f"\n🔧 {model_type}")
+        onnx_path = h5_path.with_suffix(".onnx")
+        try:
+            export_onnx(h5_path, onnx_path, config.input_shape)
+            build_engine(onnx_path, h5_path.with_suffix(".engine"), config.input_shape,
+                         args.opt_batch, args.max_batch)
+        except Exception as e:
+            print(f"   ❌ Export failed: {e}")
+            failed += 1
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -320,7 +320,7 @@ def train_ai_calendar_model(data_path="training_data/ai_calendar/ai_calendar.csv
     
     model_path = models_dir / "ai_calendar_model.pkl"
     with open(model_path, 'wb') as f:
-        pickle.dump(model_data, f)
+        pickle.dump(model_data, f, protocol=pickle.HIGHEST_PROTOCOL)
     
     print(f"\n✅ Models saved to {model_path}")
     
@@ -1,6 +1,7 @@
 """
 Unit tests for Climate Engine (LCRS, Planting Windows, Harvest Prediction)
 """
+import asyncio
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -54,6 +55,67 @@ def test_seasonal_forecast():
     
     print(f'✅ test_seasonal_forecast passed - Forecast risk calculated')
 
+def test_now_cache_expires_on_monotonic_clock():
+    """Test the shared clock reading expires by monotonic time, not wall time"""
+    class FakeClock:
+        mono = 1000.0
+        wall = 1_700_000_000.0
+        def monotonic(self):
+            return self.mono
+        def time(self):
+            return self.wall
+
+    clock = FakeClock()
+    real_time = lcrs_engine.time
+    lcrs_engine.time = clock
+    try:
+        lcrs_engine.clear_request_caches()
+        first = lcrs_engine._now()
+        assert first[0] == 1_700_000_000
+        assert first[1] == datetime(2023, 11, 14, 22, 13, 20)
+
+        # A wall clock step (NTP, manual change) does not refresh the reading
+        clock.wall -= 3600
+        assert lcrs_engine._now() == first
+
+        # Monotonic time passing the TTL does
+        clock.mono += lcrs_engine._NOW_TTL_S
+        assert lcrs_engine._now()[0] == 1_700_000_000 - 3600
+    finally:
+        lcrs_engine.time = real_time
+        lcrs_engine.clear_request_caches()
+
+    print('✅ test_now_cache_expires_on_monotonic_clock passed')
+
+def test_request_scoped_memo_visible_in_handler():
+    """Test a scoped handler sees the rain memo its own service calls fill"""
+    location = {'lat': -1.2921, 'lon': 36.8219}
+    outer_memo = (float('inf'), {'outer': (0.0, 0)})
+    seen = {}
+
+    @lcrs_engine.request_scoped
+    async def handler():
+        seen['before'] = lcrs_engine._rain_memo.get()
+        factor = lcrs_engine.calculate_crowdsourced_rain_factor(location, days=7)
+        seen['after'] = lcrs_engine._rain_memo.get()
+        return factor
+
+    async def request():
+        lcrs_engine._rain_memo.set(outer_memo)
+        factor = await handler()
+        return factor, lcrs_engine._rain_memo.get()
+
+    factor, memo_after_request = asyncio.run(request())
+
+    # Fresh memo inside the handler, filled by the call it made
+    assert seen['before'] is None
+    assert list(seen['after'][1]) == [(-1.29, 36.82, 7)]
+    assert seen['after'][1][(-1.29, 36.82, 7)][0] == factor
+    # ...and dropped once the handler returns
+    assert memo_after_request is outer_memo
+
+    print('✅ test_request_scoped_memo_visible_in_handler passed')
+
 # ============================================================================
 # PLANTING WINDOW TESTS
 # ============================================================================
@@ -265,6 +327,8 @@ if __name__ == '__main__':
     test_soil_moisture_index()
     test_lcrs_calculation()
     test_seasonal_forecast()
+    test_now_cache_expires_on_monotonic_clock()
+    test_request_scoped_memo_visible_in_handler()
     
     print('\n--- Planting Window Tests ---')
     test_optimal_planting_window()
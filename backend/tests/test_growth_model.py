@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services import growth_model
+
+
+def _planted_days_ago(days):
+    return (datetime.utcnow() - timedelta(days=days)).date().isoformat()
+
+
+def test_stage_index_overlap_keeps_first_stage():
+    # h614 tasseling (55-65) overlaps silking (60-70); tasseling is listed first
+    status = growth_model.get_current_growth_stage("maize", "h614", _planted_days_ago(62))
+    assert status["current_stage"]["stage_key"] == "tasseling"
+    status = growth_model.get_current_growth_stage("maize", "h614", _planted_days_ago(66))
+    assert status["current_stage"]["stage_key"] == "silking"
+
+
+def test_stage_index_bounds():
+    status = growth_model.get_current_growth_stage("maize", "h614", _planted_days_ago(0))
+    assert status["current_stage"]["stage_key"] == "germination"
+    status = growth_model.get_current_growth_stage("maize", "h614", _planted_days_ago(130))
+    assert status["current_stage"]["stage_key"] == "overdue"
+    assert growth_model.get_water_requirements_by_stage("maize", "h614", -1)["current_stage"] is None
+
+
+def test_stage_index_matches_first_match_scan():
+    # Every day of every variety resolves to the first listed stage covering it
+    for crop, crop_data in growth_model.CROP_GROWTH_MODELS.items():
+        for variety, model in crop_data["varieties"].items():
+            stages = model["stages"]
+            last_day = max(stage["end"] for stage in stages.values()) + 2
+            for day in range(-1, last_day):
+                expected = next(
+                    (key for key, stage in stages.items() if stage["start"] <= day <= stage["end"]),
+                    None
+                )
+                water = growth_model.get_water_requirements_by_stage(crop, variety, day)
+                assert water["current_stage"] == expected, (crop, variety, day)
+                assert water["is_critical_stage"] == (expected in model["water_requirements"]["critical_stages"])
+
+
+def test_stage_progress_matches_percent_of_stage():
+    # Same whole percent as int((days_in_stage / stage_length) * 100) on every day
+    for crop, crop_data in growth_model.CROP_GROWTH_MODELS.items():
+        for variety in crop_data["varieties"]:
+            model = growth_model.get_crop_model(crop, variety)
+            for day in range(model["maturity_days"] + 1):
+                stage = growth_model._current_stage(model, day, growth_model._stage_key_at(model, day))
+                if stage is None:
+                    continue
+                length = stage.stage_end - stage.stage_start
+                expected = int((stage.days_in_stage / length) * 100) if length else 0
+                assert stage.progress_percent == expected, (crop, variety, day)
+    
+    model = growth_model.get_crop_model("cassava", "tmse_419")
+    assert growth_model._current_stage(model, 117, "vegetative").progress_percent == 57
@@ -0,0 +1,96 @@
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from app.services import growth_tracking
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_health_series_int8_round_trip(monkeypatch, numpy_available):
+    if numpy_available and not growth_tracking.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not installed")
+    monkeypatch.setattr(growth_tracking, "NUMPY_AVAILABLE", numpy_available)
+    
+    series = growth_tracking._HealthSeries(capacity=2)
+    values = [-127, -1, 0, 6, 9, 127]
+    for i, score in enumerate(values):
+        series.append(i, score, None, "")
+    assert [int(s) for s in series.score] == values
+    
+    # Rounded rather than truncated, clipped rather than wrapped
+    series = growth_tracking._HealthSeries()
+    for i, score in enumerate([7.6, 6.4, -2.6, 200, -300]):
+        series.append(i, score, None, "")
+    assert [int(s) for s in series.score] == [8, 6, -3, 127, -127]
+
+
+def _prompt(number, due_in_days, status):
+    due = int(time.time()) + int(due_in_days * 86400)
+    return {
+        "photo_number": number,
+        "due_epoch": due,
+        "due_date": datetime.fromtimestamp(due, timezone.utc).replace(tzinfo=None).isoformat(),
+        "status": status,
+    }
+
+
+def test_next_photo_prompt_uses_cached_index(monkeypatch):
+    from app.services import calendar_generator
+    
+    schedule = [
+        _prompt(1, -20, "completed"),
+        _prompt(2, -10, "completed"),
+        _prompt(3, 3, "pending"),
+        _prompt(4, 10, "pending"),
+    ]
+    version = ["v1"]
+    monkeypatch.setattr(calendar_generator, "get_calendar", lambda field_id: {"photo_schedule": schedule})
+    monkeypatch.setattr(calendar_generator, "calendars_version", lambda: version[0])
+    monkeypatch.setattr(growth_tracking, "_prompt_index_cache", {})
+    
+    prompt = growth_tracking.get_next_photo_prompt("f1", "2024-01-01")
+    assert prompt["photo_number"] == 3
+    assert prompt["days_until_due"] == 2 and not prompt["is_overdue"]
+    index = growth_tracking._prompt_index_cache["f1"]
+    assert index["pending"] == [2, 3]
+    
+    # Same calendar version: the index is reused, not rebuilt
+    growth_tracking.get_next_photo_prompt("f1", "2024-01-01")
+    assert growth_tracking._prompt_index_cache["f1"] is index
+    
+    # Once prompt 3 is done, the next pending one is more than a week out
+    schedule[2]["status"] = "completed"
+    version[0] = "v2"
+    assert growth_tracking.get_next_photo_prompt("f1", "2024-01-01") is None
+    
+    # An overdue pending prompt is still returned
+    schedule[0]["status"] = "pending"
+    version[0] = "v3"
+    prompt = growth_tracking.get_next_photo_prompt("f1", "2024-01-01")
+    assert prompt["photo_number"] == 1 and prompt["is_overdue"]
+
+
+def test_photo_batch_written_once_per_file(monkeypatch):
+    appends = []
+    monkeypatch.setattr(growth_tracking, "load_growth_photos", lambda: {"field_1": [{}]})
+    monkeypatch.setattr(growth_tracking, "append_photo_records", lambda records: appends.append(("photos", list(records))))
+    monkeypatch.setattr(growth_tracking, "_append_health_scores", lambda records: appends.append(("scores", list(records))))
+    
+    uploads = [
+        {"field_id": f"field_{i % 2 + 1}", "photo_url": f"https://img/{i}.jpg", "photo_type": "leaf", "manual_health_score": 50 + i}
+        for i in range(5)
+    ]
+    records = growth_tracking.upload_growth_photo_batch(uploads)
+    
+    assert [(kind, len(batch)) for kind, batch in appends] == [("photos", 5), ("scores", 5)]
+    assert appends[0][1] == records
+    assert [r["photo_url"] for r in records] == [u["photo_url"] for u in uploads]
+    # Photo numbers continue from the stored photos of each field
+    assert [r["photo_id"] for r in records] == [
+        "field_1_photo_2", "field_2_photo_1", "field_1_photo_3", "field_2_photo_2", "field_1_photo_4"
+    ]
+    assert [s["photo_id"] for s in appends[1][1]] == [r["photo_id"] for r in records]
@@ -0,0 +1,96 @@
+import os
+import sys
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+os.environ.setdefault("ML_WARMUP", "0")
+
+from app.services.ml_inference import IMAGE_MODEL_TYPES, BatchScheduler, ModelInferenceService, _batch_bucket, _pad_batch
+from app.services.model_manager import run_model
+
+
+class _RecordingModel:
+    """predict()-only model (like TFLiteModel) returning each image's mean"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, batch):
+        self.batch_sizes.append(len(batch))
+        return batch.reshape(len(batch), -1).mean(axis=1, keepdims=True)
+
+
+def test_batch_scheduler_returns_each_request_its_row():
+    model = _RecordingModel()
+    scheduler = BatchScheduler(lambda batch: run_model(model, batch), max_batch_size=4, timeout_ms=20)
+
+    results = {}
+    start = threading.Barrier(10)
+
+    def request(i):
+        start.wait()
+        results[i] = scheduler.submit(np.full((1, 8, 8, 3), i, dtype=np.float32))
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert {i: float(row[0]) for i, row in results.items()} == {i: float(i) for i in range(10)}
+    assert sum(model.batch_sizes) == 10
+    assert max(model.batch_sizes) <= 4
+
+
+def test_batch_scheduler_propagates_errors():
+    def fail(batch):
+        raise RuntimeError("model failed")
+
+    scheduler = BatchScheduler(fail)
+    with pytest.raises(RuntimeError, match="model failed"):
+        scheduler.submit(np.zeros((1, 2, 2, 3), dtype=np.float32))
+
+
+def test_batches_padded_to_few_sizes():
+    # Only 1, 2, 4, 8 and 16 reach the XLA-compiled function
+    assert {_batch_bucket(n, 16) for n in range(1, 17)} == {1, 2, 4, 8, 16}
+    assert [_batch_bucket(n, 12) for n in (3, 5, 9, 12, 20)] == [4, 8, 12, 12, 20]
+
+    batch = np.ones((3, 2, 2, 3), dtype=np.float32)
+    padded = _pad_batch(batch, 4)
+    assert padded.shape == (4, 2, 2, 3) and padded.dtype == np.float32
+    np.testing.assert_array_equal(padded[:3], batch)
+    assert not padded[3].any()
+    assert _pad_batch(batch, 3) is batch
+
+
+def test_warmup_loads_models_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.services.ml_inference.ML_XLA", False)
+    service = ModelInferenceService.__new__(ModelInferenceService)
+    service.model_paths = {"ai_calendar": tmp_path / "ai_calendar_model.pkl"}
+    service.model_paths["ai_calendar"].write_bytes(b"")
+    service.model_manager = type("Manager", (), {"get_model_config": lambda self, model_type: None})()
+    
+    # Each load waits for all the others, so serial loading would time out
+    started = threading.Barrier(len(IMAGE_MODEL_TYPES) + 1, timeout=5)
+    loaded, inferred = set(), []
+    
+    def load(model_type=None):
+        started.wait()
+        loaded.add(model_type or "ai_calendar")
+    
+    def infer(model_type, batch):
+        assert model_type in loaded
+        inferred.append((model_type, batch.shape))
+    
+    service._load_model = load
+    service._ensure_calendar_loaded = load
+    service._infer = infer
+    service._warmup()
+    
+    assert loaded == {*IMAGE_MODEL_TYPES, "ai_calendar"}
+    assert inferred == [(model_type, (1, 224, 224, 3)) for model_type in sorted(IMAGE_MODEL_TYPES)]
@@ -0,0 +1,232 @@
+import gc
+import json
+import os
+import pickle
+import sys
+import weakref
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.model_manager import MLModelManager, ModelSpec
+
+
+def _write_pickle(path: Path, obj):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    models_dir = tmp_path / "trained_models"
+    _write_pickle(models_dir / "yield_prediction_rf.pkl", {"model": np.arange(1000.0)})
+    _write_pickle(models_dir / "ai_calendar_model.pkl", {"model": np.ones(1000)})
+    return MLModelManager(base_dir=tmp_path)
+
+
+def test_lru_eviction_releases_model(manager):
+    manager.max_loaded = 1
+
+    yield_model = weakref.ref(manager.get_model("yield_prediction"))
+    assert yield_model() is not None
+
+    # Loading a second unpinned model past max_loaded unloads the first...
+    assert manager.get_model("ai_calendar") is not None
+    assert list(manager.models) == ["ai_calendar"]
+
+    # ...and nothing else keeps it alive
+    gc.collect()
+    assert yield_model() is None
+
+
+def test_pinned_models_are_not_evicted(manager):
+    manager.max_loaded = 1
+    manager.pin(["ai_calendar"])
+
+    calendar = manager.get_model("ai_calendar")
+    manager.get_model("yield_prediction")
+
+    # The pinned model stays and doesn't count towards max_loaded
+    assert set(manager.models) == {"ai_calendar", "yield_prediction"}
+    assert manager.get_model("ai_calendar") is calendar
+
+
+def test_no_limit_by_default(manager):
+    assert manager.max_loaded == 0
+    manager.get_model("yield_prediction")
+    manager.get_model("ai_calendar")
+    assert set(manager.models) == {"yield_prediction", "ai_calendar"}
+
+
+def _tf_spec(models_dir: Path, int8: bool = False):
+    return ModelSpec(
+        path=models_dir / "pest.h5",
+        tflite_path=models_dir / "pest.tflite",
+        int8_tflite_path=models_dir / "pest_int8.tflite" if int8 else None,
+        type="tensorflow",
+        description="test model",
+    )
+
+
+def _touch(path: Path, mtime_ns: int):
+    path.write_bytes(b"")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_tflite_export_served_while_current(tmp_path):
+    config = _tf_spec(tmp_path)
+    assert MLModelManager._tflite_path(config) is None
+
+    _touch(config.path, 1_000_000_000)
+    _touch(config.tflite_path, 2_000_000_000)
+    assert MLModelManager._tflite_path(config) == config.tflite_path
+
+    # Retrained after the export: the .h5 is loaded instead
+    _touch(config.path, 3_000_000_000)
+    assert MLModelManager._tflite_path(config) is None
+
+    # Only the export on disk: nothing to be stale against
+    config.path.unlink()
+    assert MLModelManager._tflite_path(config) == config.tflite_path
+
+
+def test_int8_export_needs_matching_calibration(tmp_path):
+    config = _tf_spec(tmp_path, int8=True)
+    config.input_shape = (224, 224, 3)
+    _touch(config.path, 1_000_000_000)
+    _touch(config.tflite_path, 2_000_000_000)
+    _touch(config.int8_tflite_path, 2_000_000_000)
+    record_path = config.int8_tflite_path.with_suffix(".calibration.json")
+
+    # No calibration record: the float export is served
+    assert MLModelManager._tflite_path(config) == config.tflite_path
+
+    record = MLModelManager._calibration_record(config, 1_000_000_000)
+    record_path.write_text(json.dumps(record))
+    assert MLModelManager._tflite_path(config) == config.int8_tflite_path
+
+    # Calibrated with other preprocessing
+    config.mean = (0.485, 0.456, 0.406)
+    assert MLModelManager._tflite_path(config) == config.tflite_path
+    config.mean = (0.0, 0.0, 0.0)
+
+    # Calibrated for an earlier model version, e.g. a retrained .h5 copied
+    # in with an older mtime than the export
+    _touch(config.path, 1_500_000_000)
+    assert MLModelManager._tflite_path(config) == config.tflite_path
+
+    # Both exports older than the .h5
+    _touch(config.path, 3_000_000_000)
+    assert MLModelManager._tflite_path(config) is None
+
+
+def test_predict_batch_dispatches_sklearn_models(tmp_path):
+    ensemble = pytest.importorskip("sklearn.ensemble")
+    rng = np.random.default_rng(0)
+    X = rng.random((40, 4)).astype(np.float32)
+    y = (X[:, 0] > 0.5).astype(int)
+    classifier = ensemble.RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    regressor = ensemble.RandomForestRegressor(n_estimators=5, random_state=0).fit(X, X[:, 1])
+
+    models_dir = tmp_path / "trained_models"
+    _write_pickle(models_dir / "yield_prediction_rf.pkl", {"model": regressor})
+    _write_pickle(models_dir / "ai_calendar_model.pkl", {"model": classifier})
+    manager = MLModelManager(base_dir=tmp_path)
+
+    rows = list(X[:3])
+    # Classifiers give class probabilities, regressors predictions
+    np.testing.assert_allclose(manager.predict_batch("ai_calendar", rows), classifier.predict_proba(X[:3]))
+    np.testing.assert_allclose(manager.predict_batch("yield_prediction", rows), regressor.predict(X[:3]))
+    assert manager.predict_batch("pest_detection", rows) is None
+
+
+def _fitted_forest():
+    ensemble = pytest.importorskip("sklearn.ensemble")
+    rng = np.random.default_rng(1)
+    X = rng.random((60, 3))
+    return ensemble.RandomForestClassifier(n_estimators=4, random_state=0).fit(X, X[:, 0] > 0.5), X
+
+
+def test_sklearn_model_memory_mapped_by_default(tmp_path, monkeypatch):
+    joblib = pytest.importorskip("joblib")
+    forest, X = _fitted_forest()
+    _write_pickle(tmp_path / "trained_models" / "yield_prediction_rf.pkl", {"model": forest})
+
+    first = MLModelManager(base_dir=tmp_path).get_model("yield_prediction")
+    models_dir = tmp_path / "trained_models"
+    assert (models_dir / "yield_prediction_rf.joblib").exists()
+    assert not (models_dir / "yield_prediction_rf.safe.npz").exists()
+
+    # Later loads read the .joblib copy with its arrays memory-mapped
+    loads = []
+    real_load = joblib.load
+
+    def recording_load(path, **kwargs):
+        loads.append((Path(path).name, kwargs))
+        return real_load(path, **kwargs)
+
+    monkeypatch.setattr(joblib, "load", recording_load)
+    second = MLModelManager(base_dir=tmp_path).get_model("yield_prediction")
+    assert loads == [("yield_prediction_rf.joblib", {"mmap_mode": "r"})]
+    np.testing.assert_array_equal(second.predict_proba(X), first.predict_proba(X))
+
+
+def test_sklearn_model_safe_copy_is_opt_in(tmp_path, monkeypatch):
+    forest, X = _fitted_forest()
+    _write_pickle(tmp_path / "trained_models" / "yield_prediction_rf.pkl", {"model": forest})
+    monkeypatch.setattr("app.services.model_manager.ML_SKLEARN_SAFE_LOAD", True)
+
+    MLModelManager(base_dir=tmp_path).get_model("yield_prediction")
+    assert (tmp_path / "trained_models" / "yield_prediction_rf.safe.npz").exists()
+
+    # Rebuilt from the .safe.npz without unpickling anything
+    def no_pickle(*args, **kwargs):
+        raise AssertionError("unpickled")
+    monkeypatch.setattr(pickle, "load", no_pickle)
+    monkeypatch.setattr(pickle, "loads", no_pickle)
+    rebuilt = MLModelManager(base_dir=tmp_path).get_model("yield_prediction")
+    assert type(rebuilt) is type(forest)
+    np.testing.assert_array_equal(rebuilt.predict_proba(X), forest.predict_proba(X))
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_preprocess_normalizes_with_model_spec(manager, monkeypatch, use_numba):
+    from app.services import model_manager
+    if use_numba and not model_manager.NUMBA_AVAILABLE:
+        pytest.skip("Numba not installed")
+    monkeypatch.setattr(model_manager, "NUMBA_AVAILABLE", use_numba)
+
+    config = manager.get_model_config("disease_detection")
+    config.input_shape = (2, 3, 3)
+    config.mean = (0.485, 0.456, 0.406)
+    config.std = (0.229, 0.224, 0.225)
+
+    # 4x6 image of 2x2 blocks: the box filter averages each block
+    rng = np.random.default_rng(2)
+    image = rng.integers(0, 256, (4, 6, 3), dtype=np.uint8)
+    blocks = image.reshape(2, 2, 3, 2, 3).astype(np.float64).mean(axis=(1, 3))
+    expected = (blocks / 255 - np.array(config.mean)) / np.array(config.std)
+
+    batch = manager.preprocess("disease_detection", image)
+    assert batch.shape == (1, 2, 3, 3) and batch.dtype == np.float32
+    np.testing.assert_allclose(batch[0], expected, rtol=1e-5, atol=1e-5)
+
+
+def test_calibration_images_preprocessed_like_inference(manager, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    config = manager.get_model_config("pest_detection")
+    config.input_shape = (4, 4, 3)
+    config.mean = (0.5, 0.5, 0.5)
+    config.std = (0.25, 0.25, 0.25)
+
+    pixels = np.random.default_rng(3).integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(tmp_path / "leaf.png")
+    (tmp_path / "broken.jpg").write_bytes(b"not an image")
+
+    samples = list(manager._representative_dataset([tmp_path / "broken.jpg", tmp_path / "leaf.png"], config)())
+    assert len(samples) == 1
+    np.testing.assert_array_equal(samples[0][0], manager.preprocess("pest_detection", pixels))
@@ -0,0 +1,95 @@
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+pytest.importorskip("supabase")
+import numpy as np
+
+from app.services.model_training import ModelTrainingService
+
+
+class _Response:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        if not self.content:
+            raise OSError("download failed")
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    # Models and the dataset cache go under the working directory
+    monkeypatch.chdir(tmp_path)
+    service = ModelTrainingService()
+    service.batch_size = 2
+
+    png = tf.io.encode_png(tf.fill((32, 48, 3), tf.constant(128, tf.uint8))).numpy()
+    service.downloads = []
+
+    def get(url, timeout=None):
+        service.downloads.append(url)
+        return _Response(b"" if "missing" in url else png)
+
+    monkeypatch.setattr(service._session, "get", get)
+    return service
+
+
+def test_pipeline_counts_downloaded_images(service):
+    urls = ["https://img/a.png", "https://img/missing.png", "https://img/b.png"]
+    dataset, num_images = service.download_and_preprocess_images(urls, np.array([0, 1, 2]), shuffle=True)
+
+    # The image that failed to download is not counted
+    assert num_images == 2
+    batches = list(dataset)
+    images = np.concatenate([batch[0].numpy() for batch in batches])
+    labels = np.concatenate([batch[1].numpy() for batch in batches])
+    assert images.shape == (2, 224, 224, 3)
+    assert images.dtype == np.float32
+    assert sorted(labels.tolist()) == [0, 2]
+    np.testing.assert_allclose(images, 128 / 255, atol=1e-6)
+
+
+def test_pipeline_without_images_raises(service):
+    with pytest.raises(ValueError, match="No valid images"):
+        service.download_and_preprocess_images(["https://img/missing.png"], np.array([0]))
+
+
+def test_cache_reused_and_pruned(service, monkeypatch):
+    labels = np.array([0, 1])
+    complete = ["https://img/a.png", "https://img/b.png"]
+    partial = ["https://img/a.png", "https://img/missing.png"]
+
+    # An interrupted earlier write left a lockfile behind
+    cache_path = service._cache_path(complete, labels)
+    Path(f"{cache_path}_0.lockfile").write_bytes(b"")
+    _, num_images = service.download_and_preprocess_images(complete, labels)
+    assert num_images == 2
+    assert not Path(f"{cache_path}_0.lockfile").exists()
+
+    # A second run over the same images reads the cache
+    service.downloads.clear()
+    dataset, num_images = service.download_and_preprocess_images(complete, labels, shuffle=True)
+    assert num_images == 2 and len(list(dataset.unbatch())) == 2
+    assert service.downloads == []
+
+    # A set with a failed download is cached for this run only
+    service.download_and_preprocess_images(partial, labels)
+    partial_path = service._cache_path(partial, labels)
+    assert partial_path.with_suffix(".partial").exists()
+    service._prune_dataset_cache()
+    assert not list(service.cache_dir.glob(f"{partial_path.name}*"))
+    assert cache_path.with_suffix(".index").exists()
+
+    # Only the most recently used caches are kept
+    monkeypatch.setattr("app.services.model_training.DATASET_CACHE_KEEP", 1)
+    os.utime(cache_path.with_suffix(".index"), (0, 0))
+    other = ["https://img/c.png"]
+    service.download_and_preprocess_images(other, labels[:1])
+    service._prune_dataset_cache()
+    assert not cache_path.with_suffix(".index").exists()
+    assert service._cache_path(other, labels[:1]).with_suffix(".index").exists()
@@ -0,0 +1,41 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from app.services import nutrient_management
+
+
+@pytest.fixture
+def field(tmp_path, monkeypatch):
+    monkeypatch.setattr(nutrient_management, "NUTRIENT_TRACKING_FILE", tmp_path / "nutrient_tracking.json")
+    planting_date = (datetime.utcnow() - timedelta(days=40)).isoformat()
+    nutrient_management.initialize_nutrient_tracking(
+        "field_1", "maize", 2.0,
+        {"nitrogen_ppm": 20, "phosphorus_ppm": 15, "potassium_ppm": 100},
+        planting_date,
+    )
+    return "field_1"
+
+
+def test_predict_nutrient_depletion(field):
+    prediction = nutrient_management.predict_nutrient_depletion(field)
+
+    assert prediction["days_since_planting"] == 40
+    assert prediction["current_stage"] == "vegetative"
+    assert prediction["urgency"] == "high"
+
+    # Uptake is spread over the 120 days to maize maturity
+    levels = prediction["nutrient_levels"]
+    assert levels["nitrogen"]["consumed_kg"] == 132.0
+    assert levels["nitrogen"]["status"] == "critical"
+    assert levels["phosphorus"] == {"remaining_kg": 27.0, "consumed_kg": 33.0, "days_until_critical": 22, "status": "adequate"}
+    assert levels["potassium"]["consumed_kg"] == 110.0
+    assert any(alert["nutrient"] == "Nitrogen" for alert in prediction["alerts"])
+
+
+def test_budget_estimate_uses_prediction(field):
+    budget = nutrient_management.calculate_budget_estimate(field)
+    assert budget["total_commercial_cost_kes"] > 0
@@ -324,7 +324,7 @@ def train_yield_prediction_model():
             'model': model,
             'encoders': encoders,
             'features': features
-        }, f)
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
     print(f"\n✅ Model saved: {model_path}")
     
     return model, importance
@@ -411,7 +411,7 @@ def train_climate_prediction_model():
     # Save scaler
     import pickle
     with open(MODELS_DIR / "climate_scaler.pkl", 'wb') as f:
-        pickle.dump(scaler, f)
+        pickle.dump(scaler, f, protocol=pickle.HIGHEST_PROTOCOL)
     
     print(f"\n✅ Model saved: {model_path}")
     